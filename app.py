@@ -1,22 +1,45 @@
 """Flask application factory for weather monitoring system."""
 
-from flask import Flask
+from flask import Flask, url_for
 from routes.web_routes import web_bp
 from routes.api_routes import api_bp
 from services.weather_service import WeatherService
 from services.metrics_service import MetricsService
 from services.precipitation_service import PrecipitationService
 from services.water_level_service import WaterLevelService
+from services.live_updates import LiveUpdates
+from services.shared_snapshot import SharedSnapshot
+from services.snapshot_archive import SnapshotArchive
+from services.history_store import HistoryStore
 from utils.formatters import format_datetime, format_weather_value
 from utils.error_handlers import register_error_handlers
+from utils.response_cache import ResponseCache
+from utils.event_hub import EventHub
+from utils.static_payloads import StaticPayloads
+from utils.circuit_breaker import CircuitBreaker
 from config import (
     config, 
     WeatherThresholds, 
     UIColorSystem,
+    ColorAPI,
+    get_complete_config,
     get_template_context
 )
 
 
+def event_subscriber_limit(app_config):
+    """
+    How many /api/events streams one process serves at once. Each holds a
+    server thread while it is open, so with a fixed pool of SERVER_THREADS
+    only EVENT_THREAD_SHARE of them may be taken and the rest stay free for
+    ordinary requests; a sync worker (one thread) serves no streams at all.
+    """
+    threads = app_config['SERVER_THREADS']
+    if not threads:
+        return app_config['EVENT_MAX_SUBSCRIBERS']
+    return min(int(threads * app_config['EVENT_THREAD_SHARE']), app_config['EVENT_MAX_SUBSCRIBERS'])
+
+
 def create_app(config_name='development'):
     """
     Create and configure Flask application.
@@ -35,11 +58,105 @@ def create_app(config_name='development'):
 
     flask_app.weather_service = WeatherService(
         api_url=flask_app.config['API_URL'],
-        timeout=flask_app.config['API_TIMEOUT']
+        timeout=flask_app.config['API_TIMEOUT'],
+        pool_connections=flask_app.config['API_POOL_CONNECTIONS'],
+        pool_maxsize=flask_app.config['API_POOL_MAXSIZE'],
+        incremental_param=flask_app.config['API_INCREMENTAL_PARAM'],
+        retention_hours=flask_app.config['API_RETENTION_HOURS'],
+        changelog_versions=flask_app.config['DELTA_CHANGELOG_VERSIONS'],
+        changelog_max_readings=flask_app.config['DELTA_CHANGELOG_MAX_READINGS'],
+        latency_window=flask_app.config['UPSTREAM_LATENCY_WINDOW'],
+        shared_snapshot=(
+            SharedSnapshot(flask_app.config['SHARED_SNAPSHOT_PATH'])
+            if flask_app.config['SHARED_SNAPSHOT_PATH'] else None
+        ),
+        archive=(
+            SnapshotArchive(flask_app.config['SNAPSHOT_ARCHIVE_PATH'])
+            if flask_app.config['SNAPSHOT_ARCHIVE_PATH'] else None
+        ),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=flask_app.config['UPSTREAM_FAILURE_THRESHOLD'],
+            base_delay=flask_app.config['UPSTREAM_BACKOFF_BASE'],
+            max_delay=flask_app.config['UPSTREAM_BACKOFF_MAX']
+        ),
+        force_refresh_interval=flask_app.config['FORCE_REFRESH_MIN_INTERVAL']
     )
+    flask_app.response_cache = ResponseCache(
+        max_bytes=flask_app.config['RESPONSE_CACHE_MAX_BYTES'],
+        gzip_level=flask_app.config['RESPONSE_GZIP_LEVEL'],
+        brotli_quality=flask_app.config['RESPONSE_BROTLI_QUALITY'],
+        compress_min_bytes=flask_app.config['RESPONSE_COMPRESS_MIN_BYTES']
+    )
+    flask_app.static_payloads = StaticPayloads(
+        dumps=flask_app.json.dumps,
+        gzip_level=flask_app.config['RESPONSE_GZIP_LEVEL'],
+        brotli_quality=flask_app.config['RESPONSE_BROTLI_QUALITY'],
+        compress_min_bytes=flask_app.config['RESPONSE_COMPRESS_MIN_BYTES']
+    )
+    flask_app.static_payloads.add('complete_config', dict(
+        get_complete_config(),
+        api_url=flask_app.config['API_URL'],
+        api_timeout=flask_app.config['API_TIMEOUT'],
+        debug_mode=flask_app.debug
+    ))
+    flask_app.static_payloads.add('css_variables', ColorAPI.get_javascript_config())
     flask_app.metrics_service = MetricsService(sites=flask_app.config['SITES'])
-    flask_app.precipitation_service = PrecipitationService(flask_app.metrics_service)
-    flask_app.water_level_service = WaterLevelService(flask_app.metrics_service)
+    flask_app.precipitation_service = PrecipitationService(
+        flask_app.metrics_service, rollup_days=flask_app.config['ROLLUP_MAX_DAYS']
+    )
+    flask_app.water_level_service = WaterLevelService(
+        flask_app.metrics_service, rollup_days=flask_app.config['ROLLUP_MAX_DAYS']
+    )
+    flask_app.weather_service.add_snapshot_listener(flask_app.precipitation_service.materialize_rollups)
+    flask_app.weather_service.add_snapshot_listener(flask_app.water_level_service.materialize_rollups)
+    flask_app.live_updates = LiveUpdates(
+        EventHub(
+            max_queue=flask_app.config['EVENT_QUEUE_SIZE'],
+            history=flask_app.config['EVENT_HISTORY'],
+            heartbeat_seconds=flask_app.config['EVENT_HEARTBEAT_SECONDS'],
+            max_subscribers=event_subscriber_limit(flask_app.config)
+        ),
+        flask_app.weather_service
+    )
+    flask_app.weather_service.add_publish_listener(flask_app.live_updates.on_snapshot)
+    flask_app.history_store = None
+    if flask_app.config['HISTORY_DB_PATH']:
+        flask_app.history_store = HistoryStore(
+            flask_app.config['HISTORY_DB_PATH'],
+            batch_size=flask_app.config['HISTORY_BATCH_SIZE']
+        )
+        shared = flask_app.weather_service.shared
+
+        def record_history(snapshot):
+            # With a shared snapshot only the fetching worker writes history
+            if shared is None or shared.is_leader:
+                flask_app.history_store.ingest(snapshot)
+
+        flask_app.weather_service.add_publish_listener(record_history)
+    if flask_app.weather_service.archive is not None:
+        archive = flask_app.weather_service.archive
+        archive.add_component('precipitation_rollups', flask_app.precipitation_service.export_rollups,
+                              flask_app.precipitation_service.restore_rollups)
+        archive.add_component('water_level_rollups', flask_app.water_level_service.export_rollups,
+                              flask_app.water_level_service.restore_rollups)
+        flask_app.weather_service.warm_start()
+    if flask_app.config['BACKGROUND_REFRESH']:
+        # Started by the serving process itself: a thread started here would be
+        # lost when a preloading server (gunicorn --preload) forks its workers
+        @flask_app.before_request
+        def start_background_refresh():
+            flask_app.weather_service.start_background_refresh(
+                ahead_seconds=flask_app.config['REFRESH_AHEAD_SECONDS'],
+                poll_interval=flask_app.config['REFRESH_POLL_INTERVAL']
+            )
+
+    def config_urls():
+        # Versioned so browsers cache them until the next deploy changes them
+        digests = flask_app.static_payloads.digests()
+        return {
+            'complete_config': url_for('api.complete_config', version=digests['complete_config']),
+            'css_variables': url_for('api.css_variables_api', version=digests['css_variables'])
+        }
 
     @flask_app.context_processor
     def inject_config():
@@ -61,6 +178,7 @@ def create_app(config_name='development'):
                 }
             },
             'station_colors': UIColorSystem.STATION_COLORS,
+            'config_urls': config_urls(),
             **get_template_context()
         }
 
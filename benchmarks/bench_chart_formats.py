@@ -0,0 +1,86 @@
+"""
+Benchmark: object vs format=columnar chart payloads (size and JSON encode time).
+
+Run from the repository root:
+    python benchmarks/bench_chart_formats.py [stations ...]
+"""
+
+import gzip
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from routes.api_routes import (
+    _format_columnar_response,
+    _format_precipitation_response,
+    _format_water_level_response,
+)
+from services.metrics_service import ALERT_LEVELS, RAINFALL_LEVELS
+from services.snapshot import WeatherSnapshot
+
+DAY = datetime(2025, 1, 2)
+
+
+def make_snapshot(station_ids):
+    random.seed(len(station_ids))
+    readings = [
+        {
+            'StationID': station_id,
+            'DateTime': (DAY + timedelta(minutes=minute)).strftime('%Y-%m-%d %H:%M:%S'),
+            'HourlyRain': round(random.random() * 20, 1),
+            'WaterLevel': round(random.random() * 1200, 1),
+        }
+        for station_id in station_ids
+        for minute in range(0, 24 * 60, 5)
+    ]
+    return WeatherSnapshot(readings, version=1)
+
+
+def timed(func, repeat=50):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [5, 50]
+    app = create_app('testing')
+
+    for count in counts:
+        station_ids = [f'St{i + 1}' for i in range(count)]
+        sites = [{'id': station_id, 'name': f'Station {station_id}'} for station_id in station_ids]
+        snapshot = make_snapshot(station_ids)
+        precipitation = app.precipitation_service.get_24hour_intervals_per_station(snapshot, sites, DAY)
+        water_level = app.water_level_service.get_24hour_intervals_per_station(snapshot, sites, DAY)
+        service = app.water_level_service
+
+        formats = {
+            'precipitation objects': lambda: {'stations': _format_precipitation_response(precipitation, sites)},
+            'precipitation columnar': lambda: _format_columnar_response(
+                precipitation, sites, 'intensity', RAINFALL_LEVELS),
+            'water level objects': lambda: {'stations': _format_water_level_response(water_level, sites, service)},
+            'water level columnar': lambda: _format_columnar_response(
+                water_level, sites, 'alert_level', ALERT_LEVELS, service),
+        }
+
+        print(f"\n{count} stations x 24 hourly points")
+        print(f"  {'':<24} {'bytes':>9} {'gzip':>8} {'build':>9} {'encode':>9}")
+        with app.app_context():
+            for name, build in formats.items():
+                build_time, payload = timed(build)
+                encode_time, body = timed(lambda: app.json.dumps(payload).encode('utf-8'))
+                print(f"  {name:<24} {len(body):>9,} {len(gzip.compress(body)):>8,} "
+                      f"{build_time * 1000:>7.2f}ms {encode_time * 1000:>7.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
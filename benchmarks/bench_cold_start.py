@@ -0,0 +1,110 @@
+"""
+Benchmark: time from process start to the first useful /api/weather-data response.
+
+Each scenario runs in a fresh interpreter, against a local upstream serving
+15k readings or an unreachable one, with and without a snapshot archive
+written by an earlier run. "useful" means the response carried readings.
+
+Run from the repository root:
+    python benchmarks/bench_cold_start.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CHILD = r'''
+import time
+started = time.perf_counter()
+import json, logging, sys
+sys.path.insert(0, {root!r})
+logging.disable(logging.CRITICAL)
+from app import create_app
+from config import ProductionConfig, config
+imported = time.perf_counter()
+config['bench'] = type('BenchConfig', (ProductionConfig,), {{
+    'API_URL': {url!r}, 'API_TIMEOUT': 5, 'BACKGROUND_REFRESH': False,
+    'SNAPSHOT_ARCHIVE_PATH': {archive!r},
+}})
+app = create_app('bench')
+created = time.perf_counter()
+response = app.test_client().get('/api/weather-data')
+answered = time.perf_counter()
+print(json.dumps({{
+    'import': imported - started,
+    'create_app': created - imported,
+    'first_response': answered - created,
+    'total': answered - started,
+    'count': response.get_json().get('count', 0),
+    'startup': app.weather_service.get_cache_status()['startup'],
+}}))
+'''
+
+
+class Upstream(BaseHTTPRequestHandler):
+    body = b'[]'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_child(url, archive):
+    script = CHILD.format(root=ROOT, url=url, archive=archive)
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    end = datetime.now()
+    Upstream.body = json.dumps([
+        {
+            'StationID': f'St{station + 1}',
+            'DateTime': (end - timedelta(minutes=5 * i)).strftime('%Y-%m-%d %H:%M:%S'),
+            'WaterLevel': str(600 + i % 400),
+            'HourlyRain': str(i % 20),
+            'Temperature': '28.1',
+        }
+        for station in range(5)
+        for i in range(3000)
+    ]).encode('utf-8')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Upstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    up = f'http://127.0.0.1:{server.server_port}/'
+    down = 'http://127.0.0.1:9/'
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = os.path.join(directory, 'snapshot.archive')
+        scenarios = [
+            ('cold, upstream up', up, None),
+            ('cold, upstream down', down, None),
+            ('(writes the archive)', up, archive),
+            ('warm, upstream up', up, archive),
+            ('warm, upstream down', down, archive),
+        ]
+        print(f"{'':<24} {'import':>8} {'create':>8} {'first':>8} {'total':>8} {'readings':>9}  source")
+        for label, url, archive_path in scenarios:
+            result = run_child(url, archive_path)
+            if label.startswith('('):
+                continue
+            print(f"{label:<24} {result['import'] * 1000:>6.0f}ms {result['create_app'] * 1000:>6.0f}ms "
+                  f"{result['first_response'] * 1000:>6.0f}ms {result['total'] * 1000:>6.0f}ms "
+                  f"{result['count']:>9,}  {result['startup']['source']}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: history chunks against the raw JSON snapshot.
+
+A week of 1-minute readings from 50 stations (WaterLevel, HourlyRain,
+Temperature, Humidity, Pressure, WindSpeed, HeatIndex with the decimals the
+sensors report) stored as upstream JSON, as SQLite rows and as one chunk per
+station and day. Reports the size of each, the time to get NumPy columns
+back (json.loads + ColumnarStore versus decoding the chunks), and daily
+stats from chunk headers versus from decoded chunks.
+
+Run from the repository root:
+    python benchmarks/bench_history_chunks.py
+"""
+
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+logging.disable(logging.CRITICAL)
+
+from services.columnar_store import ColumnarStore
+from services.history_chunks import HEADER_SIZE, decode_chunk, read_header
+from services.history_store import HistoryStore
+from services.snapshot import WeatherSnapshot
+from utils.timestamps import datetime_to_epoch
+
+STATIONS = [f'St{i + 1}' for i in range(50)]
+DAYS = 7
+PER_DAY = 24 * 60
+
+
+def generate_readings(start):
+    rng = np.random.default_rng(7)
+    count = DAYS * PER_DAY
+    readings = []
+    for station_id in STATIONS:
+        level = np.round(2 + np.cumsum(rng.normal(0, 0.005, count)), 2)
+        rain = np.where(rng.random(count) < 0.85, 0.0, np.round(rng.gamma(1.0, 2.0, count), 1))
+        temperature = np.round(27 + 3 * np.sin(np.arange(count) / PER_DAY * 2 * np.pi) + rng.normal(0, 0.2, count), 1)
+        humidity = np.clip(np.round(75 + np.cumsum(rng.normal(0, 0.3, count))), 30, 100)
+        pressure = np.round(1008 + np.cumsum(rng.normal(0, 0.02, count)), 1)
+        wind = np.round(np.abs(rng.normal(3, 1.5, count)), 1)
+        heat = np.round(temperature + 0.1 * (humidity - 40), 1)
+        for i in range(count):
+            readings.append({
+                'StationID': station_id,
+                'DateTime': (start + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S'),
+                'WaterLevel': level[i], 'HourlyRain': rain[i], 'Temperature': temperature[i],
+                'Humidity': humidity[i], 'Pressure': pressure[i], 'WindSpeed': wind[i], 'HeatIndex': heat[i],
+            })
+    return readings
+
+
+def live_bytes(path):
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    pages = connection.execute('PRAGMA page_count').fetchone()[0] - connection.execute('PRAGMA freelist_count').fetchone()[0]
+    size = pages * connection.execute('PRAGMA page_size').fetchone()[0]
+    connection.close()
+    return size
+
+
+def best_of(function, repeat=5):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - started)
+    return min(durations), result
+
+
+def main():
+    start = datetime(2025, 6, 1)
+    readings = generate_readings(start)
+    count = len(readings)
+    body = json.dumps([{k: (float(v) if k != 'StationID' and k != 'DateTime' else v) for k, v in r.items()}
+                       for r in readings]).encode('utf-8')
+    window = (datetime_to_epoch(start), datetime_to_epoch(start + timedelta(days=DAYS)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'))
+        store.ingest(WeatherSnapshot(readings))
+        row_bytes = live_bytes(store.path)
+        started = time.perf_counter()
+        chunk_count = store.compact(window[1])
+        compact_seconds = time.perf_counter() - started
+        chunk_db_bytes = live_bytes(store.path)
+        blobs = [data for (data,) in sqlite3.connect(store.path).execute('SELECT data FROM chunks')]
+        chunk_bytes = sum(len(data) for data in blobs)
+
+        print(f"{count:,} readings, {len(STATIONS)} stations x {DAYS} days, 1-minute interval\n")
+        print(f"{'format':<26} {'bytes':>13} {'B/reading':>10} {'vs JSON':>8}")
+        for label, size in (
+            ('JSON snapshot', len(body)),
+            ('JSON snapshot, gzip -6', len(gzip.compress(body, 6))),
+            ('SQLite rows', row_bytes),
+            ('SQLite chunks', chunk_db_bytes),
+            (f'chunk blobs ({chunk_count})', chunk_bytes),
+        ):
+            print(f"{label:<26} {size:>13,} {size / count:>10.2f} {len(body) / size:>7.1f}x")
+        print(f"\ncompaction: {compact_seconds:.2f}s ({compact_seconds / chunk_count * 1000:.2f}ms per station-day)\n")
+
+        json_seconds, _ = best_of(lambda: ColumnarStore.from_readings(json.loads(body)), repeat=2)
+        decode_seconds, _ = best_of(lambda: [decode_chunk(data) for data in blobs])
+        one_field_seconds, _ = best_of(lambda: [decode_chunk(data, ['WaterLevel']) for data in blobs])
+        store_seconds, columns = best_of(lambda: store.columns_between(*window))
+        assert len(columns) == count
+        print(f"{'to NumPy columns':<34} {'total':>9} {'ns/reading':>11} {'readings/s':>13}")
+        for label, seconds in (
+            ('json.loads + ColumnarStore', json_seconds),
+            ('decode chunks, all fields', decode_seconds),
+            ('decode chunks, WaterLevel only', one_field_seconds),
+            ('HistoryStore.columns_between', store_seconds),
+        ):
+            print(f"{label:<34} {seconds * 1000:>7.1f}ms {seconds / count * 1e9:>11.1f} {count / seconds:>13,.0f}")
+
+        headers_seconds, _ = best_of(lambda: [read_header(data[:HEADER_SIZE]).stats['HourlyRain'] for data in blobs])
+        decoded_seconds, _ = best_of(lambda: [
+            (np.nansum(values), np.nanmax(values))
+            for values in (decode_chunk(data, ['HourlyRain']).fields['HourlyRain'] for data in blobs)
+        ])
+        query_seconds, stats = best_of(lambda: store.daily_stats('HourlyRain', *window))
+        assert sum(len(days) for days in stats.values()) == chunk_count
+        print(f"\n{'daily HourlyRain stats':<34} {'total':>9}")
+        for label, seconds in (
+            ('from chunk headers', headers_seconds),
+            ('from decoded chunks', decoded_seconds),
+            ('HistoryStore.daily_stats', query_seconds),
+        ):
+            print(f"{label:<34} {seconds * 1000:>7.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
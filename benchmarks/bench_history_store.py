@@ -0,0 +1,138 @@
+"""
+Benchmark: HistoryStore ingest and query throughput at 10M readings.
+
+Loads 50 stations of 15-minute readings (10M rows, about 5.7 years) in
+batched upserts and compacts the days before the upstream window into
+chunks, then measures the steady-state ingest of a snapshot (the upstream
+window with a few new readings), reopening the store, the date range
+lookup, reading one day for the 5 charted stations, alone and through the
+precipitation chart service, and a month of daily stats.
+
+Run from the repository root:
+    python benchmarks/bench_history_store.py [rows]
+"""
+
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+logging.disable(logging.CRITICAL)
+
+from services.history_store import HistoryStore
+from services.metrics_service import MetricsService
+from services.precipitation_service import PrecipitationService
+from services.snapshot import WeatherSnapshot
+from utils.timestamps import datetime_to_epoch
+
+STATIONS = [f'St{i + 1}' for i in range(50)]
+CHARTED = STATIONS[:5]
+STEP = 15 * 60
+
+
+def generate_rows(start_epoch, per_station):
+    for station_id in STATIONS:
+        for i in range(per_station):
+            yield (station_id, start_epoch + i * STEP,
+                   2.0 + (i % 400) / 100, float(i % 20), None, 28.1, None, None, None, None)
+
+
+def snapshot_readings(end, per_station):
+    return [
+        {
+            'StationID': station_id,
+            'DateTime': (end - timedelta(seconds=STEP * i)).strftime('%Y-%m-%d %H:%M:%S'),
+            'WaterLevel': 2.0 + (i % 400) / 100,
+            'HourlyRain': float(i % 20),
+            'Temperature': 28.1,
+        }
+        for station_id in STATIONS
+        for i in range(per_station)
+    ]
+
+
+def live_bytes(path):
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    pages = connection.execute('PRAGMA page_count').fetchone()[0] - connection.execute('PRAGMA freelist_count').fetchone()[0]
+    size = pages * connection.execute('PRAGMA page_size').fetchone()[0]
+    connection.close()
+    return size
+
+
+def timed(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations), max(durations)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    per_station = rows // len(STATIONS)
+    start = datetime(2020, 1, 1)
+    start_epoch = int(datetime_to_epoch(start))
+    end = start + timedelta(seconds=STEP * (per_station - 1))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'history.db')
+        store = HistoryStore(path)
+
+        started = time.perf_counter()
+        written = store.upsert(generate_rows(start_epoch, per_station))
+        elapsed = time.perf_counter() - started
+        print(f"bulk load          {written:>12,} rows  {elapsed:7.1f}s  {written / elapsed:>10,.0f} rows/s  "
+              f"{live_bytes(path) / 2 ** 20:,.0f} MiB")
+
+        # The upstream window (300 readings per station) with 4 new ones per station
+        snapshot = WeatherSnapshot(snapshot_readings(end + timedelta(hours=1), 300), version=1)
+        started = time.perf_counter()
+        chunks = store.compact(snapshot.columns.time_range()[0])
+        print(f"compaction         {chunks:>12,} chunks{time.perf_counter() - started:7.1f}s  "
+              f"{' ' * 17}{live_bytes(path) / 2 ** 20:,.0f} MiB")
+        started = time.perf_counter()
+        written = store.ingest(snapshot)
+        print(f"snapshot ingest    {written:>12,} rows  {(time.perf_counter() - started) * 1000:7.1f}ms  "
+              f"(of {len(snapshot):,} readings in the snapshot)")
+        median, _ = timed(lambda: store.ingest(snapshot), 20)
+        print(f"unchanged ingest   {0:>12,} rows  {median * 1000:7.1f}ms")
+
+        median, _ = timed(lambda: HistoryStore(path), 5)
+        print(f"reopen                                {median * 1000:7.1f}ms")
+        median, _ = timed(store.time_range, 50)
+        print(f"time_range                            {median * 1000:7.2f}ms")
+
+        days = (end - start).days
+        rng = random.Random(1)
+        day_starts = [datetime_to_epoch(start + timedelta(days=rng.randrange(days))) for _ in range(500)]
+        durations = []
+        for day_start in day_starts:
+            began = time.perf_counter()
+            columns = store.columns_between(day_start, day_start + 86400, CHARTED)
+            durations.append(time.perf_counter() - began)
+        assert len(columns) == len(CHARTED) * 96
+        print(f"day query          {len(columns):>12,} rows  {statistics.median(durations) * 1000:7.2f}ms median  "
+              f"{max(durations) * 1000:6.2f}ms max  {len(durations) / sum(durations):,.0f} queries/s")
+
+        sites = [{'id': station_id, 'name': station_id} for station_id in CHARTED]
+        service = PrecipitationService(MetricsService(sites=sites))
+        target = start + timedelta(days=days // 2)
+        day_start = datetime_to_epoch(target)
+        median, _ = timed(lambda: service.get_24hour_intervals_per_station(
+            store.columns_between(day_start, day_start + 86400, CHARTED), sites, target_date=target
+        ), 50)
+        print(f"precipitation chart from history       {median * 1000:7.2f}ms median")
+        median, _ = timed(lambda: store.daily_stats('HourlyRain', day_start, day_start + 30 * 86400, CHARTED), 50)
+        print(f"30 days of daily stats, 5 stations     {median * 1000:7.2f}ms median")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: vectorized hourly bucketing vs the per-reading loops it replaced.
+
+Run from the repository root:
+    python benchmarks/bench_hourly_buckets.py [count ...]
+"""
+
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.columnar_store import ColumnarStore
+from services.hourly_buckets import aggregate_hourly
+from utils.timestamps import datetime_to_epoch
+
+STATIONS = ('St1', 'St2', 'St3', 'St4', 'St5')
+DAY = datetime(2025, 1, 2)
+
+
+def legacy_parse(timestamp_str):
+    if not timestamp_str:
+        return None
+    for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f']:
+        try:
+            return datetime.strptime(timestamp_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_group(weather_data, intervals, start_time, end_time):
+    """PrecipitationService._group_readings_by_station_and_interval as originally written."""
+    station_data = defaultdict(lambda: defaultdict(list))
+    for reading in weather_data:
+        parsed_time = legacy_parse(reading.get('DateTime') or reading.get('DateTimeStamp', ''))
+        if not parsed_time:
+            continue
+        if not (start_time <= parsed_time <= end_time + timedelta(hours=1)):
+            continue
+        station_id = reading.get('StationID')
+        rainfall = reading.get('HourlyRain')
+        if not station_id or rainfall is None:
+            continue
+        try:
+            rainfall_float = float(rainfall)
+            if rainfall_float < 0:
+                continue
+        except (ValueError, TypeError):
+            continue
+        for interval_time in intervals:
+            next_interval = interval_time + timedelta(hours=1)
+            if interval_time <= parsed_time < next_interval:
+                station_data[station_id][interval_time].append(rainfall_float)
+                break
+    return station_data
+
+
+def columnar_loop(columns, intervals, start_time, end_time):
+    """The per-reading loop over columnar slices used before the bucket engine."""
+    station_data = defaultdict(lambda: defaultdict(list))
+    start_epoch = datetime_to_epoch(start_time)
+    end_epoch = datetime_to_epoch(end_time + timedelta(hours=1))
+    for station_id, station_columns in columns.stations.items():
+        day = station_columns.slice_between(start_epoch, end_epoch)
+        for epoch, value in zip(station_columns.epoch[day], station_columns.field('HourlyRain')[day]):
+            if np.isnan(value) or value < 0:
+                continue
+            station_data[station_id][intervals[int((epoch - start_epoch) // 3600)]].append(float(value))
+    return station_data
+
+
+def make_readings(count):
+    """Readings spread over three days so roughly a third fall on the charted day."""
+    random.seed(count)
+    base = DAY - timedelta(days=1)
+    return [
+        {
+            'StationID': random.choice(STATIONS),
+            'DateTime': (base + timedelta(seconds=random.randrange(3 * 86400))).strftime('%Y-%m-%d %H:%M:%S'),
+            'HourlyRain': random.choice([None, -1.0, round(random.random() * 40, 1)])
+        }
+        for _ in range(count)
+    ]
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    start_time = DAY
+    end_time = DAY.replace(hour=23)
+    intervals = [start_time + timedelta(hours=h) for h in range(24)]
+    start_epoch = datetime_to_epoch(start_time)
+
+    for count in counts:
+        readings = make_readings(count)
+        repeat = 3 if count <= 100_000 else 1
+        columns = ColumnarStore.from_readings(readings)
+
+        print(f"\n{count:,} readings")
+        legacy = timed(lambda: legacy_group(readings, intervals, start_time, end_time), repeat)
+        loop = timed(lambda: columnar_loop(columns, intervals, start_time, end_time), repeat)
+        build = timed(lambda: ColumnarStore.from_readings(readings), repeat)
+        engine = timed(lambda: aggregate_hourly(columns, 'HourlyRain', start_epoch, min_value=0.0), max(repeat, 5))
+        print(f"  {'legacy dict loop':<34} {legacy * 1000:10.2f} ms")
+        print(f"  {'columnar per-reading loop':<34} {loop * 1000:10.2f} ms")
+        print(f"  {'bucket engine':<34} {engine * 1000:10.2f} ms")
+        print(f"  {'(store build, once per snapshot)':<34} {build * 1000:10.2f} ms")
+        print(f"  speed-up: {legacy / engine:.0f}x vs legacy, {loop / engine:.0f}x vs columnar loop")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: N worker processes each polling upstream vs one shared snapshot.
+
+Serves a changing 15k-reading dataset from a local HTTP server, runs N worker
+processes that call fetch_weather_data() in a loop (as request threads would)
+and reports upstream requests, per-worker peak RSS, and whether the workers
+agreed on the snapshot version at the end.
+
+Run from the repository root:
+    python benchmarks/bench_shared_snapshot.py [workers ...]
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.shared_snapshot import SharedSnapshot
+from services.weather_service import WeatherService, WeatherCache
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+STATIONS = 5
+READINGS_PER_STATION = 3000
+TTL_SECONDS = 1
+RUN_SECONDS = 6
+
+
+class Upstream(BaseHTTPRequestHandler):
+    """Dataset whose newest reading moves on every second; counts requests."""
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with Upstream.lock:
+            Upstream.requests += 1
+        tick = int(time.time())
+        end = datetime(2025, 1, 2) + timedelta(minutes=tick % 100000)
+        body = json.dumps([
+            {
+                'StationID': f'St{station + 1}',
+                'DateTime': (end - timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S'),
+                'WaterLevel': str(600 + (tick + i) % 400),
+                'HourlyRain': str((tick + i) % 20),
+            }
+            for station in range(STATIONS)
+            for i in range(READINGS_PER_STATION)
+        ]).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def worker(url, shared_path, results):
+    logging.disable(logging.CRITICAL)
+    service = WeatherService(
+        api_url=url, timeout=10,
+        shared_snapshot=SharedSnapshot(shared_path) if shared_path else None
+    )
+    WeatherService._cache = WeatherCache(ttl_seconds=TTL_SECONDS)
+    deadline = time.monotonic() + RUN_SECONDS
+    while time.monotonic() < deadline:
+        service.fetch_weather_data()
+        time.sleep(0.05)
+    # Settle on the newest published version before reporting
+    time.sleep(0.5)
+    data = service.fetch_weather_data()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else float('nan')
+    role = service.shared.get_stats()['role'] if service.shared else 'independent'
+    results.put((role, getattr(data, 'version', None), len(data), rss))
+
+
+def run(count, url, shared):
+    Upstream.requests = 0
+    context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+    results = context.Queue()
+    with tempfile.TemporaryDirectory() as directory:
+        shared_path = os.path.join(directory, 'snapshot') if shared else None
+        processes = [context.Process(target=worker, args=(url, shared_path, results)) for _ in range(count)]
+        for process in processes:
+            process.start()
+        reports = [results.get(timeout=RUN_SECONDS + 60) for _ in processes]
+        for process in processes:
+            process.join()
+
+    versions = {version for _, version, _, _ in reports}
+    rss = [report[3] for report in reports]
+    leaders = sum(1 for role, _, _, _ in reports if role == 'leader')
+    label = f"shared ({leaders} leader)" if shared else "independent"
+    print(f"  {label:<22} upstream requests {Upstream.requests:>4}   "
+          f"RSS per worker {min(rss):.0f}-{max(rss):.0f} MB (total {sum(rss):.0f} MB)   "
+          f"versions at end {sorted(versions)}")
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [2, 8]
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Upstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/'
+
+    print(f"{STATIONS * READINGS_PER_STATION:,} readings, TTL {TTL_SECONDS}s, {RUN_SECONDS}s run")
+    for count in counts:
+        print(f"\n{count} workers")
+        run(count, url, shared=False)
+        run(count, url, shared=True)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
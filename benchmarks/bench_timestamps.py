@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: shared timestamp parser vs the per-service parsers it replaced.
+
+Run from the repository root:
+    python benchmarks/bench_timestamps.py [count]
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.timestamps import parse_timestamp, _parse_string
+
+
+def legacy_service_parse(timestamp_str):
+    """PrecipitationService/WaterLevelService._parse_timestamp before consolidation."""
+    if not timestamp_str:
+        return None
+    for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f']:
+        try:
+            return datetime.strptime(timestamp_str, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def legacy_metrics_parse(timestamp_str):
+    """MetricsService._parse_timestamp before consolidation."""
+    try:
+        ts = str(timestamp_str).replace('Z', '+00:00')
+        clean_ts = ts.split('+')[0].split('.')[0]
+        for fmt in ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S']:
+            try:
+                return datetime.strptime(clean_ts, fmt)
+            except ValueError:
+                continue
+        return datetime.fromisoformat(ts.replace('Z', ''))
+    except (ValueError, AttributeError):
+        return None
+
+
+def legacy_fromisoformat(timestamp_str):
+    """Inline parse in WeatherService.filter_by_station/get_latest_reading."""
+    return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+
+
+def uncached_parse(timestamp_str):
+    return _parse_string.__wrapped__(timestamp_str)
+
+
+def make_timestamps(count, distinct):
+    base = datetime(2025, 1, 1)
+    return [(base + timedelta(minutes=i % distinct)).strftime('%Y-%m-%d %H:%M:%S') for i in range(count)]
+
+
+def bench(label, func, values, repeat=3):
+    best = min(timeit.repeat(lambda: [func(v) for v in values], number=1, repeat=repeat))
+    print(f"  {label:<36} {best * 1000:9.1f} ms  {len(values) / best / 1e6:6.2f} M/s")
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    for distinct, title in ((count, 'all distinct'), (1440, 'repeated (one day of minutes)')):
+        values = make_timestamps(count, distinct)
+        print(f"\n{count:,} timestamps, {title}")
+        baseline = bench('legacy services (strptime)', legacy_service_parse, values)
+        bench('legacy metrics (split + strptime)', legacy_metrics_parse, values)
+        bench('legacy inline fromisoformat', legacy_fromisoformat, values)
+        fast = bench('shared parser, no memo', uncached_parse, values)
+        _parse_string.cache_clear()
+        memo = bench('shared parser (memoized)', parse_timestamp, values)
+        print(f"  speed-up vs legacy services: {baseline / fast:.1f}x (no memo), {baseline / memo:.1f}x (memo)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Load test: concurrent /api/events subscribers on one worker process.
+
+Starts the app on a threaded werkzeug server (one thread per open stream, as
+in production), connects N raw-socket subscribers, publishes a burst of
+events and measures how many arrive and how long fan-out takes.
+
+Run from the repository root:
+    python benchmarks/load_sse_subscribers.py [subscribers ...]
+"""
+
+import logging
+import os
+import re
+import selectors
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from werkzeug.serving import make_server
+
+from app import create_app
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+EVENTS = 10
+EVENT_INTERVAL = 0.2
+SENT_AT = re.compile(rb'"sent_at":([0-9.]+)')
+
+
+def rss_mb():
+    if resource is None:
+        return float('nan')
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def connect(port, count, timeout=30):
+    """Open count streams and wait until every one has received the retry preamble."""
+    selector = selectors.DefaultSelector()
+    request = b'GET /api/events HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n'
+    buffers = {}
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(request)
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ)
+        buffers[sock] = b''
+
+    ready = set()
+    deadline = time.monotonic() + timeout
+    while len(ready) < count and time.monotonic() < deadline:
+        for key, _ in selector.select(timeout=1):
+            chunk = key.fileobj.recv(65536)
+            buffers[key.fileobj] += chunk
+            if b'retry:' in buffers[key.fileobj]:
+                ready.add(key.fileobj)
+    return selector, buffers, len(ready)
+
+
+def collect(selector, buffers, expected, timeout=30):
+    """Read until every stream has seen `expected` events. Returns per-event delivery latencies."""
+    latencies = []
+    received = dict.fromkeys(buffers, 0)
+    done = 0
+    deadline = time.monotonic() + timeout
+    while done < len(buffers) and time.monotonic() < deadline:
+        for key, _ in selector.select(timeout=1):
+            sock = key.fileobj
+            chunk = sock.recv(65536)
+            now = time.time()
+            for match in SENT_AT.finditer(chunk):
+                latencies.append(now - float(match.group(1)))
+                received[sock] += 1
+                if received[sock] == expected:
+                    done += 1
+    return latencies, sum(received.values())
+
+
+def run(count):
+    app = create_app('testing')
+    hub = app.live_updates.hub
+    hub.max_subscribers = count
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    started = time.perf_counter()
+    selector, buffers, connected = connect(server.server_port, count)
+    connect_time = time.perf_counter() - started
+
+    publish_times = []
+    results = {}
+
+    def read_events():
+        results['latencies'], results['received'] = collect(selector, buffers, EVENTS)
+
+    reader = threading.Thread(target=read_events)
+    reader.start()
+    for version in range(EVENTS):
+        time.sleep(EVENT_INTERVAL)
+        begin = time.perf_counter()
+        hub.publish('readings', {'version': version, 'sent_at': time.time(), 'data': [], 'removed': []})
+        publish_times.append(time.perf_counter() - begin)
+    reader.join()
+
+    latencies = sorted(results.get('latencies', [])) or [float('nan')]
+    expected = connected * EVENTS
+    print(f"\n{count:,} subscribers ({connected:,} connected in {connect_time:.2f} s, "
+          f"{threading.active_count()} threads, peak RSS {rss_mb():.0f} MB)")
+    print(f"  delivered     {results.get('received', 0):,} / {expected:,} events")
+    print(f"  publish       {statistics.mean(publish_times) * 1000:8.2f} ms per event (fan-out to all queues)")
+    print(f"  latency p50   {latencies[len(latencies) // 2] * 1000:8.2f} ms")
+    print(f"  latency p99   {latencies[int(len(latencies) * 0.99)] * 1000:8.2f} ms")
+    print(f"  latency max   {latencies[-1] * 1000:8.2f} ms")
+
+    for key in list(selector.get_map().values()):
+        selector.unregister(key.fileobj)
+        key.fileobj.close()
+    hub.close()
+    server.shutdown()
+
+
+def main():
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    counts = [int(arg) for arg in sys.argv[1:]] or [100, 500, 1000, 2000]
+    for count in counts:
+        run(count)
+
+
+if __name__ == '__main__':
+    main()
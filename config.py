@@ -385,9 +385,67 @@ class APIConfig:
     BASE_URL = 'https://apaw.cspc.edu.ph/apawbalatanapi/APIv1/Weather'
     TIMEOUT = 8
     RETRY_ATTEMPTS = 3
+    REFRESH_AHEAD_SECONDS = 10
+    REFRESH_POLL_INTERVAL = 2
+    POOL_CONNECTIONS = 1
+    POOL_MAXSIZE = 4
+    # Query parameter the upstream accepts to return only rows newer than a timestamp.
+    # Leave as None to download the full window and diff it locally.
+    INCREMENTAL_SINCE_PARAM = None
+    INCREMENTAL_RETENTION_HOURS = 168
+    # Days of chart rollups materialized per snapshot, ending at its newest
+    # reading: the retention window plus the partial day at its start. Bounds
+    # the rollup buffers when upstream sends a bogus (e.g. 1970) timestamp.
+    ROLLUP_MAX_DAYS = INCREMENTAL_RETENTION_HOURS // 24 + 1
+    RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    # Cached API bodies are compressed once per data version, never per request.
+    # Higher levels save bandwidth for more CPU on each new version; 0 disables.
+    RESPONSE_GZIP_LEVEL = 6
+    RESPONSE_BROTLI_QUALITY = 5
+    RESPONSE_COMPRESS_MIN_BYTES = 1024
+    # Recent snapshot diffs kept for /api/weather-data/delta; older client
+    # versions get the full dataset instead.
+    DELTA_CHANGELOG_VERSIONS = 30
+    DELTA_CHANGELOG_MAX_READINGS = 50000
+    # /api/events push channel. Each open stream holds a server thread for as
+    # long as it is connected; clients more than EVENT_QUEUE_SIZE events behind
+    # are told to resync instead. With a fixed thread pool (SERVER_THREADS)
+    # streams may take EVENT_THREAD_SHARE of it, and further clients get a 503
+    # and poll; EVENT_MAX_SUBSCRIBERS caps servers without a fixed pool.
+    EVENT_QUEUE_SIZE = 32
+    EVENT_HISTORY = 128
+    EVENT_HEARTBEAT_SECONDS = 15
+    EVENT_MAX_SUBSCRIBERS = 1000
+    EVENT_THREAD_SHARE = 0.5
+    EVENT_REJECT_RETRY_SECONDS = 60
+    BATCH_MAX_RESOURCES = 10
+    # Config payloads requested under their content digest never change
+    STATIC_CONFIG_MAX_AGE = 365 * 24 * 3600
+    # Readiness fails once the snapshot has not been confirmed for this long;
+    # upstream latency is reported over the last UPSTREAM_LATENCY_WINDOW fetches.
+    HEALTH_MAX_SNAPSHOT_AGE = 900
+    UPSTREAM_LATENCY_WINDOW = 50
+    # After UPSTREAM_FAILURE_THRESHOLD failed fetches in a row upstream is not
+    # called (cached data is served) for a jittered delay doubling from
+    # UPSTREAM_BACKOFF_BASE up to UPSTREAM_BACKOFF_MAX seconds, then retried once.
+    UPSTREAM_FAILURE_THRESHOLD = 3
+    UPSTREAM_BACKOFF_BASE = 5
+    UPSTREAM_BACKOFF_MAX = 300
+    # ?refresh=true bypasses the cache at most once per interval per process
+    FORCE_REFRESH_MIN_INTERVAL = 30
+    # Readings are written to the history database in transactions of this many rows
+    HISTORY_BATCH_SIZE = 5000
+    HISTORY_STATS_MAX_DAYS = 366
 
     ENDPOINTS = {
         'weather': '/api/weather-data',
+        'weather_delta': '/api/weather-data/delta',
+        'events': '/api/events',
+        'batch': '/api/batch',
+        'health': '/api/health',
+        'liveness': '/api/health/live',
+        'readiness': '/api/health/ready',
+        'history_daily_stats': '/api/history/daily-stats',
         'precipitation': '/api/precipitation-data',
         'water_level': '/api/water-level-data',
         'stations': '/api/config/stations',
@@ -459,6 +517,53 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     API_URL = APIConfig.BASE_URL
     API_TIMEOUT = APIConfig.TIMEOUT
+    BACKGROUND_REFRESH = True
+    REFRESH_AHEAD_SECONDS = APIConfig.REFRESH_AHEAD_SECONDS
+    REFRESH_POLL_INTERVAL = APIConfig.REFRESH_POLL_INTERVAL
+    API_POOL_CONNECTIONS = APIConfig.POOL_CONNECTIONS
+    API_POOL_MAXSIZE = APIConfig.POOL_MAXSIZE
+    API_INCREMENTAL_PARAM = APIConfig.INCREMENTAL_SINCE_PARAM
+    API_RETENTION_HOURS = APIConfig.INCREMENTAL_RETENTION_HOURS
+    ROLLUP_MAX_DAYS = APIConfig.ROLLUP_MAX_DAYS
+    RESPONSE_CACHE_MAX_BYTES = APIConfig.RESPONSE_CACHE_MAX_BYTES
+    RESPONSE_GZIP_LEVEL = APIConfig.RESPONSE_GZIP_LEVEL
+    RESPONSE_BROTLI_QUALITY = APIConfig.RESPONSE_BROTLI_QUALITY
+    RESPONSE_COMPRESS_MIN_BYTES = APIConfig.RESPONSE_COMPRESS_MIN_BYTES
+    DELTA_CHANGELOG_VERSIONS = APIConfig.DELTA_CHANGELOG_VERSIONS
+    DELTA_CHANGELOG_MAX_READINGS = APIConfig.DELTA_CHANGELOG_MAX_READINGS
+    EVENT_QUEUE_SIZE = APIConfig.EVENT_QUEUE_SIZE
+    EVENT_HISTORY = APIConfig.EVENT_HISTORY
+    EVENT_HEARTBEAT_SECONDS = APIConfig.EVENT_HEARTBEAT_SECONDS
+    EVENT_MAX_SUBSCRIBERS = APIConfig.EVENT_MAX_SUBSCRIBERS
+    EVENT_THREAD_SHARE = APIConfig.EVENT_THREAD_SHARE
+    EVENT_REJECT_RETRY_SECONDS = APIConfig.EVENT_REJECT_RETRY_SECONDS
+    BATCH_MAX_RESOURCES = APIConfig.BATCH_MAX_RESOURCES
+    STATIC_CONFIG_MAX_AGE = APIConfig.STATIC_CONFIG_MAX_AGE
+    HEALTH_MAX_SNAPSHOT_AGE = APIConfig.HEALTH_MAX_SNAPSHOT_AGE
+    UPSTREAM_LATENCY_WINDOW = APIConfig.UPSTREAM_LATENCY_WINDOW
+    UPSTREAM_FAILURE_THRESHOLD = APIConfig.UPSTREAM_FAILURE_THRESHOLD
+    UPSTREAM_BACKOFF_BASE = APIConfig.UPSTREAM_BACKOFF_BASE
+    UPSTREAM_BACKOFF_MAX = APIConfig.UPSTREAM_BACKOFF_MAX
+    FORCE_REFRESH_MIN_INTERVAL = APIConfig.FORCE_REFRESH_MIN_INTERVAL
+    HISTORY_BATCH_SIZE = APIConfig.HISTORY_BATCH_SIZE
+    HISTORY_STATS_MAX_DAYS = APIConfig.HISTORY_STATS_MAX_DAYS
+    # Path of a snapshot file shared by the workers of one host (e.g. under
+    # /dev/shm): one worker fetches upstream and the others read its file.
+    # Unset, every worker fetches for itself.
+    SHARED_SNAPSHOT_PATH = os.environ.get('SHARED_SNAPSHOT_PATH')
+    # File the last good snapshot (with its rollups) is saved to after every
+    # fetch and loaded from at startup, so a restart serves data immediately
+    # even while upstream is down. Unset, every start is a cold start.
+    SNAPSHOT_ARCHIVE_PATH = os.environ.get('SNAPSHOT_ARCHIVE_PATH')
+    # SQLite database every fetched reading is kept in, so the chart endpoints
+    # can show dates older than the upstream window. Unset, only the current
+    # snapshot can be charted.
+    HISTORY_DB_PATH = os.environ.get('HISTORY_DB_PATH')
+    # Threads each worker process serves requests with (gunicorn.conf.py takes
+    # its `threads` from this). It bounds the /api/events streams: a sync
+    # worker (1) allows none. 0 for servers without a fixed pool (gevent, the
+    # development server).
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS') or 0)
     SITES = SiteConfig.SITES
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
 
@@ -484,6 +589,7 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
     API_TIMEOUT = 5
+    BACKGROUND_REFRESH = False
 
 
 config = {
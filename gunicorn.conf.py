@@ -0,0 +1,19 @@
+"""
+Gunicorn settings for the weather portal.
+
+    gunicorn -c gunicorn.conf.py 'app:create_app("production")'
+
+Every open /api/events stream holds a thread for as long as the browser is
+connected, so workers must be threaded: with the default sync worker one
+dashboard would block a whole process. The app reads the same SERVER_THREADS
+to size its stream limit (half the threads, see EVENT_THREAD_SHARE); change
+the thread count through it rather than with --threads so the two agree.
+A gevent worker (--worker-class gevent) also works, with SERVER_THREADS=0.
+"""
+
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+worker_class = 'gthread'
+threads = int(os.environ.setdefault('SERVER_THREADS', '16'))
@@ -1,19 +1,45 @@
 """API routes for JSON endpoints with caching support."""
 
 import logging
+import math
 from datetime import datetime
 from flask import Blueprint, request, current_app
-from config import UIColorSystem, ChartConfig, ColorAPI
+from werkzeug.test import EnvironBuilder
+from config import UIColorSystem, ChartConfig
+from services.columnar_store import NUMERIC_FIELDS
+from services.metrics_service import ALERT_LEVELS, RAINFALL_LEVELS
+from services.precipitation_service import DATA_INTERVAL_HOURS, LABEL_INTERVAL_HOURS
+from services.reading_query import ReadingQuery, decode_cursor, run_query
+from services.snapshot import get_columns
+from services.snapshot_changelog import delta_view, version_token
 from utils.validators import (
     validate_and_get_date,
+    validate_and_get_reading_filters,
+    validate_and_get_since_version,
+    validate_and_get_batch_requests,
+    validate_and_get_chart_format,
+    validate_and_get_daily_stats_params,
     create_api_error_response,
     create_api_success_response
 )
 from utils.error_handlers import handle_api_errors
+from utils.response_cache import CachedResponse, make_etag, to_http_datetime
+from utils.timestamps import datetime_to_epoch, epoch_to_datetime, to_epoch
 
 api_bp = Blueprint('api', __name__)
 logger = logging.getLogger(__name__)
 
+# Set on the environ of /api/batch sub-requests: the snapshot they all read
+BATCH_SNAPSHOT_KEY = 'weather.batch_snapshot'
+
+# Sub-resources /api/batch can combine, by their path under /api
+BATCH_RESOURCES = (
+    'config/stations', 'config/complete', 'css-variables',
+    'weather-data', 'weather-data/delta',
+    'precipitation-data', 'precipitation-date-range',
+    'water-level-data', 'water-level-date-range'
+)
+
 
 @api_bp.route('/config/stations')
 @handle_api_errors
@@ -39,104 +65,168 @@ def station_config():
 
 
 @api_bp.route('/config/complete')
+@api_bp.route('/config/complete/<version>')
 @handle_api_errors
-def complete_config():
+def complete_config(version=None):
     """Return complete configuration for frontend JavaScript."""
-    try:
-        from config import get_complete_config
-        config_data = get_complete_config()
-        config_data['api_url'] = current_app.config['API_URL']
-        config_data['api_timeout'] = current_app.config['API_TIMEOUT']
-        config_data['debug_mode'] = current_app.debug
-        config_data['generated_at'] = datetime.now().isoformat()
-        
-        return create_api_success_response(config_data)
-        
-    except Exception as e:
-        logger.error("Failed to load complete config: %s", str(e), exc_info=True)
-        return create_api_error_response(
-            'Configuration service temporarily unavailable',
-            503
-        )
+    return _static_payload_response('complete_config', version)
 
 
 @api_bp.route('/css-variables')
+@api_bp.route('/css-variables/<version>')
 @handle_api_errors
-def css_variables_api():
+def css_variables_api(version=None):
     """Serve CSS variables for JavaScript consumption."""
-    try:
-        return create_api_success_response(ColorAPI.get_javascript_config())
-    except Exception as e:
-        logger.error("Failed to load CSS variables: %s", str(e))
-        return create_api_error_response("Color configuration unavailable", 500)
+    return _static_payload_response('css_variables', version)
+
+
+def _static_payload_response(name, version):
+    """
+    Serve a payload built at app creation (see app.static_payloads).
+
+    Requested under its current digest the response is immutable, as the URL
+    changes with the content; the unversioned URL (or a digest from before a
+    deploy) gets the current body with an ETag to revalidate against.
+    """
+    payload = current_app.static_payloads.get(name)
+    encodings = tuple(payload.entry.variants)
+    etag = f'c-{payload.digest}'
+
+    matched = _not_modified_etag(etag, encodings, None)
+    if matched:
+        response = current_app.response_class(status=304)
+    else:
+        encoding = _negotiate_encoding(encodings)
+        body, encoding = payload.entry.render(None, current_app.json.dumps, encoding)
+        response = current_app.response_class(body, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        matched = _representation_etag(etag, encoding)
+
+    _set_validators(response, matched, None)
+    if version == payload.digest:
+        response.headers['Cache-Control'] = (
+            f"public, max-age={current_app.config['STATIC_CONFIG_MAX_AGE']}, immutable"
+        )
+    return response
 
 
 @api_bp.route('/health')
 def health_check():
-    """Health check endpoint with cache status."""
+    """Health summary with cache status, answered from memory without contacting the API."""
     try:
-        cache_status = current_app.weather_service.get_cache_status()
-        weather_data = current_app.weather_service.fetch_weather_data()
-        api_status = "healthy" if weather_data else "degraded"
+        service = current_app.weather_service
+        health = service.get_health(current_app.config['HEALTH_MAX_SNAPSHOT_AGE'])
+        upstream_ok = health['fetcher']['error_streak'] == 0
         
         health_status = {
-            "status": "healthy" if api_status == "healthy" else "degraded",
+            "status": "healthy" if health['ready'] and upstream_ok else "degraded",
             "timestamp": datetime.now().isoformat(),
             "version": "1.0.0",
             "services": {
-                "api": api_status,
-                "weather_service": "healthy",
+                "api": "healthy" if upstream_ok else "degraded",
+                "weather_service": "healthy" if health['live'] else "unhealthy",
                 "config": "healthy"
             },
-            "cache": cache_status,
+            "cache": service.get_cache_status(),
             "stations_count": len(current_app.config['SITES'])
         }
         
-        status_code = 200 if api_status == "healthy" else 503
-        return create_api_success_response(health_status), status_code
+        status_code = 200 if health['ready'] else 503
+        return _probe_response(health_status, status_code)
         
     except Exception as e:
         logger.error("Health check failed: %s", str(e), exc_info=True)
         return create_api_error_response('System health check failed', 503)
 
 
+@api_bp.route('/health/live')
+def liveness_probe():
+    """Liveness: the process is serving and its background refresher (if any) is running."""
+    health = current_app.weather_service.get_health(current_app.config['HEALTH_MAX_SNAPSHOT_AGE'])
+    return _probe_response(
+        {'status': 'alive' if health['live'] else 'dead', 'fetcher': health['fetcher']},
+        200 if health['live'] else 503
+    )
+
+
+@api_bp.route('/health/ready')
+def readiness_probe():
+    """
+    Readiness: a recent enough snapshot is in memory to serve from.
+    Upstream reachability is reported from the background fetcher's own
+    attempts; the probe itself never calls the API.
+    """
+    health = current_app.weather_service.get_health(current_app.config['HEALTH_MAX_SNAPSHOT_AGE'])
+    health['status'] = 'ready' if health['ready'] else 'not_ready'
+    return _probe_response(health, 200 if health['ready'] else 503)
+
+
+def _probe_response(payload, status_code):
+    response = create_api_success_response(payload)
+    response.status_code = status_code
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
 @api_bp.route('/weather-data')
 @handle_api_errors
 def weather_data():
     """
     Get weather data with cache support.
     Returns cached data when external API is unavailable.
+    
+    Optional query parameters (answered from the snapshot's station/time index):
+    fields (comma-separated projection), since/until (time window), limit and
+    cursor (newest-first pages; the response carries next_cursor) and
+    latest_only=true (one reading per station).
     """
     station_id = request.args.get('station_id')
     force_refresh = request.args.get('refresh', '').lower() == 'true'
+    filters, error_response = validate_and_get_reading_filters(request)
+    if error_response:
+        return error_response
+    query = ReadingQuery(station_id=station_id, **filters)
+    if query.cursor:
+        try:
+            decode_cursor(query.cursor)
+        except ValueError:
+            return create_api_error_response(f'Invalid cursor: {query.cursor}', 400)
     
     try:
-        weather_data = current_app.weather_service.fetch_weather_data(force_refresh=force_refresh)
+        weather_data = _weather_data(force_refresh=force_refresh)
         cache_status = current_app.weather_service.get_cache_status()
         
         if not weather_data:
             logger.warning("No weather data available")
-            return create_api_error_response(
+            response = create_api_error_response(
                 'Weather data temporarily unavailable. Please try again.',
                 503
             )
+            retry_after = current_app.weather_service.breaker.retry_after()
+            if retry_after:
+                response[0].headers['Retry-After'] = str(math.ceil(retry_after))
+            return response
         
-        if station_id:
-            weather_data = [d for d in weather_data if d.get('StationID') == station_id]
+        def build_payload():
+            result = run_query(weather_data, query)
+            payload = {
+                'data': result.readings,
+                'count': len(result.readings),
+                'station_id': station_id
+            }
+            if query.limit is not None or query.cursor is not None:
+                payload['next_cursor'] = result.next_cursor
+            return payload
         
-        response_data = {
-            'data': weather_data,
-            'count': len(weather_data),
-            'station_id': station_id,
+        return _cached_json_response(weather_data, build_payload, {
             'generated_at': datetime.now().isoformat(),
             'cache_status': {
                 'is_cached': cache_status.get('age_seconds', 0) > 5,
                 'age_seconds': cache_status.get('age_seconds'),
                 'last_success': cache_status.get('last_success')
             }
-        }
-        
-        return create_api_success_response(response_data)
+        })
         
     except Exception as e:
         logger.error("Weather data endpoint error: %s", str(e), exc_info=True)
@@ -146,14 +236,20 @@ def weather_data():
 @api_bp.route('/precipitation-data')
 @handle_api_errors
 def precipitation_data():
-    """Get 24-hour precipitation data with caching."""
+    """
+    Get 24-hour precipitation data with caching.
+    format=columnar returns parallel arrays per station (see _format_columnar_response).
+    """
     target_date, error_response = validate_and_get_date(request)
+    if error_response:
+        return error_response
+    chart_format, error_response = validate_and_get_chart_format(request)
     if error_response:
         return error_response
 
     station_id = request.args.get('station_id')
 
-    weather_data = current_app.weather_service.fetch_weather_data()
+    weather_data = _weather_data()
     cache_status = current_app.weather_service.get_cache_status()
     
     if not weather_data:
@@ -162,51 +258,59 @@ def precipitation_data():
             503
         )
 
-    per_station_data = current_app.precipitation_service.get_24hour_intervals_per_station(
-        weather_data=weather_data,
-        sites=current_app.config['SITES'],
-        target_date=target_date
-    )
+    display_date = target_date or datetime.now()
 
-    if station_id:
-        per_station_data = {k: v for k, v in per_station_data.items() if k == station_id}
+    def build_payload():
+        per_station_data = current_app.precipitation_service.get_24hour_intervals_per_station(
+            weather_data=_chart_readings(weather_data, target_date),
+            sites=current_app.config['SITES'],
+            target_date=target_date
+        )
 
-    stations_response = _format_precipitation_response(
-        per_station_data,
-        current_app.config['SITES']
-    )
+        if station_id:
+            per_station_data = {k: v for k, v in per_station_data.items() if k == station_id}
 
-    display_date = target_date or datetime.now()
-    return create_api_success_response({
-        'stations': stations_response,
-        'unit': 'mm/hour',
-        'interval': '1 hour',
-        'date': display_date.strftime('%Y-%m-%d'),
-        'date_display': display_date.strftime('%B %d, %Y'),
-        'station_id': station_id,
+        if chart_format == 'columnar':
+            chart = _format_columnar_response(
+                per_station_data, current_app.config['SITES'], 'intensity', RAINFALL_LEVELS
+            )
+        else:
+            chart = {'stations': _format_precipitation_response(per_station_data, current_app.config['SITES'])}
+
+        return {
+            **chart,
+            'unit': 'mm/hour',
+            'interval': '1 hour',
+            'date': display_date.strftime('%Y-%m-%d'),
+            'date_display': display_date.strftime('%B %d, %Y'),
+            'station_id': station_id
+        }
+
+    return _cached_json_response(weather_data, build_payload, {
         'generated_at': datetime.now().isoformat(),
         'cache_status': {
             'is_cached': cache_status.get('age_seconds', 0) > 5,
             'age_seconds': cache_status.get('age_seconds')
         }
-    })
+    }, key_extra=(display_date.strftime('%Y-%m-%d'),))
 
 
 @api_bp.route('/precipitation-date-range')
 @handle_api_errors
 def precipitation_date_range():
     """Get available date range for precipitation data."""
-    weather_data = current_app.weather_service.fetch_weather_data()
+    weather_data = _weather_data()
     if not weather_data:
         return create_api_error_response('No weather data available', 503)
 
     date_range = current_app.precipitation_service.get_available_date_range(weather_data)
     if not date_range:
         return create_api_error_response('No valid timestamps in data', 503)
+    _extend_to_history(date_range)
 
     total_days = (date_range['latest'] - date_range['earliest']).days + 1
 
-    return create_api_success_response({
+    return _cached_json_response(weather_data, lambda: {
         'earliest_date': date_range['earliest'].strftime('%Y-%m-%d'),
         'latest_date': date_range['latest'].strftime('%Y-%m-%d'),
         'earliest_display': date_range['earliest'].strftime('%B %d, %Y'),
@@ -218,14 +322,20 @@ def precipitation_date_range():
 @api_bp.route('/water-level-data')
 @handle_api_errors
 def water_level_data():
-    """Get 24-hour water level data with caching."""
+    """
+    Get 24-hour water level data with caching.
+    format=columnar returns parallel arrays per station (see _format_columnar_response).
+    """
     target_date, error_response = validate_and_get_date(request)
+    if error_response:
+        return error_response
+    chart_format, error_response = validate_and_get_chart_format(request)
     if error_response:
         return error_response
 
     station_id = request.args.get('station_id')
 
-    weather_data = current_app.weather_service.fetch_weather_data()
+    weather_data = _weather_data()
     cache_status = current_app.weather_service.get_cache_status()
     
     if not weather_data:
@@ -234,52 +344,64 @@ def water_level_data():
             503
         )
 
-    per_station_data = current_app.water_level_service.get_24hour_intervals_per_station(
-        weather_data=weather_data,
-        sites=current_app.config['SITES'],
-        target_date=target_date
-    )
+    display_date = target_date or datetime.now()
 
-    if station_id:
-        per_station_data = {k: v for k, v in per_station_data.items() if k == station_id}
+    def build_payload():
+        per_station_data = current_app.water_level_service.get_24hour_intervals_per_station(
+            weather_data=_chart_readings(weather_data, target_date),
+            sites=current_app.config['SITES'],
+            target_date=target_date
+        )
 
-    stations_response = _format_water_level_response(
-        per_station_data,
-        current_app.config['SITES'],
-        current_app.water_level_service
-    )
+        if station_id:
+            per_station_data = {k: v for k, v in per_station_data.items() if k == station_id}
 
-    display_date = target_date or datetime.now()
-    return create_api_success_response({
-        'stations': stations_response,
-        'unit': 'centimeters',
-        'interval': '1 hour',
-        'date': display_date.strftime('%Y-%m-%d'),
-        'date_display': display_date.strftime('%B %d, %Y'),
-        'station_id': station_id,
+        if chart_format == 'columnar':
+            chart = _format_columnar_response(
+                per_station_data, current_app.config['SITES'], 'alert_level', ALERT_LEVELS,
+                current_app.water_level_service
+            )
+        else:
+            chart = {'stations': _format_water_level_response(
+                per_station_data,
+                current_app.config['SITES'],
+                current_app.water_level_service
+            )}
+
+        return {
+            **chart,
+            'unit': 'centimeters',
+            'interval': '1 hour',
+            'date': display_date.strftime('%Y-%m-%d'),
+            'date_display': display_date.strftime('%B %d, %Y'),
+            'station_id': station_id
+        }
+
+    return _cached_json_response(weather_data, build_payload, {
         'generated_at': datetime.now().isoformat(),
         'cache_status': {
             'is_cached': cache_status.get('age_seconds', 0) > 5,
             'age_seconds': cache_status.get('age_seconds')
         }
-    })
+    }, key_extra=(display_date.strftime('%Y-%m-%d'),))
 
 
 @api_bp.route('/water-level-date-range')
 @handle_api_errors
 def water_level_date_range():
     """Get available date range for water level data."""
-    weather_data = current_app.weather_service.fetch_weather_data()
+    weather_data = _weather_data()
     if not weather_data:
         return create_api_error_response('No weather data available', 503)
 
     date_range = current_app.water_level_service.get_available_date_range(weather_data)
     if not date_range:
         return create_api_error_response('No valid timestamps in data', 503)
+    _extend_to_history(date_range)
 
     total_days = (date_range['latest'] - date_range['earliest']).days + 1
 
-    return create_api_success_response({
+    return _cached_json_response(weather_data, lambda: {
         'earliest_date': date_range['earliest'].strftime('%Y-%m-%d'),
         'latest_date': date_range['latest'].strftime('%Y-%m-%d'),
         'earliest_display': date_range['earliest'].strftime('%B %d, %Y'),
@@ -287,17 +409,340 @@ def water_level_date_range():
         'total_days': total_days
     })
 
+
+@api_bp.route('/history/daily-stats')
+@handle_api_errors
+def history_daily_stats():
+    """
+    Count, min, max, sum and mean of one field per station and day over a
+    date range (start to end, inclusive) from the history store. Compacted
+    days are answered from their chunk headers without decoding readings.
+    """
+    history = current_app.history_store
+    if history is None:
+        return create_api_error_response('History is not enabled', 404)
+    params, error_response = validate_and_get_daily_stats_params(
+        request, NUMERIC_FIELDS, current_app.config['HISTORY_STATS_MAX_DAYS']
+    )
+    if error_response:
+        return error_response
+    field_name, start_date, end_date = params
+
+    sites = current_app.config['SITES']
+    station_id = request.args.get('station_id')
+    station_ids = [station_id] if station_id else [site['id'] for site in sites]
+    start_epoch = datetime_to_epoch(start_date)
+    daily = history.daily_stats(field_name, start_epoch, datetime_to_epoch(end_date) + 24 * 3600, station_ids)
+
+    stations = {}
+    for station, days in daily.items():
+        site = next((s for s in sites if s['id'] == station), None)
+        stats = list(days.values())
+        stations[station] = {
+            'name': site['name'] if site else station,
+            'days': [epoch_to_datetime(day).strftime('%Y-%m-%d') for day in days],
+            'count': [day.count for day in stats],
+            'min': [day.min if day.count else None for day in stats],
+            'max': [day.max if day.count else None for day in stats],
+            'sum': [round(day.sum, 2) for day in stats],
+            'mean': [round(day.sum / day.count, 2) if day.count else None for day in stats]
+        }
+
+    return create_api_success_response({
+        'field': field_name,
+        'start': start_date.strftime('%Y-%m-%d'),
+        'end': end_date.strftime('%Y-%m-%d'),
+        'stations': stations
+    })
+
+
+@api_bp.route('/weather-data/delta')
+@handle_api_errors
+def weather_data_delta():
+    """
+    Readings added or changed since the client's copy of /api/weather-data.
+    
+    since_version is the `version` of the client's last delta response, a
+    token of the snapshot's version number and content digest. The response
+    carries the current version, the readings to upsert (data) and the
+    [StationID, DateTime] keys to drop (removed). If that version is no longer
+    in the changelog, its digest does not match what this process recorded
+    for it (another server, or one since restarted), or none is given, the
+    full view is returned with full=true and the client replaces its copy. Alternatively since (a
+    timestamp) returns the readings timestamped at or after it.
+    station_id and latest_only=true select the same views as /api/weather-data.
+    """
+    station_id = request.args.get('station_id')
+    latest_only = request.args.get('latest_only', '').lower() == 'true'
+    since_token, error_response = validate_and_get_since_version(request)
+    if error_response:
+        return error_response
+    since = None
+    if request.args.get('since'):
+        since = to_epoch(request.args['since'])
+        if since is None:
+            return create_api_error_response(f"Invalid since: {request.args['since']}", 400)
+    
+    weather_service = current_app.weather_service
+    weather_data = _weather_data()
+    if not weather_data:
+        return create_api_error_response('Weather data temporarily unavailable. Please try again.', 503)
+    
+    def build_payload():
+        digest = getattr(weather_data, 'digest', None)
+        payload = {
+            'version': version_token(weather_data.version, digest) if digest else None,
+            'station_id': station_id,
+            'full': False,
+            'removed': []
+        }
+        diff = weather_service.get_changes_since(weather_data, *since_token) if since_token is not None else None
+        if diff is not None:
+            readings, removed = delta_view(weather_data, diff, station_id, latest_only)
+            payload.update(since_version=version_token(*since_token), removed=[list(key) for key in removed])
+        else:
+            query = ReadingQuery(station_id=station_id, since=since, latest_only=latest_only)
+            readings = run_query(weather_data, query).readings
+            payload['full'] = since is None
+        payload.update(data=readings, count=len(readings))
+        return payload
+    
+    return _cached_json_response(weather_data, build_payload, {
+        'generated_at': datetime.now().isoformat()
+    })
+
+
+@api_bp.route('/events')
+@handle_api_errors
+def events():
+    """
+    Server-sent event stream of `readings` (latest-per-station deltas) and
+    `alert` (alert level changes) published on every new snapshot.
+    Reconnecting clients send Last-Event-ID and get what they missed, or a
+    `resync` event if it is no longer available. Each stream holds a server
+    thread, so once the process's stream limit is reached (see
+    event_subscriber_limit) clients get a 503 with Retry-After and poll.
+    """
+    hub = current_app.live_updates.hub
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    subscription = hub.subscribe(last_event_id)
+    if subscription is None:
+        retry_after = current_app.config['EVENT_REJECT_RETRY_SECONDS']
+        response = create_api_error_response('Too many live connections, poll instead.', 503)
+        response[0].headers['Retry-After'] = str(retry_after)
+        return response
+    
+    response = current_app.response_class(hub.stream(subscription), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@api_bp.route('/batch')
+@handle_api_errors
+def batch():
+    """
+    Several API resources in one response, all computed from one snapshot.
+    
+    ?resources=weather-data,rain:precipitation-data&rain.date=2025-01-02
+    returns {"version": ..., "results": {"weather-data": {"status": 200,
+    "body": {...}}, "rain": {...}}}. Each body is what the resource's own
+    endpoint returns (served from the same response cache), minus its
+    per-request generated_at/cache_status, which are reported once here.
+    """
+    sub_requests, error_response = validate_and_get_batch_requests(
+        request, BATCH_RESOURCES, current_app.config['BATCH_MAX_RESOURCES']
+    )
+    if error_response:
+        return error_response
+    
+    weather_data = _weather_data()
+    if not weather_data:
+        return create_api_error_response('Weather data temporarily unavailable. Please try again.', 503)
+    cache_status = current_app.weather_service.get_cache_status()
+    
+    def build_payload():
+        results = {}
+        for name, resource, params in sub_requests:
+            status, body = _dispatch_sub_request(resource, params, weather_data)
+            results[name] = {'status': status, 'body': body}
+        return {'version': getattr(weather_data, 'version', None), 'results': results}
+    
+    return _cached_json_response(weather_data, build_payload, {
+        'generated_at': datetime.now().isoformat(),
+        'cache_status': {
+            'is_cached': cache_status.get('age_seconds', 0) > 5,
+            'age_seconds': cache_status.get('age_seconds'),
+            'last_success': cache_status.get('last_success')
+        }
+    })
+
+
+def _dispatch_sub_request(resource, params, weather_data):
+    """Run the view for /api/<resource>?<params> against weather_data. Returns (status, decoded body)."""
+    builder = EnvironBuilder(
+        path=f'{request.script_root}/api/{resource}',
+        query_string=params,
+        headers={'Accept': 'application/json'}
+    )
+    environ = builder.get_environ()
+    environ[BATCH_SNAPSHOT_KEY] = weather_data
+    with current_app.request_context(environ):
+        response = current_app.make_response(current_app.dispatch_request())
+        return response.status_code, response.get_json(silent=True)
+
+
 @api_bp.route('/cache-status')
 @handle_api_errors
 def cache_status():
     """Get current cache status for monitoring."""
     try:
         status = current_app.weather_service.get_cache_status()
+        status['responses'] = current_app.response_cache.get_stats()
+        status['live'] = current_app.live_updates.get_stats()
+        if current_app.history_store is not None:
+            status['history'] = current_app.history_store.get_stats()
         return create_api_success_response(status)
     except Exception as e:
         return create_api_error_response(str(e), 500)
 
 
+def _chart_readings(weather_data, target_date):
+    """
+    What a date-based chart is built from: the snapshot, or, for a day that
+    starts before its oldest reading, that day's readings from the history
+    store (when one is configured).
+    """
+    history = current_app.history_store
+    if history is None or target_date is None:
+        return weather_data
+    day_start = datetime_to_epoch(target_date.replace(hour=0, minute=0, second=0, microsecond=0))
+    time_range = get_columns(weather_data).time_range()
+    if time_range is not None and day_start >= time_range[0]:
+        return weather_data
+    return history.columns_between(
+        day_start, day_start + 24 * 3600,
+        station_ids=[site['id'] for site in current_app.config['SITES']]
+    )
+
+
+def _extend_to_history(date_range):
+    """Move date_range['earliest'] back to the oldest reading in the history store."""
+    history = current_app.history_store
+    stored = history.time_range() if history is not None else None
+    if stored:
+        date_range['earliest'] = min(date_range['earliest'], epoch_to_datetime(stored[0]))
+    return date_range
+
+
+def _weather_data(force_refresh=False):
+    """The snapshot this request reads: pinned for /api/batch sub-requests, otherwise the current one."""
+    pinned = request.environ.get(BATCH_SNAPSHOT_KEY)
+    if pinned is not None:
+        return pinned
+    return current_app.weather_service.fetch_weather_data(force_refresh=force_refresh)
+
+
+def _cached_json_response(weather_data, build_payload, volatile_fields=None, key_extra=()):
+    """
+    Serve a success response whose body only depends on the request and the data version.
+
+    The encoded body is cached per (endpoint, query args, key_extra, snapshot
+    version) and build_payload is only called on a miss. volatile_fields
+    (generated_at, cache_status, ...) change on every request, so they are
+    kept out of the cached bytes and appended when responding.
+
+    Cached bodies are precompressed once, and the variant is picked from
+    Accept-Encoding. Responses carry an ETag for (key, snapshot digest, coding) and
+    Last-Modified from when the snapshot was fetched; a matching If-None-Match
+    (or, without one, a current If-Modified-Since) gets a bodiless 304 before
+    anything is built.
+    """
+    json_provider = current_app.json
+    cache = current_app.response_cache
+    if BATCH_SNAPSHOT_KEY in request.environ:
+        # Per-request fields are reported once for the whole batch
+        volatile_fields = None
+    version = getattr(weather_data, 'version', None)
+    key = (request.endpoint, tuple(sorted(request.args.items(multi=True)))) + tuple(key_extra)
+    encoding = _negotiate_encoding(cache.encodings)
+
+    etag = last_modified = None
+    content_digest = getattr(weather_data, 'digest', None)
+    if version is not None and content_digest is not None:
+        etag = make_etag(key, content_digest)
+        last_modified = to_http_datetime(getattr(weather_data, 'fetched_at', None))
+        matched = _not_modified_etag(etag, cache.encodings, last_modified)
+        if matched:
+            response = current_app.response_class(status=304)
+            _set_validators(response, matched, last_modified)
+            return response
+
+    entry = cache.get(key, version) if version is not None else None
+    cache_state = 'HIT'
+    if entry is None:
+        cache_state = 'MISS'
+        payload = {'success': True}
+        payload.update(build_payload())
+        body = json_provider.dumps(payload).encode('utf-8')
+        if version is not None:
+            entry = cache.put(key, version, body)
+        else:
+            entry = CachedResponse.from_body(body, version=0)
+
+    body, encoding = entry.render(volatile_fields, json_provider.dumps, encoding)
+    response = current_app.response_class(body, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['X-Cache'] = cache_state
+    _set_validators(response, _representation_etag(etag, encoding), last_modified)
+    return response
+
+
+def _negotiate_encoding(encodings):
+    """Best content coding the client accepts, ties going to the server's preference."""
+    best, best_quality = None, 0
+    for encoding in encodings:
+        quality = request.accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _representation_etag(etag, encoding):
+    if etag is None or encoding is None:
+        return etag
+    return f'{etag}-{encoding}'
+
+
+def _not_modified_etag(etag, encodings, last_modified):
+    """
+    Evaluate the request's conditional headers (If-None-Match takes precedence).
+    Any coding of the same version is still current, so the validator the client
+    holds is returned for the 304, or None if the full response is needed.
+    """
+    if request.if_none_match:
+        for candidate in (etag,) + tuple(_representation_etag(etag, e) for e in encodings):
+            if request.if_none_match.contains(candidate):
+                return candidate
+        return None
+    if request.if_modified_since and last_modified and last_modified <= request.if_modified_since:
+        return _representation_etag(etag, _negotiate_encoding(encodings))
+    return None
+
+
+def _set_validators(response, etag, last_modified):
+    if etag is None:
+        return
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Let browsers keep the body but always revalidate it
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+
+
 def _format_precipitation_response(per_station_data, sites):
     """Convert precipitation dataclass objects to JSON-serializable dicts."""
     stations_response = {}
@@ -358,4 +803,47 @@ def _format_water_level_response(per_station_data, sites, service):
             'statistics': stats
         }
 
-    return stations_response
\ No newline at end of file
+    return stations_response
+
+
+def _format_columnar_response(per_station_data, sites, level_field, levels, service=None):
+    """
+    Chart points as parallel arrays per station (the format=columnar layout).
+
+    Every station covers the same hourly intervals, so timestamps, labels,
+    day names and show_label are sent once as start/step_seconds/points,
+    day and label_interval_hours; `level_field` values become indexes into
+    `levels`. With a service, per-station summary statistics are included.
+    """
+    codes = {level: code for code, level in enumerate(levels)}
+    stations_response = {}
+    first = None
+
+    for station_id, data_points in per_station_data.items():
+        site = next((s for s in sites if s['id'] == station_id), None)
+        if not site:
+            continue
+        if first is None and data_points:
+            first = data_points[0]
+
+        station = {
+            'name': site['name'],
+            'y': [point.y for point in data_points],
+            'level': [codes[getattr(point, level_field)] for point in data_points],
+            'count': [point.count for point in data_points]
+        }
+        if service is not None:
+            station['statistics'] = service.get_summary_statistics(data_points)
+        stations_response[station_id] = station
+
+    return {
+        'format': 'columnar',
+        'start': first.timestamp if first else None,
+        'step_seconds': DATA_INTERVAL_HOURS * 3600,
+        'points': len(next(iter(per_station_data.values()), [])),
+        'day': first.day if first else None,
+        'label_interval_hours': LABEL_INTERVAL_HOURS,
+        'level_field': level_field,
+        'levels': list(levels),
+        'stations': stations_response
+    }
@@ -45,13 +45,10 @@ def site_detail(site_id):
         return render_template('errors/404.html'), 404
 
     weather_data = current_app.weather_service.fetch_weather_data()
-    site_weather = current_app.weather_service.filter_by_station(weather_data, site_id)
+    site_weather = current_app.weather_service.filter_by_station(weather_data, site_id, limit=24)
     
     # Get latest reading for current station
-    if site_id == 'St1':
-        latest = current_app.weather_service.get_mdrrmo_latest_reading(weather_data)
-    else:
-        latest = current_app.weather_service.get_latest_reading(site_weather)
+    latest = current_app.weather_service.get_station_latest_reading(weather_data, site_id)
     
     # Get latest readings for ALL stations (for "Other Stations" sidebar)
     all_stations_latest = current_app.weather_service.get_latest_per_station(weather_data)
@@ -62,7 +59,7 @@ def site_detail(site_id):
         site=site,
         latest=latest,
         weather_alert=weather_alert,
-        weather=site_weather[:24],
+        weather=site_weather,
         current_site_id=site_id,
         all_stations_latest=all_stations_latest
     )
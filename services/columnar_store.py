@@ -0,0 +1,168 @@
+"""Columnar Store - Per-station NumPy columns built once per weather snapshot."""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.timestamps import reading_epoch
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FIELDS = (
+    'WaterLevel', 'HourlyRain', 'WindSpeed', 'Temperature',
+    'Humidity', 'Pressure', 'HeatIndex', 'DailyRain'
+)
+
+
+def _to_float(value: Any) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+@dataclass
+class StationColumns:
+    """
+    One station's readings as parallel arrays sorted by time (oldest first).
+    `rows` holds each reading's position in the snapshot's raw list.
+    Missing or invalid values are NaN.
+    """
+    station_id: str
+    code: int
+    epoch: np.ndarray
+    rows: np.ndarray
+    fields: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.epoch)
+
+    def field(self, name: str) -> np.ndarray:
+        return self.fields[name]
+
+    def slice_between(self, start_epoch: float, end_epoch: float) -> slice:
+        """Index range of readings with start_epoch <= epoch < end_epoch."""
+        lo = int(np.searchsorted(self.epoch, start_epoch, side='left'))
+        hi = int(np.searchsorted(self.epoch, end_epoch, side='left'))
+        return slice(lo, hi)
+
+
+class ColumnarStore:
+    """
+    Readings with a valid StationID and timestamp, stored as one array per
+    field and partitioned by station. Each station's columns are views into
+    shared arrays sorted by (station, time), so building the store is a single
+    pass over the dicts plus one lexsort.
+    """
+
+    def __init__(
+        self,
+        station_ids: List[str],
+        station_code: np.ndarray,
+        epoch: np.ndarray,
+        rows: np.ndarray,
+        fields: Dict[str, np.ndarray]
+    ):
+        self.station_ids = station_ids
+        self.station_codes = {station_id: code for code, station_id in enumerate(station_ids)}
+        self.station_code = station_code
+        self.epoch = epoch
+        self.rows = rows
+        self.fields = fields
+        self.stations: Dict[str, StationColumns] = {}
+        self._newest_first: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+        bounds = np.searchsorted(station_code, np.arange(len(station_ids) + 1), side='left')
+        for code, station_id in enumerate(station_ids):
+            part = slice(int(bounds[code]), int(bounds[code + 1]))
+            self.stations[station_id] = StationColumns(
+                station_id=station_id,
+                code=code,
+                epoch=epoch[part],
+                rows=rows[part],
+                fields={name: values[part] for name, values in fields.items()}
+            )
+
+    def __reduce__(self):
+        # Pickle the shared arrays once; the per-station views are rebuilt on load
+        return self.__class__, (self.station_ids, self.station_code, self.epoch, self.rows, self.fields)
+
+    @classmethod
+    def from_readings(cls, readings: Sequence[Dict[str, Any]], epochs: Optional[Sequence[float]] = None) -> 'ColumnarStore':
+        """Build the store from sanitized reading dicts (optionally with pre-parsed epochs)."""
+        count = len(readings)
+        epoch = np.empty(count, dtype=np.float64)
+        codes = np.empty(count, dtype=np.int32)
+        values = {name: np.empty(count, dtype=np.float64) for name in NUMERIC_FIELDS}
+        station_codes: Dict[str, int] = {}
+
+        for i, reading in enumerate(readings):
+            station_id = reading.get('StationID')
+            if station_id:
+                code = station_codes.get(station_id)
+                if code is None:
+                    code = station_codes[station_id] = len(station_codes)
+                codes[i] = code
+            else:
+                codes[i] = -1
+            value = epochs[i] if epochs is not None else reading_epoch(reading)
+            epoch[i] = np.nan if value is None else value
+            for name in NUMERIC_FIELDS:
+                values[name][i] = _to_float(reading.get(name))
+
+        valid = (codes >= 0) & ~np.isnan(epoch)
+        rows = np.nonzero(valid)[0]
+
+        # Renumber stations alphabetically so codes are stable across snapshots
+        station_ids = sorted(station_codes)
+        remap = np.empty(len(station_codes), dtype=np.int32)
+        for new_code, station_id in enumerate(station_ids):
+            remap[station_codes[station_id]] = new_code
+        codes = remap[codes[rows]] if len(station_codes) else codes[rows]
+        epoch = epoch[rows]
+
+        order = np.lexsort((epoch, codes))
+        store = cls(
+            station_ids=station_ids,
+            station_code=codes[order],
+            epoch=epoch[order],
+            rows=rows[order],
+            fields={name: column[rows][order] for name, column in values.items()}
+        )
+        logger.debug("Built columnar store: %d readings, %d stations", len(store), len(station_ids))
+        return store
+
+    def __len__(self) -> int:
+        return len(self.epoch)
+
+    def station(self, station_id: str) -> Optional[StationColumns]:
+        return self.stations.get(station_id)
+
+    def time_range(self) -> Optional[tuple]:
+        """(earliest_epoch, latest_epoch) across all stations, or None if empty."""
+        if not len(self.epoch):
+            return None
+        return float(self.epoch.min()), float(self.epoch.max())
+
+    def newest_first(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (rows, negated epochs, station codes) ordered by time descending, ties
+        by station code, so the negated epochs ascend for searchsorted.
+        Computed on first use and kept for the snapshot's lifetime.
+        """
+        if self._newest_first is None:
+            order = np.lexsort((self.station_code, -self.epoch))
+            self._newest_first = (self.rows[order], -self.epoch[order], self.station_code[order])
+        return self._newest_first
+
+    def latest_rows(self) -> Dict[str, int]:
+        """Snapshot row index of the newest reading for every station."""
+        return {
+            station_id: int(columns.rows[-1])
+            for station_id, columns in self.stations.items()
+            if len(columns)
+        }
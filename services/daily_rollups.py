@@ -0,0 +1,158 @@
+"""Daily Rollups - Per-station daily chart data materialized once per snapshot."""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.columnar_store import ColumnarStore
+from services.hourly_buckets import HourlyBuckets, aggregate_hourly
+from services.snapshot import WeatherSnapshot
+from utils.timestamps import datetime_to_epoch, epoch_to_datetime
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+# Days materialized per snapshot when the caller does not say
+DEFAULT_MAX_DAYS = 31
+
+
+class StationSeries(list):
+    """A station's chart points for one day, carrying their precomputed summary statistics."""
+
+    def __init__(self, points, statistics: Optional[Dict[str, Any]] = None):
+        super().__init__(points)
+        self.statistics = statistics
+
+
+@dataclass
+class DayRollup:
+    """Formatted chart points (and their statistics) for every station on one day."""
+    day: date
+    stations: Dict[str, StationSeries] = field(default_factory=dict)
+
+
+class DailyRollups:
+    """
+    Day -> DayRollup for one field, rebuilt whenever a new snapshot is ingested.
+
+    All days are bucketed in a single aggregate_hourly pass. A day whose
+    per-station sums, counts and maxima are identical to the previous snapshot
+    keeps its previous DayRollup, so only days touched by new or evicted
+    readings are formatted and classified again. Lookups for the current
+    snapshot are then a dictionary access.
+
+    The buckets are sized by the days spanned, so the span is bounded: only
+    the max_days ending at the newest reading are materialized, and readings
+    dated more than a day in the future are not counted as the newest. A
+    single bogus upstream timestamp therefore cannot blow up the buffers;
+    days outside the span are aggregated on demand like any other.
+    """
+
+    def __init__(
+        self,
+        field_name: str,
+        build_day: Callable[[date, HourlyBuckets], DayRollup],
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        max_days: int = DEFAULT_MAX_DAYS
+    ):
+        self.field_name = field_name
+        self.min_value = min_value
+        self.max_value = max_value
+        self.max_days = max_days
+        self._build_day = build_day
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._days: Dict[date, Tuple[bytes, DayRollup]] = {}
+        self.last_recomputed: List[date] = []
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def materialize(self, snapshot: WeatherSnapshot) -> List[date]:
+        """Bring the rollups up to date with snapshot. Returns the days recomputed."""
+        with self._lock:
+            if self._version is not None and snapshot.version <= self._version:
+                return []
+
+            columns = snapshot.columns
+            previous = self._days
+            days: Dict[date, Tuple[bytes, DayRollup]] = {}
+            recomputed: List[date] = []
+
+            span = self._day_span(columns)
+            if span:
+                first, last = span
+                buckets = aggregate_hourly(
+                    columns, self.field_name, first * SECONDS_PER_DAY,
+                    hours=(last - first + 1) * 24,
+                    min_value=self.min_value,
+                    max_value=self.max_value
+                )
+                station_key = '\0'.join(buckets.station_ids).encode()
+
+                for offset in range(last - first + 1):
+                    window = buckets.window(offset * 24, 24)
+                    day = epoch_to_datetime(window.start_epoch).date()
+                    signature = b''.join((
+                        station_key, window.count.tobytes(), window.sum.tobytes(), window.max.tobytes()
+                    ))
+                    cached = previous.get(day)
+                    if cached is not None and cached[0] == signature:
+                        days[day] = cached
+                    else:
+                        days[day] = (signature, self._build_day(day, window))
+                        recomputed.append(day)
+
+            self._days = days
+            self._version = snapshot.version
+            self.last_recomputed = recomputed
+
+        logger.info("Materialized %s rollups for snapshot v%d: %d days, %d recomputed",
+                    self.field_name, snapshot.version, len(days), len(recomputed))
+        return recomputed
+
+    def _day_span(self, columns: ColumnarStore) -> Optional[Tuple[int, int]]:
+        """(first, last) day numbers to materialize, at most max_days apart, or None without readings."""
+        latest_plausible = datetime_to_epoch(datetime.now()) + SECONDS_PER_DAY
+        epochs = columns.epoch[columns.epoch <= latest_plausible]
+        if not len(epochs):
+            return None
+        last = int(epochs.max() // SECONDS_PER_DAY)
+        first = max(int(epochs.min() // SECONDS_PER_DAY), last - self.max_days + 1)
+        return first, last
+
+    def export_state(self) -> Tuple[Optional[int], Dict[date, Tuple[bytes, DayRollup]]]:
+        """(version, days) to persist alongside the snapshot they were built from."""
+        with self._lock:
+            return self._version, dict(self._days)
+
+    def restore_state(self, state: Tuple[Optional[int], Dict[date, Tuple[bytes, DayRollup]]]) -> bool:
+        """Adopt rollups saved by export_state() unless newer ones are already held."""
+        version, days = state
+        with self._lock:
+            if version is None or (self._version is not None and version <= self._version):
+                return False
+            self._days = dict(days)
+            self._version = version
+            self.last_recomputed = []
+        return True
+
+    def get(self, weather_data, day: date) -> Optional[DayRollup]:
+        """
+        The rollup for day if weather_data is the current (or a newer) snapshot.
+        Returns None for plain lists, older snapshots and days without data so
+        callers fall back to aggregating directly.
+        """
+        if not isinstance(weather_data, WeatherSnapshot):
+            return None
+        if self._version is None or weather_data.version > self._version:
+            self.materialize(weather_data)
+        if weather_data.version != self._version:
+            return None
+        cached = self._days.get(day)
+        return cached[1] if cached is not None else None
@@ -0,0 +1,205 @@
+"""History Chunks - One station-day of readings as compressed columns."""
+
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.columnar_store import NUMERIC_FIELDS
+
+MAGIC = b'WXCH'
+FORMAT_VERSION = 1
+# magic, format version, field count, first epoch, last epoch, readings
+HEADER = struct.Struct('<4sBBqqI')
+# per field, in NUMERIC_FIELDS order: non-missing count, min, max, sum
+FIELD_STATS = struct.Struct('<Iddd')
+HEADER_SIZE = HEADER.size + len(NUMERIC_FIELDS) * FIELD_STATS.size
+# encoding, decimal scale, has missing values, mask length, payload length
+BLOCK = struct.Struct('<BbBII')
+
+MISSING = 0     # every value is missing
+QUANTIZED = 1   # round(value * 10**scale) as deltas of integers
+XOR = 2         # float64 bits XORed with the previous value's
+
+MAX_SCALE = 6
+ZLIB_LEVEL = 6
+
+
+@dataclass(frozen=True)
+class FieldStats:
+    count: int
+    min: float
+    max: float
+    sum: float
+
+
+@dataclass(frozen=True)
+class ChunkHeader:
+    """What a chunk holds, readable without decoding any of it."""
+    first_epoch: int
+    last_epoch: int
+    count: int
+    stats: Dict[str, FieldStats] = field(default_factory=dict)
+
+
+@dataclass
+class DecodedChunk:
+    epoch: np.ndarray
+    fields: Dict[str, np.ndarray]
+
+
+def encode_chunk(epoch: np.ndarray, fields: Dict[str, np.ndarray]) -> bytes:
+    """
+    Encode readings sorted by epoch (whole seconds) with one array per
+    NUMERIC_FIELDS name (NaN for missing; absent names are all missing).
+
+    Timestamps are stored as delta-of-deltas, which are all zero for a
+    station reporting at a fixed interval. A field is stored as integer
+    deltas of value * 10**scale when some scale up to MAX_SCALE reproduces
+    every value exactly (sensor readings have a fixed number of decimals),
+    otherwise as the XOR of each value's bits with the previous one. Either
+    stream is narrowed to the smallest integer width that holds it and
+    deflated. Missing values are a bitmap, so they cost nothing in the stream.
+    """
+    epoch = np.asarray(epoch, dtype=np.int64)
+    count = len(epoch)
+    stats, blocks = [], []
+    for name in NUMERIC_FIELDS:
+        values = fields.get(name)
+        values = np.full(count, np.nan) if values is None else np.asarray(values, dtype=np.float64)
+        present = ~np.isnan(values)
+        valid = values[present]
+        if len(valid):
+            stats.append(FIELD_STATS.pack(len(valid), valid.min(), valid.max(), valid.sum()))
+        else:
+            stats.append(FIELD_STATS.pack(0, np.nan, np.nan, 0.0))
+        blocks.append(_encode_values(valid, present))
+
+    deltas = np.diff(epoch, prepend=epoch[:1])
+    timestamps = _pack_ints(np.diff(deltas, prepend=0))
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(NUMERIC_FIELDS),
+                         int(epoch[0]) if count else 0, int(epoch[-1]) if count else 0, count)
+    return b''.join([header, *stats, struct.pack('<I', len(timestamps)), timestamps, *blocks])
+
+
+def read_header(data: bytes) -> ChunkHeader:
+    """Parse the header, which is the first HEADER_SIZE bytes of a chunk."""
+    magic, version, field_count, first_epoch, last_epoch, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION or field_count != len(NUMERIC_FIELDS):
+        raise ValueError("not a history chunk")
+    stats = {}
+    for i, name in enumerate(NUMERIC_FIELDS):
+        stats[name] = FieldStats(*FIELD_STATS.unpack_from(data, HEADER.size + i * FIELD_STATS.size))
+    return ChunkHeader(first_epoch, last_epoch, count, stats)
+
+
+def decode_chunk(data: bytes, names: Optional[Iterable[str]] = None) -> DecodedChunk:
+    """Decode the timestamps and the names fields (default: all) into NumPy arrays."""
+    header = read_header(data)
+    wanted = set(NUMERIC_FIELDS if names is None else names)
+    count = header.count
+    offset = HEADER_SIZE
+
+    (length,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    if count:
+        dods = _unpack_ints(data[offset:offset + length])
+        epoch = (header.first_epoch + np.cumsum(np.cumsum(dods))).astype(np.float64)
+    else:
+        epoch = np.empty(0, dtype=np.float64)
+    offset += length
+
+    fields = {}
+    for name in NUMERIC_FIELDS:
+        encoding, scale, has_mask, mask_length, payload_length = BLOCK.unpack_from(data, offset)
+        offset += BLOCK.size
+        if name in wanted:
+            mask = data[offset:offset + mask_length]
+            payload = data[offset + mask_length:offset + mask_length + payload_length]
+            fields[name] = _decode_values(encoding, scale, has_mask, mask, payload, count)
+        offset += mask_length + payload_length
+    return DecodedChunk(epoch, fields)
+
+
+def _encode_values(valid: np.ndarray, present: np.ndarray) -> bytes:
+    has_mask = not present.all()
+    mask = zlib.compress(np.packbits(present).tobytes(), ZLIB_LEVEL) if has_mask else b''
+    if not len(valid):
+        return BLOCK.pack(MISSING, 0, has_mask, len(mask), 0) + mask
+
+    scale = _decimal_scale(valid)
+    if scale is not None:
+        quantized = np.round(valid * 10.0 ** scale).astype(np.int64)
+        payload = _pack_ints(np.diff(quantized, prepend=0))
+        encoding = QUANTIZED
+    else:
+        bits = valid.view(np.uint64)
+        previous = np.concatenate((np.zeros(1, dtype=np.uint64), bits[:-1]))
+        payload = _pack_ints(np.bitwise_xor(bits, previous).view(np.int64), zigzag=False)
+        encoding, scale = XOR, 0
+    return BLOCK.pack(encoding, scale, has_mask, len(mask), len(payload)) + mask + payload
+
+
+def _decode_values(encoding: int, scale: int, has_mask: int, mask: bytes, payload: bytes, count: int) -> np.ndarray:
+    if has_mask:
+        present = np.unpackbits(np.frombuffer(zlib.decompress(mask), dtype=np.uint8), count=count).astype(bool)
+    else:
+        present = None
+    if encoding == MISSING:
+        return np.full(count, np.nan)
+    if encoding == QUANTIZED:
+        valid = np.cumsum(_unpack_ints(payload)) / 10.0 ** scale
+    else:
+        valid = np.bitwise_xor.accumulate(_unpack_ints(payload, zigzag=False).view(np.uint64)).view(np.float64)
+    if present is None:
+        return valid
+    values = np.full(count, np.nan)
+    values[present] = valid
+    return values
+
+
+def _decimal_scale(valid: np.ndarray) -> Optional[int]:
+    """Smallest number of decimals that represents every value exactly, if any."""
+    magnitude = np.abs(valid).max()
+    for scale in range(MAX_SCALE + 1):
+        factor = 10.0 ** scale
+        if magnitude * factor >= 2 ** 53:
+            return None
+        if np.array_equal(np.round(valid * factor) / factor, valid):
+            return scale
+    return None
+
+
+def _pack_ints(values: np.ndarray, zigzag: bool = True) -> bytes:
+    """Deflate int64 values stored at the narrowest unsigned width (1/2/4/8 bytes) that fits them."""
+    values = np.asarray(values, dtype=np.int64)
+    if zigzag:
+        values = (values << 1) ^ (values >> 63)
+    unsigned = values.view(np.uint64)
+    top = int(unsigned.max()) if len(unsigned) else 0
+    width = next(w for w in (1, 2, 4, 8) if top < 1 << (8 * w))
+    return bytes((width,)) + zlib.compress(unsigned.astype(f'<u{width}').tobytes(), ZLIB_LEVEL)
+
+
+def _unpack_ints(data: bytes, zigzag: bool = True) -> np.ndarray:
+    width = data[0]
+    unsigned = np.frombuffer(zlib.decompress(data[1:]), dtype=f'<u{width}').astype(np.uint64)
+    values = unsigned.view(np.int64)
+    if zigzag:
+        values = (unsigned >> np.uint64(1)).view(np.int64) ^ -(values & 1)
+    return values
+
+
+def merge_columns(
+    parts: Sequence[Tuple[np.ndarray, Dict[str, np.ndarray]]]
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Concatenate (epoch, fields) parts into one time-ordered set; later parts win on equal epochs."""
+    epoch = np.concatenate([part[0] for part in parts])
+    fields = {name: np.concatenate([part[1][name] for part in parts]) for name in NUMERIC_FIELDS}
+    # Stable sort keeps part order among equal epochs; keep the last of each run
+    order = np.argsort(epoch, kind='stable')
+    epoch = epoch[order]
+    keep = np.append(epoch[1:] != epoch[:-1], True) if len(epoch) else np.empty(0, dtype=bool)
+    return epoch[keep], {name: values[order][keep] for name, values in fields.items()}
@@ -0,0 +1,462 @@
+"""History Store - Every ingested reading in SQLite, kept beyond the upstream window."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from services.columnar_store import NUMERIC_FIELDS, ColumnarStore
+from services.history_chunks import (
+    HEADER_SIZE, FieldStats, decode_chunk, encode_chunk, merge_columns, read_header
+)
+
+logger = logging.getLogger(__name__)
+
+# One row per station per second; numeric fields are NULL when missing
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    station_id TEXT NOT NULL,
+    epoch INTEGER NOT NULL,
+    {fields},
+    PRIMARY KEY (station_id, epoch)
+) WITHOUT ROWID
+""".format(fields=',\n    '.join(f'{name} REAL' for name in NUMERIC_FIELDS))
+
+# Settled days of a station, compacted into one encoded chunk each (see history_chunks)
+CHUNK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    station_id TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    first_epoch INTEGER NOT NULL,
+    last_epoch INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (station_id, day)
+)
+"""
+
+SECONDS_PER_DAY = 86400
+
+UPSERT = """
+INSERT INTO readings (station_id, epoch, {names}) VALUES (?, ?, {params})
+ON CONFLICT (station_id, epoch) DO UPDATE SET {updates}
+""".format(
+    names=', '.join(NUMERIC_FIELDS),
+    params=', '.join('?' for _ in NUMERIC_FIELDS),
+    updates=', '.join(f'{name} = excluded.{name}' for name in NUMERIC_FIELDS)
+)
+
+SELECT_ROWS = 'SELECT epoch, {names} FROM readings WHERE station_id = ? AND epoch >= ? AND epoch < ? ORDER BY epoch'.format(
+    names=', '.join(NUMERIC_FIELDS)
+)
+
+HistoryRow = Tuple[Any, ...]
+
+
+class HistoryStore:
+    """
+    Readings accumulated from every snapshot, for dates the upstream API no
+    longer returns.
+
+    Rows are keyed by (station_id, epoch) in a WITHOUT ROWID table, so the
+    primary key is the per-station time index: a day's readings for one
+    station are a single range scan, and re-ingesting a reading overwrites it
+    instead of duplicating it. Writes are upserted in batches of batch_size
+    rows per transaction. The database runs in WAL mode, so the ingest path
+    never blocks readers; each thread reads through its own connection.
+
+    ingest() only writes the readings of a snapshot that are new or changed
+    since the previous one it stored (or, for the first snapshot of the
+    process, since what is on disk for its window): the overlap between
+    consecutive snapshots costs a few NumPy comparisons per station rather
+    than a write, while corrected and late readings still reach the table.
+
+    Days that ended before the oldest reading of the ingested snapshot no
+    longer change upstream; they are compacted into one chunk per station and
+    day (a fifth to an eighteenth of the rows' size, depending on the reading
+    interval) and their rows deleted. Reads merge chunks and rows, and
+    daily_stats() answers from the chunk headers alone. A reading ingested for
+    a day that is already compacted is merged into its chunk right away.
+    """
+
+    def __init__(self, path: str, batch_size: int = 5000, busy_timeout: float = 5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.busy_timeout = busy_timeout
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+        self._inherited: List[sqlite3.Connection] = []
+        # Set up with a connection of its own, so none is open when the app is
+        # created before a fork (gunicorn --preload)
+        setup = self._connect()
+        try:
+            setup.execute('PRAGMA journal_mode=WAL')
+            setup.execute(SCHEMA)
+            setup.execute(CHUNK_SCHEMA)
+            setup.commit()
+            self._high_water: Dict[str, int] = _combine(
+                self._station_bounds(setup, 'MAX'),
+                self._station_bounds(setup, 'MAX', 'chunks'),
+                max
+            )
+        finally:
+            setup.close()
+        self._previous: Optional[ColumnarStore] = None
+        self.ingested = 0
+        self.compacted = 0
+        self.last_ingest_rows = 0
+        self.last_ingest_seconds: Optional[float] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+
+    @property
+    def _writer(self) -> sqlite3.Connection:
+        """
+        This process's write connection (use with _write_lock held), opened on
+        first write. SQLite connections must not be used across fork, so one
+        inherited from the parent is set aside, unused and unclosed, and a new
+        one opened.
+        """
+        if self._connection_pid != os.getpid():
+            if self._connection is not None:
+                self._inherited.append(self._connection)
+            self._connection = self._connect()
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = self._local.connection = self._connect()
+            self._local.pid = os.getpid()
+        return connection
+
+    def close(self):
+        with self._write_lock:
+            if self._connection is not None and self._connection_pid == os.getpid():
+                self._connection.close()
+            self._connection = self._connection_pid = None
+
+    def station_ids(self) -> List[str]:
+        """Stations with stored readings, in order."""
+        return sorted(self._high_water)
+
+    def upsert(self, rows: Iterable[HistoryRow]) -> int:
+        """
+        Insert or overwrite (station_id, epoch, *NUMERIC_FIELDS) rows, batch_size
+        per transaction. Returns the number of rows written.
+        """
+        written = 0
+        with self._write_lock:
+            for batch in _batches(rows, self.batch_size):
+                with self._writer:
+                    self._writer.executemany(UPSERT, batch)
+                written += len(batch)
+                for station_id, epoch, *_ in batch:
+                    if epoch > self._high_water.get(station_id, -1):
+                        self._high_water[station_id] = epoch
+        return written
+
+    def ingest(self, snapshot) -> int:
+        """Store the readings of snapshot that are new or changed since the last ingest. Returns rows written."""
+        started = time.perf_counter()
+        columns = snapshot.columns
+        previous = self._previous if self._previous is not None else self._stored_window(columns)
+        days: Set[Tuple[str, int]] = set()
+        written = self.upsert(self._changed_rows(columns, previous, days))
+        self._recompact(days)
+        self._previous = columns
+        time_range = columns.time_range()
+        if time_range:
+            self.compact(time_range[0])
+        self.ingested += written
+        self.last_ingest_rows = written
+        self.last_ingest_seconds = round(time.perf_counter() - started, 4)
+        if written:
+            logger.info("Stored %d readings of snapshot v%d in history (%.3fs)",
+                        written, getattr(snapshot, 'version', 0), self.last_ingest_seconds)
+        return written
+
+    def _stored_window(self, columns: ColumnarStore) -> ColumnarStore:
+        """What is already stored over the time range of columns, to diff the first snapshot against."""
+        time_range = columns.time_range()
+        if time_range is None:
+            return columns
+        return self.columns_between(time_range[0], time_range[1] + 1, columns.station_ids)
+
+    def _changed_rows(
+        self,
+        columns: ColumnarStore,
+        previous: ColumnarStore,
+        days: Set[Tuple[str, int]]
+    ) -> Iterator[HistoryRow]:
+        """Rows of columns missing from previous or with other values; adds their (station_id, day) to days."""
+        for station_id, station in columns.stations.items():
+            epochs = np.round(station.epoch).astype(np.int64)
+            changed = _changed(epochs, station, previous.station(station_id))
+            if not len(changed):
+                continue
+            touched = np.unique(epochs[changed] // SECONDS_PER_DAY * SECONDS_PER_DAY)
+            days.update((station_id, day) for day in touched.tolist())
+            values = [
+                np.where(np.isnan(column[changed]), None, column[changed]).tolist()
+                for column in (station.field(name) for name in NUMERIC_FIELDS)
+            ]
+            for i, epoch in enumerate(epochs[changed].tolist()):
+                yield (station_id, epoch, *(column[i] for column in values))
+
+    def _recompact(self, days: Iterable[Tuple[str, int]]):
+        """Merge rows written for already compacted days into their chunks."""
+        with self._write_lock:
+            for station_id, day in sorted(days):
+                chunked = self._writer.execute(
+                    'SELECT 1 FROM chunks WHERE station_id = ? AND day = ?', (station_id, day)
+                ).fetchone()
+                if chunked is not None:
+                    with self._writer:
+                        self._compact_day(station_id, day)
+
+    def compact(self, before_epoch: float) -> int:
+        """Move the rows of every day that ended by before_epoch into chunks. Returns the chunks written."""
+        cutoff = int(before_epoch) // SECONDS_PER_DAY * SECONDS_PER_DAY
+        written = 0
+        with self._write_lock:
+            for station_id in sorted(self._high_water):
+                while True:
+                    oldest = self._writer.execute(
+                        'SELECT MIN(epoch) FROM readings WHERE station_id = ?', (station_id,)
+                    ).fetchone()[0]
+                    if oldest is None or oldest >= cutoff:
+                        break
+                    day = oldest // SECONDS_PER_DAY * SECONDS_PER_DAY
+                    with self._writer:
+                        self._compact_day(station_id, day)
+                    written += 1
+        self.compacted += written
+        if written:
+            logger.info("Compacted %d station-days of history", written)
+        return written
+
+    def _compact_day(self, station_id: str, day: int):
+        end = day + SECONDS_PER_DAY
+        # Take the write lock before reading, so a row another process upserts
+        # for this day cannot land between the read and the DELETE and be lost
+        self._writer.execute('BEGIN IMMEDIATE')
+        rows = self._writer.execute(SELECT_ROWS, (station_id, day, end)).fetchall()
+        if not rows:
+            # Another process compacted the day first
+            return
+        parts = []
+        existing = self._writer.execute(
+            'SELECT data FROM chunks WHERE station_id = ? AND day = ?', (station_id, day)
+        ).fetchone()
+        if existing is not None:
+            chunk = decode_chunk(existing[0])
+            parts.append((chunk.epoch, chunk.fields))
+        parts.append(_rows_to_columns(rows))
+        epoch, fields = merge_columns(parts) if len(parts) > 1 else parts[0]
+
+        self._writer.execute(
+            'INSERT OR REPLACE INTO chunks (station_id, day, first_epoch, last_epoch, data) VALUES (?, ?, ?, ?, ?)',
+            (station_id, day, int(epoch[0]), int(epoch[-1]), encode_chunk(epoch.astype(np.int64), fields))
+        )
+        self._writer.execute(
+            'DELETE FROM readings WHERE station_id = ? AND epoch >= ? AND epoch < ?', (station_id, day, end)
+        )
+
+    def time_range(self) -> Optional[Tuple[int, int]]:
+        """(earliest_epoch, latest_epoch) of the stored readings, or None if empty."""
+        connection = self._reader()
+        earliest = _combine(
+            self._station_bounds(connection, 'MIN'),
+            self._station_bounds(connection, 'MIN', 'chunks'),
+            min
+        )
+        if not earliest:
+            return None
+        latest = _combine(
+            self._station_bounds(connection, 'MAX'),
+            self._station_bounds(connection, 'MAX', 'chunks'),
+            max
+        )
+        return min(earliest.values()), max(latest.values())
+
+    def columns_between(
+        self,
+        start_epoch: float,
+        end_epoch: float,
+        station_ids: Optional[Sequence[str]] = None
+    ) -> ColumnarStore:
+        """Readings with start_epoch <= epoch < end_epoch as a ColumnarStore (rows index its own arrays)."""
+        connection = self._reader()
+        station_ids = sorted(station_ids) if station_ids is not None else self.station_ids()
+        start, end = int(start_epoch), int(np.ceil(end_epoch))
+        first_day = start // SECONDS_PER_DAY * SECONDS_PER_DAY
+
+        codes, parts = [], []
+        for code, station_id in enumerate(station_ids):
+            station_parts = []
+            for (data,) in connection.execute(
+                'SELECT data FROM chunks WHERE station_id = ? AND day >= ? AND day < ? ORDER BY day',
+                (station_id, first_day, end)
+            ):
+                chunk = decode_chunk(data)
+                window = slice(*np.searchsorted(chunk.epoch, [start, end], side='left'))
+                station_parts.append((chunk.epoch[window], {name: values[window] for name, values in chunk.fields.items()}))
+            rows = connection.execute(SELECT_ROWS, (station_id, start, end)).fetchall()
+            if rows:
+                station_parts.append(_rows_to_columns(rows))
+            if not station_parts:
+                continue
+            epoch, fields = merge_columns(station_parts) if len(station_parts) > 1 else station_parts[0]
+            parts.append((epoch, fields))
+            codes.append(np.full(len(epoch), code, dtype=np.int32))
+
+        if parts:
+            epoch = np.concatenate([part[0] for part in parts])
+            fields = {name: np.concatenate([part[1][name] for part in parts]) for name in NUMERIC_FIELDS}
+            station_code = np.concatenate(codes)
+        else:
+            epoch = np.empty(0, dtype=np.float64)
+            fields = {name: np.empty(0, dtype=np.float64) for name in NUMERIC_FIELDS}
+            station_code = np.empty(0, dtype=np.int32)
+        return ColumnarStore(
+            station_ids=list(station_ids),
+            station_code=station_code,
+            epoch=epoch,
+            rows=np.arange(len(epoch)),
+            fields=fields
+        )
+
+    def daily_stats(
+        self,
+        field_name: str,
+        start_epoch: float,
+        end_epoch: float,
+        station_ids: Optional[Sequence[str]] = None
+    ) -> Dict[str, Dict[int, FieldStats]]:
+        """
+        station_id -> {day start epoch: FieldStats of field_name} for the days
+        starting in [start_epoch, end_epoch). Compacted days are read from their
+        chunk headers without decoding; the rest are aggregated in SQL.
+        """
+        if field_name not in NUMERIC_FIELDS:
+            raise ValueError(f"unknown field: {field_name}")
+        connection = self._reader()
+        station_ids = sorted(station_ids) if station_ids is not None else self.station_ids()
+        start, end = int(start_epoch), int(np.ceil(end_epoch))
+
+        result = {}
+        for station_id in station_ids:
+            days: Dict[int, FieldStats] = {}
+            for day, header in connection.execute(
+                'SELECT day, substr(data, 1, ?) FROM chunks WHERE station_id = ? AND day >= ? AND day < ? ORDER BY day',
+                (HEADER_SIZE, station_id, start, end)
+            ):
+                days[day] = read_header(header).stats[field_name]
+            for day, count, low, high, total in connection.execute(
+                f'SELECT epoch / {SECONDS_PER_DAY} * {SECONDS_PER_DAY} AS day, COUNT({field_name}), '
+                f'MIN({field_name}), MAX({field_name}), TOTAL({field_name}) FROM readings '
+                'WHERE station_id = ? AND epoch >= ? AND epoch < ? GROUP BY day',
+                (station_id, start, end)
+            ):
+                days[day] = _add_stats(days.get(day), FieldStats(count, low, high, total))
+            if days:
+                result[station_id] = dict(sorted(days.items()))
+        return result
+
+    def count(self) -> int:
+        """Readings stored, in rows and chunks."""
+        connection = self._reader()
+        rows = connection.execute('SELECT COUNT(*) FROM readings').fetchone()[0]
+        chunked = sum(
+            read_header(header).count
+            for (header,) in connection.execute('SELECT substr(data, 1, ?) FROM chunks', (HEADER_SIZE,))
+        )
+        return rows + chunked
+
+    def _station_bounds(
+        self,
+        connection: sqlite3.Connection,
+        aggregate: str,
+        table: str = 'readings'
+    ) -> Iterator[Tuple[str, int]]:
+        """(station_id, MIN/MAX epoch) per station, stepping through the primary key instead of scanning it."""
+        if table == 'readings':
+            query = f'SELECT {aggregate}(epoch) FROM readings WHERE station_id = ?'
+        elif aggregate == 'MIN':
+            query = 'SELECT first_epoch FROM chunks WHERE station_id = ? ORDER BY day LIMIT 1'
+        else:
+            query = 'SELECT last_epoch FROM chunks WHERE station_id = ? ORDER BY day DESC LIMIT 1'
+        row = connection.execute(f'SELECT MIN(station_id) FROM {table}').fetchone()
+        station_id = row[0]
+        while station_id is not None:
+            bound = connection.execute(query, (station_id,)).fetchone()[0]
+            yield station_id, bound
+            station_id = connection.execute(
+                f'SELECT MIN(station_id) FROM {table} WHERE station_id > ?', (station_id,)
+            ).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'stations': len(self._high_water),
+            'ingested': self.ingested,
+            'compacted_days': self.compacted,
+            'last_ingest_rows': self.last_ingest_rows,
+            'last_ingest_seconds': self.last_ingest_seconds
+        }
+
+
+def _batches(rows: Iterable[HistoryRow], size: int) -> Iterator[List[HistoryRow]]:
+    batch: List[HistoryRow] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _changed(epochs: np.ndarray, station, previous) -> np.ndarray:
+    """Indexes of the readings of station (at epochs) that previous lacks or holds with other values."""
+    if previous is None or not len(previous):
+        return np.arange(len(epochs))
+    previous_epochs = np.round(previous.epoch).astype(np.int64)
+    position = np.searchsorted(previous_epochs, epochs).clip(max=len(previous_epochs) - 1)
+    same = previous_epochs[position] == epochs
+    for name in NUMERIC_FIELDS:
+        current, held = station.field(name), previous.field(name)[position]
+        same &= (current == held) | (np.isnan(current) & np.isnan(held))
+    return np.nonzero(~same)[0]
+
+
+def _rows_to_columns(rows: List[HistoryRow]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """SELECT_ROWS results as (epoch, fields) arrays, NULL as NaN."""
+    table = np.array(rows, dtype=np.float64).reshape(len(rows), len(NUMERIC_FIELDS) + 1)
+    return table[:, 0].copy(), {name: table[:, i + 1].copy() for i, name in enumerate(NUMERIC_FIELDS)}
+
+
+def _combine(first: Iterable[Tuple[str, int]], second: Iterable[Tuple[str, int]], pick) -> Dict[str, int]:
+    combined = dict(first)
+    for station_id, bound in second:
+        combined[station_id] = pick(combined[station_id], bound) if station_id in combined else bound
+    return combined
+
+
+def _add_stats(first: Optional[FieldStats], second: FieldStats) -> FieldStats:
+    """Stats of two disjoint sets of readings of one day."""
+    if first is None or not first.count:
+        return second
+    if not second.count:
+        return first
+    return FieldStats(first.count + second.count, min(first.min, second.min),
+                      max(first.max, second.max), first.sum + second.sum)
@@ -0,0 +1,63 @@
+"""Live Updates - Compact push events for every new weather snapshot."""
+
+import logging
+import threading
+from typing import Any, Dict
+
+from services.snapshot import WeatherSnapshot, get_index
+from services.snapshot_changelog import delta_view, version_token
+from utils.event_hub import EventHub
+
+logger = logging.getLogger(__name__)
+
+
+class LiveUpdates:
+    """
+    Publishes to an EventHub once each new snapshot is visible to requests.
+
+    `readings` carries the same body as /api/weather-data/delta?latest_only=true
+    for the previous version, so a client holding that version applies it
+    without a request; any other client re-fetches the delta itself.
+    `alert` is only sent when a station's alert level changes, with the new
+    level of each station that changed.
+    """
+
+    def __init__(self, hub: EventHub, weather_service):
+        self.hub = hub
+        self.weather_service = weather_service
+        self._alert_levels: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def on_snapshot(self, snapshot: WeatherSnapshot):
+        with self._lock:
+            self._publish_readings(snapshot)
+            self._publish_alerts(snapshot)
+
+    def _publish_readings(self, snapshot: WeatherSnapshot):
+        payload: Dict[str, Any] = {'version': version_token(snapshot.version, snapshot.digest), 'full': False, 'removed': []}
+        diff = self.weather_service.get_changes_since(snapshot, snapshot.version - 1)
+        if diff is None:
+            payload['full'] = True
+            readings = list(get_index(snapshot).latest_per_station().values())
+        elif len(diff) == 0:
+            return
+        else:
+            readings, removed = delta_view(snapshot, diff, latest_only=True)
+            payload.update(since_version=version_token(diff.from_version, diff.from_digest), removed=[list(key) for key in removed])
+        payload.update(data=readings, count=len(readings))
+        self.hub.publish('readings', payload)
+
+    def _publish_alerts(self, snapshot: WeatherSnapshot):
+        changed = {}
+        for station_id, reading in get_index(snapshot).latest_per_station().items():
+            alert = self.weather_service.generate_weather_alert(reading)
+            if self._alert_levels.get(station_id) != alert['level']:
+                self._alert_levels[station_id] = alert['level']
+                changed[station_id] = dict(alert, water_level=reading.get('WaterLevel'))
+        if changed:
+            self.hub.publish('alert', {'version': version_token(snapshot.version, snapshot.digest), 'stations': changed})
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.hub.get_stats()
+        stats['alert_levels'] = dict(self._alert_levels)
+        return stats
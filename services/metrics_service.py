@@ -4,10 +4,15 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
 from config import WeatherThresholds, AlertLevelConfig, RainfallForecastConfig
+from utils.timestamps import reading_datetime
 
 STATION_OFFLINE_THRESHOLD_MINUTES = 60
 TOTAL_STATIONS = 5
 
+# Every value get_alert_level / get_rainfall_level can return, least to most severe
+ALERT_LEVELS = ('normal', 'advisory', 'alert', 'warning', 'critical')
+RAINFALL_LEVELS = ('no_data', 'none', 'light', 'moderate', 'heavy')
+
 
 @dataclass
 class RainfallForecast:
@@ -66,27 +71,7 @@ class MetricsService:
             return None
     
     def _parse_timestamp(self, data: Dict) -> Optional[datetime]:
-        timestamp_str = data.get('DateTime') or data.get('DateTimeStamp') or data.get('Timestamp')
-        
-        if not timestamp_str:
-            return None
-        
-        try:
-            if isinstance(timestamp_str, datetime):
-                return timestamp_str
-            
-            ts = str(timestamp_str).replace('Z', '+00:00')
-            clean_ts = ts.split('+')[0].split('.')[0]
-            
-            for fmt in ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S']:
-                try:
-                    return datetime.strptime(clean_ts, fmt)
-                except ValueError:
-                    continue
-            
-            return datetime.fromisoformat(ts.replace('Z', ''))
-        except (ValueError, AttributeError):
-            return None
+        return reading_datetime(data)
     
     def _is_station_online(self, data: Dict) -> bool:
         if not data:
@@ -1,9 +1,13 @@
 import logging
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import date, datetime, time, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from utils.timestamps import datetime_to_epoch, epoch_to_datetime
+from services.snapshot import get_columns
+from services.hourly_buckets import HourlyBuckets, aggregate_hourly
+from services.daily_rollups import DEFAULT_MAX_DAYS, DailyRollups, DayRollup, StationSeries
+
 logger = logging.getLogger(__name__)
 
 # Chart configuration constants
@@ -26,9 +30,14 @@ class PrecipitationDataPoint:
 
 class PrecipitationService:
 
-    def __init__(self, metrics_service):
+    def __init__(self, metrics_service, rollup_days: int = DEFAULT_MAX_DAYS):
         # Initialize precipitation service with metrics service dependency
         self.metrics_service = metrics_service
+        self._rollups = DailyRollups(
+            'HourlyRain', self._build_day_rollup,
+            min_value=0.0,
+            max_days=rollup_days
+        )
 
     def get_24hour_intervals_per_station(
         self,
@@ -37,6 +46,8 @@ class PrecipitationService:
         target_date: Optional[datetime] = None
     ) -> Dict[str, List[PrecipitationDataPoint]]:
         """Process weather data into hourly intervals, separated by station."""
+        columns = get_columns(weather_data)
+
         # Determine target date
         if target_date:
             display_date = target_date
@@ -46,16 +57,10 @@ class PrecipitationService:
                 display_date = datetime.now()
                 logger.warning("No weather data available, using system date")
             else:
-                latest_timestamp = None
-                for reading in weather_data:
-                    timestamp_str = reading.get('DateTime') or reading.get('DateTimeStamp', '')
-                    parsed = self._parse_timestamp(timestamp_str)
-                    if parsed:
-                        if latest_timestamp is None or parsed > latest_timestamp:
-                            latest_timestamp = parsed
-
-                if latest_timestamp:
-                    display_date = latest_timestamp
+                time_range = columns.time_range()
+
+                if time_range:
+                    display_date = epoch_to_datetime(time_range[1])
                     logger.info("Using latest data timestamp: %s", display_date)
                 else:
                     display_date = datetime.now()
@@ -73,26 +78,68 @@ class PrecipitationService:
         intervals = self._create_hourly_intervals(start_time, end_time)
         logger.info("Created %d hourly intervals", len(intervals))
 
-        # Group readings by both station and interval
-        station_interval_data = self._group_readings_by_station_and_interval(
-            weather_data, intervals, start_time, end_time, display_date
-        )
+        # Days of the current snapshot are materialized at ingestion; anything
+        # else (plain lists, dates outside the data) is aggregated on demand
+        buckets = None
+        rollup = self._rollups.get(weather_data, display_date.date())
+        if rollup is None:
+            buckets = aggregate_hourly(
+                columns, 'HourlyRain', datetime_to_epoch(start_time),
+                hours=len(intervals),
+                min_value=0.0
+            )
+            rollup = self._build_day_rollup(display_date.date(), buckets, intervals)
 
         # Format output for each station
         result = {}
         for site in sites:
             station_id = site['id']
-            station_data = station_interval_data.get(station_id, {})
-
-            formatted_data = self._format_interval_data_with_labels(
-                intervals, station_data, display_date
-            )
-            result[station_id] = formatted_data
+            series = rollup.stations.get(station_id)
+            if series is None:
+                series = self._station_series(intervals, buckets, None, display_date)
+            result[station_id] = series
 
         logger.info("Generated %d hourly data points for %d stations",
                    len(intervals), len(result))
         return result
 
+    def materialize_rollups(self, snapshot) -> None:
+        """Precompute the daily rollups of a newly ingested snapshot."""
+        self._rollups.materialize(snapshot)
+
+    def export_rollups(self):
+        """Materialized rollups, for persisting with the snapshot (see SnapshotArchive)."""
+        return self._rollups.export_state()
+
+    def restore_rollups(self, state) -> None:
+        self._rollups.restore_state(state)
+
+    def _build_day_rollup(
+        self,
+        day: date,
+        buckets: HourlyBuckets,
+        intervals: Optional[List[datetime]] = None
+    ) -> DayRollup:
+        """Format and classify every station's hourly buckets for one day."""
+        display_date = datetime.combine(day, time())
+        if intervals is None:
+            intervals = [display_date + timedelta(hours=hour) for hour in range(buckets.count.shape[1])]
+
+        rollup = DayRollup(day=day)
+        for row, station_id in enumerate(buckets.station_ids):
+            rollup.stations[station_id] = self._station_series(intervals, buckets, row, display_date)
+        return rollup
+
+    def _station_series(
+        self,
+        intervals: List[datetime],
+        buckets: Optional[HourlyBuckets],
+        station_row: Optional[int],
+        display_date: datetime
+    ) -> StationSeries:
+        points = self._format_interval_data_with_labels(intervals, buckets, station_row, display_date)
+        return StationSeries(points, self.get_summary_statistics(points))
+
     def _create_hourly_intervals(self, start_time: datetime, end_time: datetime) -> List[datetime]:
         """Create hourly intervals from 12 AM to 11 PM."""
         intervals = []
@@ -106,76 +153,21 @@ class PrecipitationService:
                    len(intervals), intervals[0], intervals[-1])
         return intervals
 
-    def _group_readings_by_station_and_interval(
-        self,
-        weather_data: List[Dict],
-        intervals: List[datetime],
-        start_time: datetime,
-        end_time: datetime,
-        display_date: datetime
-    ) -> Dict[str, Dict[datetime, List[float]]]:
-        """Group weather readings by both station and hourly time interval."""
-        station_data = defaultdict(lambda: defaultdict(list))
-
-        logger.info("Processing %d readings for date %s",
-                   len(weather_data), display_date.date())
-
-        for reading in weather_data:
-            try:
-                # Parse timestamp
-                timestamp_str = reading.get('DateTime') or reading.get('DateTimeStamp', '')
-                parsed_time = self._parse_timestamp(timestamp_str)
-
-                if not parsed_time:
-                    continue
-
-                # Check if reading is within our time range
-                if not (start_time <= parsed_time <= end_time + timedelta(hours=1)):
-                    continue
-
-                # Get station ID and rainfall
-                station_id = reading.get('StationID')
-                rainfall = reading.get('HourlyRain')
-
-                if not station_id or rainfall is None:
-                    continue
-
-                # Convert rainfall to float
-                try:
-                    rainfall_float = float(rainfall)
-                    if rainfall_float < 0:
-                        continue
-                except (ValueError, TypeError):
-                    continue
-
-                # Find matching interval
-                for interval_time in intervals:
-                    next_interval = interval_time + timedelta(hours=1)
-                    if interval_time <= parsed_time < next_interval:
-                        station_data[station_id][interval_time].append(rainfall_float)
-                        break
-
-            except (KeyError, AttributeError) as e:
-                logger.warning("Error processing reading: %s", e)
-                continue
-
-        logger.info("Grouped data for %d stations into hourly intervals", len(station_data))
-        return station_data
-
     def _format_interval_data_with_labels(
         self,
         intervals: List[datetime],
-        interval_data: Dict[datetime, List[float]],
+        buckets: Optional[HourlyBuckets],
+        station_row: Optional[int],
         display_date: datetime
     ) -> List[PrecipitationDataPoint]:
-        """Format interval data with smart labeling."""
+        """Format one station's bucket aggregates with smart labeling."""
         result = []
 
-        for interval_time in intervals:
-            rainfall_values = interval_data.get(interval_time, [])
+        for hour, interval_time in enumerate(intervals):
+            count = int(buckets.count[station_row, hour]) if station_row is not None else 0
 
             # Calculate average, or 0 if no data
-            avg_rainfall = sum(rainfall_values) / len(rainfall_values) if rainfall_values else 0
+            avg_rainfall = float(buckets.sum[station_row, hour]) / count if count else 0
 
             # Classify intensity using MetricsService
             intensity = self.metrics_service.get_rainfall_level(avg_rainfall)
@@ -193,38 +185,12 @@ class PrecipitationService:
                 intensity=intensity,
                 day=day_label,
                 timestamp=interval_time.isoformat(),
-                count=len(rainfall_values),
+                count=count,
                 show_label=show_label
             ))
 
         return result
 
-    def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
-        """Parse timestamp string to datetime object."""
-        if not timestamp_str:
-            return None
-
-        formats = [
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d %H:%M:%S.%f',
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(timestamp_str, fmt)
-            except ValueError:
-                continue
-
-        try:
-            clean_str = timestamp_str.replace('Z', '+00:00')
-            dt = datetime.fromisoformat(clean_str)
-            return dt.replace(tzinfo=None)
-        except ValueError:
-            pass
-
-        logger.warning("Could not parse timestamp: %s", timestamp_str)
-        return None
-
     def _format_time_label(self, dt: datetime) -> str:
         """Format datetime as readable time label."""
         hour = dt.hour
@@ -248,6 +214,9 @@ class PrecipitationService:
 
     def get_summary_statistics(self, data_points: List[PrecipitationDataPoint]) -> Dict:
         """Calculate summary statistics for precipitation data."""
+        if getattr(data_points, 'statistics', None) is not None:
+            return dict(data_points.statistics)
+
         if not data_points:
             return {
                 'total_rainfall': 0,
@@ -275,25 +244,18 @@ class PrecipitationService:
         if not weather_data:
             return None
 
-        valid_dates = []
+        time_range = get_columns(weather_data).time_range()
 
-        for reading in weather_data:
-            timestamp_str = reading.get('DateTime') or reading.get('DateTimeStamp', '')
-            parsed_time = self._parse_timestamp(timestamp_str)
-
-            if parsed_time:
-                valid_dates.append(parsed_time)
-
-        if not valid_dates:
+        if not time_range:
             logger.warning("No valid timestamps found in weather data")
             return None
 
-        earliest = min(valid_dates)
-        latest = max(valid_dates)
+        earliest = epoch_to_datetime(time_range[0])
+        latest = epoch_to_datetime(time_range[1])
 
         logger.info("Date range available: %s to %s", earliest.date(), latest.date())
 
         return {
             'earliest': earliest,
             'latest': latest
-        }
\ No newline at end of file
+        }
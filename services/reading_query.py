@@ -0,0 +1,159 @@
+"""Reading Query - Filtered, projected and paginated reads over a snapshot's indexes."""
+
+import base64
+import binascii
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.columnar_store import ColumnarStore
+from services.snapshot import get_columns, get_index
+from utils.timestamps import reading_epoch
+
+
+@dataclass
+class ReadingQuery:
+    """
+    Parameters of a /api/weather-data read. Results are ordered newest first
+    (ties by station ID); since is inclusive and until exclusive, both epochs.
+    """
+    station_id: Optional[str] = None
+    fields: Optional[Sequence[str]] = None
+    since: Optional[float] = None
+    until: Optional[float] = None
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+    latest_only: bool = False
+
+    @property
+    def is_plain(self) -> bool:
+        """True if the query is just the full (optionally per-station) dataset."""
+        return (self.fields is None and self.since is None and self.until is None
+                and self.limit is None and self.cursor is None and not self.latest_only)
+
+
+@dataclass
+class QueryResult:
+    readings: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(epoch: float, station_id: str, returned: int = 1) -> str:
+    raw = f'{epoch!r}|{returned}|{station_id}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str, Optional[int]]:
+    """
+    (epoch, station_id, returned) of the last reading already returned, where
+    returned counts the readings of that station at that epoch already sent
+    (None for cursors from before it was recorded: all of them). Raises
+    ValueError if malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        epoch, rest = raw.split('|', 1)
+        returned, separator, station_id = rest.partition('|')
+        if not separator or not returned.isdigit():
+            return float(epoch), rest, None
+        return float(epoch), station_id, int(returned)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _page_bounds(
+    neg_epoch: np.ndarray,
+    codes: np.ndarray,
+    station_ids: List[str],
+    query: ReadingQuery
+) -> Tuple[int, int]:
+    """
+    [start, end) of the matching positions in arrays sorted by (-epoch, code).
+    One station can have several readings at one epoch (timestamps that parse
+    equal), so a cursor resumes within that run rather than after it.
+    """
+    start, end = 0, len(neg_epoch)
+    if query.until is not None:
+        start = int(np.searchsorted(neg_epoch, -query.until, side='right'))
+    if query.since is not None:
+        end = int(np.searchsorted(neg_epoch, -query.since, side='right'))
+    if query.cursor is not None:
+        epoch, station_id, returned = decode_cursor(query.cursor)
+        tie_lo = int(np.searchsorted(neg_epoch, -epoch, side='left'))
+        tie_hi = int(np.searchsorted(neg_epoch, -epoch, side='right'))
+        # Same-time readings of stations sorting after the cursor's station come
+        # next, after any of the cursor station's own not yet returned
+        ties = codes[tie_lo:tie_hi]
+        run_lo = tie_lo + int(np.searchsorted(ties, bisect_left(station_ids, station_id), side='left'))
+        run_hi = tie_lo + int(np.searchsorted(ties, bisect_right(station_ids, station_id), side='left'))
+        resume = run_hi if returned is None else min(run_lo + returned, run_hi)
+        start = max(start, resume)
+    return start, max(start, end)
+
+
+def _run_start(neg_epoch: np.ndarray, codes: np.ndarray, position: int) -> int:
+    """First position of the run of readings with the same epoch and station as position."""
+    tie_lo = int(np.searchsorted(neg_epoch, neg_epoch[position], side='left'))
+    return tie_lo + int(np.searchsorted(codes[tie_lo:position + 1], codes[position], side='left'))
+
+
+def _project(reading: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return reading
+    return {name: reading[name] for name in fields if name in reading}
+
+
+def run_query(weather_data: Sequence[Dict[str, Any]], query: ReadingQuery) -> QueryResult:
+    """
+    Answer query from the snapshot's columnar store and station index.
+    Matching positions are found with binary searches over the time-sorted
+    arrays; only the readings on the returned page are touched.
+    """
+    if query.is_plain:
+        if query.station_id:
+            return QueryResult(get_index(weather_data).recent(query.station_id))
+        return QueryResult(list(weather_data))
+
+    if query.latest_only:
+        return _latest_only(weather_data, query)
+
+    columns: ColumnarStore = get_columns(weather_data)
+    if query.station_id:
+        station = columns.station(query.station_id)
+        if station is None:
+            return QueryResult([])
+        neg_epoch = -station.epoch[::-1]
+        codes = np.full(len(station), station.code)
+        rows = station.rows[::-1]
+    else:
+        rows, neg_epoch, codes = columns.newest_first()
+
+    start, end = _page_bounds(neg_epoch, codes, columns.station_ids, query)
+    next_cursor = None
+    if query.limit is not None and end - start > query.limit:
+        end = start + query.limit
+        last = weather_data[int(rows[end - 1])]
+        returned = end - _run_start(neg_epoch, codes, end - 1)
+        next_cursor = encode_cursor(-float(neg_epoch[end - 1]), last['StationID'], returned)
+
+    readings = [_project(weather_data[int(row)], query.fields) for row in rows[start:end]]
+    return QueryResult(readings, next_cursor)
+
+
+def _latest_only(weather_data, query: ReadingQuery) -> QueryResult:
+    latest = get_index(weather_data).latest_per_station()
+    if query.station_id:
+        latest = {k: v for k, v in latest.items() if k == query.station_id}
+
+    readings = []
+    for station_id, reading in latest.items():
+        epoch = reading_epoch(reading)
+        if query.since is not None and epoch < query.since:
+            continue
+        if query.until is not None and epoch >= query.until:
+            continue
+        readings.append((-epoch, station_id, reading))
+    readings.sort(key=lambda item: item[:2])
+    return QueryResult([_project(reading, query.fields) for _, _, reading in readings])
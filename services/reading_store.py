@@ -0,0 +1,215 @@
+"""Reading Store - Deduplicated readings with per-station high-water marks for incremental sync."""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ReadingKey = Tuple[str, str]
+
+HIGH_WATER_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def reading_key(reading: Dict[str, Any]) -> Optional[ReadingKey]:
+    """Identity of a reading: one row per station per timestamp."""
+    station_id = reading.get('StationID')
+    timestamp = reading.get('DateTime') or reading.get('DateTimeStamp')
+    if not station_id or not timestamp:
+        return None
+    return station_id, str(timestamp)
+
+
+def _row_hash(row: Dict[str, Any]) -> int:
+    """Hash of a raw row's content, to notice upstream correcting a reading we hold."""
+    try:
+        return hash(frozenset(row.items()))
+    except TypeError:  # nested (unhashable) values
+        return hash(json.dumps(row, sort_keys=True, default=str))
+
+
+def row_digest(reading: Dict[str, Any]) -> bytes:
+    """Stable digest of a sanitized reading as canonical JSON (the same in every process)."""
+    body = json.dumps(reading, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(body.encode('utf-8'), digest_size=16).digest()
+
+
+def _parse_key_time(timestamp: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(timestamp, HIGH_WATER_FORMAT)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+@dataclass
+class MergeResult:
+    """
+    Outcome of merging one upstream payload into the store. added includes the
+    `replaced` rows; row_digests holds the row_digest() of each of readings.
+    """
+    readings: List[Dict[str, Any]]
+    row_digests: List[bytes] = field(default_factory=list)
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: int = 0
+    scanned: int = 0
+    replaced: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added) or self.removed > 0
+
+
+class ReadingStore:
+    """
+    In-memory set of sanitized readings keyed by (StationID, timestamp).
+
+    Two sync modes are supported:
+    - full: the payload is the complete upstream window. Rows we already hold are
+      reused as-is, only unseen rows are sanitized, and rows upstream dropped are
+      evicted so the store mirrors upstream.
+    - incremental: the payload only holds rows newer than our high-water marks.
+      New rows are appended and anything older than the retention window is pruned.
+
+    In both modes a row whose key we hold but whose content upstream changed
+    (a corrected value) is sanitized again and replaces the held reading.
+    """
+
+    def __init__(self, retention_hours: Optional[float] = None):
+        self._rows: Dict[ReadingKey, Dict[str, Any]] = {}
+        self._hashes: Dict[ReadingKey, int] = {}
+        self._digests: Dict[ReadingKey, bytes] = {}
+        self._order: List[ReadingKey] = []
+        self._high_water: Dict[str, datetime] = {}
+        self._oldest: Optional[datetime] = None
+        self._retention = timedelta(hours=retention_hours) if retention_hours else None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def high_water_mark(self) -> Optional[str]:
+        """
+        Oldest of the per-station newest timestamps, formatted for an upstream filter.
+        Using the minimum guarantees no station misses rows; duplicates are dropped on merge.
+        """
+        with self._lock:
+            if not self._high_water:
+                return None
+            return min(self._high_water.values()).strftime(HIGH_WATER_FORMAT)
+
+    def get_high_water_marks(self) -> Dict[str, str]:
+        with self._lock:
+            return {station: ts.strftime(HIGH_WATER_FORMAT) for station, ts in self._high_water.items()}
+
+    def ingest(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        sanitize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        complete: bool = True
+    ) -> MergeResult:
+        """
+        Consume raw rows one at a time (e.g. straight off a streaming parser).
+        Rows we already hold unchanged are dropped immediately; only unseen or
+        changed rows are passed through sanitize, digested and kept. complete=True means
+        rows is the full upstream window (full mode), otherwise it is an
+        incremental batch.
+        """
+        known = self._hashes
+        seen = set()
+        order: List[ReadingKey] = []
+        pending: Dict[ReadingKey, Tuple[Dict[str, Any], int]] = {}
+        scanned = 0
+
+        for row in rows:
+            scanned += 1
+            key = reading_key(row)
+            if key is None or key in seen:
+                continue
+            seen.add(key)
+            order.append(key)
+            # Hashed before sanitize, which converts the row in place
+            row_hash = _row_hash(row)
+            if known.get(key) != row_hash:
+                row = sanitize(row) if sanitize else row
+                pending[key] = (row, row_hash, row_digest(row))
+
+        with self._lock:
+            new_keys = [key for key in pending if key not in self._rows]
+            for key, (row, row_hash, digest) in pending.items():
+                self._rows[key] = row
+                self._hashes[key] = row_hash
+                self._digests[key] = digest
+                self._advance_high_water(key)
+
+            if complete:
+                removed = [key for key in self._rows if key not in seen]
+            else:
+                order = self._order + new_keys
+                removed = self._expired_keys()
+                if removed:
+                    expired = set(removed)
+                    order = [key for key in order if key not in expired]
+
+            for key in removed:
+                del self._rows[key]
+                del self._hashes[key]
+                del self._digests[key]
+            if removed:
+                self._rebuild_high_water()
+
+            self._order = order
+            readings = [self._rows[key] for key in order]
+            row_digests = [self._digests[key] for key in order]
+
+        added = [row for row, _, _ in pending.values()]
+        replaced = len(added) - len(new_keys)
+        if added or removed:
+            logger.info("Merged %d new readings, replaced %d changed, evicted %d (store holds %d)",
+                        len(new_keys), replaced, len(removed), len(readings))
+        return MergeResult(readings=readings, row_digests=row_digests, added=added, removed=len(removed), scanned=scanned, replaced=replaced)
+
+    def _advance_high_water(self, key: ReadingKey):
+        parsed = _parse_key_time(key[1])
+        if parsed is None:
+            return
+        if self._oldest is None or parsed < self._oldest:
+            self._oldest = parsed
+        current = self._high_water.get(key[0])
+        if current is None or parsed > current:
+            self._high_water[key[0]] = parsed
+
+    def _rebuild_high_water(self):
+        self._high_water = {}
+        self._oldest = None
+        for key in self._rows:
+            self._advance_high_water(key)
+
+    def _expired_keys(self) -> List[ReadingKey]:
+        if self._retention is None or not self._high_water:
+            return []
+        cutoff = max(self._high_water.values()) - self._retention
+        if self._oldest is None or self._oldest >= cutoff:
+            return []
+        expired = []
+        for key in self._rows:
+            parsed = _parse_key_time(key[1])
+            if parsed is not None and parsed < cutoff:
+                expired.append(key)
+        return expired
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+            self._hashes.clear()
+            self._digests.clear()
+            self._order = []
+            self._high_water.clear()
+            self._oldest = None
@@ -0,0 +1,190 @@
+"""Shared Snapshot - One process per host fetches; every worker reads its snapshot file."""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WXSNAP01'
+# magic, snapshot version, fetched_at (epoch seconds), payload length, payload crc32
+HEADER = struct.Struct('<8sQdQI')
+
+
+@dataclass
+class SharedState:
+    """What a read of the shared file found. readings is None when the version was already held."""
+    version: int
+    fetched_at: datetime
+    confirmed_at: datetime
+    readings: Optional[List[Dict[str, Any]]] = None
+
+
+class SharedSnapshot:
+    """
+    A snapshot file shared by the worker processes of one host.
+
+    The leader is whichever process holds an exclusive flock on `<path>.lock`:
+    it fetches upstream and publishes each new snapshot by writing a temp file
+    and renaming it over `path`, so a reader sees the old file or the new one,
+    never a partial write. Confirming unchanged data only bumps the mtime.
+
+    Followers never contact upstream. One stat tells them whether the file
+    moved; then the header (read through a read-only mmap) tells them whether
+    the version changed, and only then are the readings decoded. The readings
+    keep the leader's version numbers, so ETags and delta versions agree
+    across workers. When the leader exits the OS drops its lock and the next
+    follower to try takes over.
+
+    Without fcntl (Windows) every process leads, i.e. fetches for itself.
+    """
+
+    def __init__(self, path: str, lead_retry_seconds: float = 1.0):
+        self.path = path
+        self.lock_path = f'{path}.lock'
+        self.lead_retry_seconds = lead_retry_seconds
+        self._lock_fd: Optional[int] = None
+        self._lock_pid: Optional[int] = None
+        self._next_attempt = 0.0
+        self._seen_mtime: Optional[int] = None
+        self._mutex = threading.Lock()
+        self.published = 0
+        self.loaded = 0
+        self.last_bytes = 0
+        self.last_load_seconds: Optional[float] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return fcntl is None or (self._lock_fd is not None and self._lock_pid == os.getpid())
+
+    def try_lead(self) -> bool:
+        """True if this process leads, taking over the lock when it is free (at most every lead_retry_seconds)."""
+        if self.is_leader:
+            return True
+        with self._mutex:
+            if self._lock_pid != os.getpid():
+                # A lock fd inherited across fork belongs to the parent
+                self._lock_fd = None
+            now = time.monotonic()
+            if now < self._next_attempt:
+                return False
+            self._next_attempt = now + self.lead_retry_seconds
+
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._lock_fd, self._lock_pid = fd, os.getpid()
+
+        logger.info("Process %d now fetches for the shared snapshot %s", os.getpid(), self.path)
+        return True
+
+    def release(self):
+        """Give up leadership (e.g. on shutdown) so another process takes over."""
+        with self._mutex:
+            if self._lock_fd is not None and self._lock_pid == os.getpid():
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+                os.close(self._lock_fd)
+            self._lock_fd = self._lock_pid = None
+
+    def publish(self, snapshot) -> int:
+        """Atomically replace the shared file with snapshot. Returns the bytes written."""
+        payload = json.dumps(list(snapshot), separators=(',', ':'), default=str).encode('utf-8')
+        header = HEADER.pack(MAGIC, snapshot.version, snapshot.fetched_at.timestamp(),
+                             len(payload), zlib.crc32(payload))
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, 'wb') as temp:
+                temp.write(header)
+                temp.write(payload)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        self._seen_mtime = os.stat(self.path).st_mtime_ns
+        self.published += 1
+        self.last_bytes = len(header) + len(payload)
+        return self.last_bytes
+
+    def confirm(self):
+        """Mark the published snapshot as still current (upstream reported no change)."""
+        try:
+            os.utime(self.path)
+            self._seen_mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            pass
+
+    def changed(self) -> bool:
+        """Whether the file was published or confirmed since this process last read it."""
+        try:
+            return os.stat(self.path).st_mtime_ns != self._seen_mtime
+        except FileNotFoundError:
+            return False
+
+    def peek_version(self) -> Optional[int]:
+        """Version in the shared file's header, without loading it."""
+        state = self.read(known_version=None, header_only=True)
+        return state.version if state else None
+
+    def read(self, known_version: Optional[int], header_only: bool = False) -> Optional[SharedState]:
+        """
+        Read the shared file. Readings are only decoded when the version differs
+        from known_version. None if there is no (valid) file.
+        """
+        started = time.perf_counter()
+        try:
+            with open(self.path, 'rb') as shared:
+                mtime = os.fstat(shared.fileno()).st_mtime_ns
+                if not header_only:
+                    # A bad file is skipped until the next publish, not re-read per request
+                    self._seen_mtime = mtime
+                with mmap.mmap(shared.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    magic, version, fetched_at, length, crc = HEADER.unpack_from(view)
+                    if magic != MAGIC or HEADER.size + length > len(view):
+                        raise ValueError("not a complete snapshot file")
+                    state = SharedState(version, datetime.fromtimestamp(fetched_at),
+                                        datetime.fromtimestamp(mtime / 1e9))
+                    if header_only or version == known_version:
+                        return state
+                    payload = view[HEADER.size:HEADER.size + length]
+            if zlib.crc32(payload) != crc:
+                raise ValueError("checksum mismatch")
+            state.readings = json.loads(payload)
+        except FileNotFoundError:
+            return None
+        except (ValueError, struct.error) as e:
+            logger.warning("Ignoring shared snapshot %s: %s", self.path, str(e))
+            return None
+
+        self.loaded += 1
+        self.last_bytes = HEADER.size + length
+        self.last_load_seconds = round(time.perf_counter() - started, 4)
+        return state
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'role': 'leader' if self.is_leader else 'follower',
+            'pid': os.getpid(),
+            'published': self.published,
+            'loaded': self.loaded,
+            'last_bytes': self.last_bytes,
+            'last_load_seconds': self.last_load_seconds
+        }
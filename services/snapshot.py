@@ -0,0 +1,79 @@
+"""Weather Snapshot - One fetched dataset with the derived structures built from it."""
+
+import hashlib
+from datetime import datetime
+from functools import cached_property
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from services.columnar_store import ColumnarStore
+from services.reading_store import row_digest
+from services.station_index import StationIndex
+
+
+class WeatherSnapshot(list):
+    """
+    The sanitized readings of one successful fetch.
+
+    Behaves exactly like the List[Dict] the services and templates have always
+    received (the raw dict view), and additionally carries a version number, a
+    digest of its content, and a ColumnarStore and a StationIndex built once
+    when the snapshot is created.
+
+    The version orders snapshots within one process (and the workers sharing
+    its snapshot file); the digest identifies the data itself, so it is what
+    clients are given to hold on to across workers and restarts. It is folded
+    from per-row digests: the ReadingStore passes the ones it keeps for each
+    row, so a refresh only digests the rows it changed; otherwise the digest
+    is computed on first use.
+    Services check for a WeatherSnapshot to take their fast path and fall back
+    to building the structures on the fly for plain lists.
+    """
+
+    def __init__(
+        self,
+        readings: Iterable[Dict[str, Any]],
+        version: int = 0,
+        fetched_at: Optional[datetime] = None,
+        row_digests: Optional[Sequence[bytes]] = None
+    ):
+        super().__init__(readings)
+        self.version = version
+        self.fetched_at = fetched_at or datetime.now()
+        if row_digests is not None:
+            self.digest = content_digest(self, row_digests)
+        self.columns = ColumnarStore.from_readings(self)
+        self.index = StationIndex(self, self.columns)
+
+    @cached_property
+    def digest(self) -> str:
+        return content_digest(self)
+
+
+def content_digest(
+    readings: Iterable[Dict[str, Any]],
+    row_digests: Optional[Sequence[bytes]] = None
+) -> str:
+    """
+    Hash of the readings' row_digest()s in order: equal data gives an equal
+    digest in any process. row_digests, if known, must match readings.
+    """
+    if row_digests is None:
+        row_digests = [row_digest(reading) for reading in readings]
+    return hashlib.sha256(b''.join(row_digests)).hexdigest()[:16]
+
+
+def get_columns(weather_data) -> ColumnarStore:
+    """Columnar view of weather_data, reusing the snapshot's store when there is one."""
+    if isinstance(weather_data, WeatherSnapshot):
+        return weather_data.columns
+    if isinstance(weather_data, ColumnarStore):
+        # Already columnar, e.g. a window read from the HistoryStore
+        return weather_data
+    return ColumnarStore.from_readings(weather_data)
+
+
+def get_index(weather_data) -> StationIndex:
+    """Station index of weather_data, reusing the snapshot's index when there is one."""
+    if isinstance(weather_data, WeatherSnapshot):
+        return weather_data.index
+    return StationIndex.from_readings(weather_data)
@@ -0,0 +1,142 @@
+"""Snapshot Archive - The last good snapshot on disk, so a restarted process serves immediately."""
+
+import logging
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.snapshot import WeatherSnapshot
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WXARCH01'
+# Pickles are only read back by the interpreter version that wrote them
+FORMAT = f'py{sys.version_info[0]}.{sys.version_info[1]}'.encode('ascii').ljust(8, b'\0')
+# magic, format, payload length, payload crc32
+HEADER = struct.Struct('<8s8sQI')
+
+
+@dataclass
+class ArchivedSnapshot:
+    """A loaded archive: the snapshot, when it was last confirmed current, and its derived state."""
+    snapshot: WeatherSnapshot
+    confirmed_at: datetime
+    components: Dict[str, Any] = field(default_factory=dict)
+
+
+class SnapshotArchive:
+    """
+    The last successfully fetched snapshot, written after every new version.
+
+    The snapshot is stored together with its ColumnarStore and StationIndex
+    and the state of registered components (the chart rollups), so loading it
+    skips sanitizing, indexing and aggregating. It is written to a temp file,
+    fsynced and renamed over `path`, so a crash leaves the previous archive;
+    confirming unchanged data only bumps the mtime, which is what the
+    restored data's age is measured from.
+
+    The payload is a pickle: the file is created 0600 and must live in a
+    directory only the service user can write, like the code itself. A
+    truncated or corrupt file, or one written by another Python version, is
+    ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._components: Dict[str, Tuple[Callable[[], Any], Callable[[Any], None]]] = {}
+        self._lock = threading.Lock()
+        self.saved = 0
+        self.last_bytes = 0
+        self.last_save_seconds: Optional[float] = None
+        self.last_load_seconds: Optional[float] = None
+
+    def add_component(self, name: str, export: Callable[[], Any], restore: Callable[[Any], None]):
+        """Persist export() with every snapshot and hand it to restore() when one is loaded."""
+        self._components[name] = (export, restore)
+
+    def save(self, snapshot: WeatherSnapshot) -> int:
+        """Atomically replace the archive with snapshot. Returns the bytes written."""
+        started = time.perf_counter()
+        components = {name: export() for name, (export, _) in self._components.items()}
+        payload = pickle.dumps({'snapshot': snapshot, 'components': components}, protocol=pickle.HIGHEST_PROTOCOL)
+        header = HEADER.pack(MAGIC, FORMAT, len(payload), zlib.crc32(payload))
+
+        with self._lock:
+            temp_path = f'{self.path}.{os.getpid()}.tmp'
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                with os.fdopen(fd, 'wb') as temp:
+                    temp.write(header)
+                    temp.write(payload)
+                    temp.flush()
+                    os.fsync(temp.fileno())
+                os.replace(temp_path, self.path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+
+        self.saved += 1
+        self.last_bytes = len(header) + len(payload)
+        self.last_save_seconds = round(time.perf_counter() - started, 4)
+        logger.debug("Archived snapshot v%d: %d bytes in %.3fs",
+                     snapshot.version, self.last_bytes, self.last_save_seconds)
+        return self.last_bytes
+
+    def confirm(self):
+        """Mark the archived snapshot as still current (upstream reported no change)."""
+        try:
+            os.utime(self.path)
+        except FileNotFoundError:
+            pass
+
+    def load(self) -> Optional[ArchivedSnapshot]:
+        """The archived snapshot with its components restored, or None if there is no usable archive."""
+        started = time.perf_counter()
+        try:
+            with open(self.path, 'rb') as archive:
+                confirmed_at = datetime.fromtimestamp(os.fstat(archive.fileno()).st_mtime)
+                magic, file_format, length, crc = HEADER.unpack(archive.read(HEADER.size))
+                if magic != MAGIC:
+                    raise ValueError("not a snapshot archive")
+                if file_format != FORMAT:
+                    raise ValueError(f"written by {file_format.rstrip(bytes(1)).decode('ascii', 'replace')}")
+                payload = archive.read(length)
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                raise ValueError("truncated or corrupt")
+            state = pickle.loads(payload)
+            snapshot = state['snapshot']
+            if not isinstance(snapshot, WeatherSnapshot):
+                raise ValueError("no snapshot in archive")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error, pickle.UnpicklingError, AttributeError, KeyError) as e:
+            logger.warning("Ignoring snapshot archive %s: %s", self.path, str(e))
+            return None
+
+        components = state.get('components', {})
+        for name, (_, restore) in self._components.items():
+            if name in components:
+                restore(components[name])
+
+        self.last_load_seconds = round(time.perf_counter() - started, 4)
+        logger.info("Loaded archived snapshot v%d (%d readings) in %.3fs",
+                    snapshot.version, len(snapshot), self.last_load_seconds)
+        return ArchivedSnapshot(snapshot, confirmed_at, components)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'components': list(self._components),
+            'saved': self.saved,
+            'last_bytes': self.last_bytes,
+            'last_save_seconds': self.last_save_seconds,
+            'last_load_seconds': self.last_load_seconds
+        }
@@ -0,0 +1,171 @@
+"""Snapshot Changelog - Bounded history of the readings each snapshot added and removed."""
+
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from services.reading_store import ReadingKey, reading_key
+from services.snapshot import get_index
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SnapshotDiff:
+    """
+    Changes between two snapshot versions: readings added or changed (by key)
+    and keys no longer present. Applying `removed` then upserting `added` to
+    the from_version dataset gives the to_version dataset.
+    """
+    from_version: int
+    to_version: int
+    added: Dict[ReadingKey, Dict[str, Any]] = field(default_factory=dict)
+    removed: Set[ReadingKey] = field(default_factory=set)
+    from_digest: Optional[str] = None
+    to_digest: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed)
+
+
+class SnapshotChangelog:
+    """
+    The diffs of the last few snapshots, so clients holding a recent version
+    can be sent only what changed since.
+
+    Bounded by the number of versions and by the total number of readings
+    referenced; the oldest diffs are dropped first. A version that is older
+    than the retained history (or unknown) cannot be diffed and since()
+    returns None so the caller falls back to the full dataset. Version numbers
+    restart with the process, so a version from a client also names the
+    content digest it had, and one recorded here with other content is unknown.
+    """
+
+    def __init__(self, max_versions: int = 30, max_readings: int = 50000):
+        self.max_versions = max_versions
+        self.max_readings = max_readings
+        self._diffs: Deque[SnapshotDiff] = deque()
+        self._keys: Optional[Dict[ReadingKey, Dict[str, Any]]] = None
+        self._version: Optional[int] = None
+        self._digest: Optional[str] = None
+        self._readings = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    @property
+    def oldest_version(self) -> Optional[int]:
+        """Oldest version that can still be diffed against the current one."""
+        with self._lock:
+            return self._diffs[0].from_version if self._diffs else self._version
+
+    def record(self, snapshot) -> Optional[SnapshotDiff]:
+        """Diff snapshot against the previously recorded one. Returns the diff, if there was a base."""
+        keys = {}
+        for reading in snapshot:
+            key = reading_key(reading)
+            if key is not None:
+                keys[key] = reading
+
+        with self._lock:
+            previous, previous_version, previous_digest = self._keys, self._version, self._digest
+            self._keys, self._version, self._digest = keys, snapshot.version, snapshot.digest
+
+            if previous is None or previous_version != snapshot.version - 1:
+                # No base to diff against (first snapshot or a gap in versions)
+                self._diffs.clear()
+                self._readings = 0
+                return None
+
+            # The store reuses unchanged reading dicts, so identity settles most rows
+            added = {
+                key: reading for key, reading in keys.items()
+                if previous.get(key) is not reading and previous.get(key) != reading
+            }
+            removed = previous.keys() - keys.keys()
+            diff = SnapshotDiff(previous_version, snapshot.version, added, removed,
+                                from_digest=previous_digest, to_digest=snapshot.digest)
+
+            self._diffs.append(diff)
+            self._readings += len(diff)
+            while self._diffs and (len(self._diffs) > self.max_versions or self._readings > self.max_readings):
+                self._readings -= len(self._diffs.popleft())
+
+        logger.debug("Changelog v%d: %d added/changed, %d removed",
+                     snapshot.version, len(added), len(removed))
+        return diff
+
+    def since(self, version: int, digest: Optional[str] = None) -> Optional[SnapshotDiff]:
+        """
+        Combined diff from version to the current one, or None if it is out of
+        range. With a digest, also None unless version had that content here.
+        """
+        with self._lock:
+            if self._version is None or version > self._version:
+                return None
+            merged = SnapshotDiff(version, self._version, from_digest=self._digest, to_digest=self._digest)
+            if version == self._version:
+                return merged if digest in (None, self._digest) else None
+            if not self._diffs or self._diffs[0].from_version > version:
+                return None
+            base = next((diff for diff in self._diffs if diff.from_version == version), None)
+            if base is None or digest not in (None, base.from_digest):
+                return None
+            merged.from_digest = base.from_digest
+            for diff in self._diffs:
+                if diff.to_version <= version:
+                    continue
+                for key in diff.removed:
+                    merged.added.pop(key, None)
+                    merged.removed.add(key)
+                for key, reading in diff.added.items():
+                    merged.removed.discard(key)
+                    merged.added[key] = reading
+            return merged
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'version': self._version,
+                'oldest_version': self._diffs[0].from_version if self._diffs else self._version,
+                'diffs': len(self._diffs),
+                'readings': self._readings,
+                'max_versions': self.max_versions,
+                'max_readings': self.max_readings
+            }
+
+
+def version_token(version: int, digest: str) -> str:
+    """What clients hold on to for a snapshot: '<version>-<content digest>'."""
+    return f'{version}-{digest}'
+
+
+def delta_view(
+    weather_data,
+    diff: SnapshotDiff,
+    station_id: Optional[str] = None,
+    latest_only: bool = False
+) -> Tuple[List[Dict[str, Any]], List[ReadingKey]]:
+    """
+    (readings to upsert, keys to remove) that bring a client's copy of the
+    /api/weather-data view from diff.from_version to weather_data.
+
+    With latest_only the view is one reading per station, so every station
+    touched by the diff is sent its current latest reading (which may be an
+    older one if its latest was removed).
+    """
+    removed = sorted(key for key in diff.removed if station_id is None or key[0] == station_id)
+    if not latest_only:
+        added = [reading for key, reading in diff.added.items() if station_id is None or key[0] == station_id]
+        return added, removed
+
+    index = get_index(weather_data)
+    touched = {key[0] for key in diff.added} | {key[0] for key in diff.removed}
+    if station_id is not None:
+        touched &= {station_id}
+    latest = [index.latest(station) for station in sorted(touched)]
+    return [reading for reading in latest if reading is not None], removed
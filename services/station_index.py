@@ -0,0 +1,55 @@
+"""Station Index - Per-station readings in descending time order for one snapshot."""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from services.columnar_store import ColumnarStore
+
+
+class StationIndex:
+    """
+    Maps each station to its readings newest first, plus a cached pointer to
+    each station's latest reading and the newest reading overall.
+
+    Built from the snapshot's ColumnarStore, whose per-station row indices are
+    already time-sorted, so construction is one pass over the rows with no
+    sorting. Lookups never touch readings of other stations: the latest reading
+    is O(1) and the last N readings of a station are O(N).
+    """
+
+    def __init__(self, readings: Sequence[Dict[str, Any]], columns: ColumnarStore):
+        self._by_station: Dict[str, List[Dict[str, Any]]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._latest_overall: Optional[Dict[str, Any]] = None
+
+        latest_epoch = None
+        for station_id, station_columns in columns.stations.items():
+            if not len(station_columns):
+                continue
+            newest_first = [readings[int(row)] for row in station_columns.rows[::-1]]
+            self._by_station[station_id] = newest_first
+            self._latest[station_id] = newest_first[0]
+            if latest_epoch is None or station_columns.epoch[-1] > latest_epoch:
+                latest_epoch = station_columns.epoch[-1]
+                self._latest_overall = newest_first[0]
+
+    @classmethod
+    def from_readings(cls, readings: Sequence[Dict[str, Any]]) -> 'StationIndex':
+        return cls(readings, ColumnarStore.from_readings(readings))
+
+    @property
+    def station_ids(self) -> List[str]:
+        return list(self._by_station)
+
+    def latest(self, station_id: str) -> Optional[Dict[str, Any]]:
+        return self._latest.get(station_id)
+
+    def latest_overall(self) -> Optional[Dict[str, Any]]:
+        return self._latest_overall
+
+    def latest_per_station(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self._latest)
+
+    def recent(self, station_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """A station's readings newest first, optionally only the first `limit`."""
+        readings = self._by_station.get(station_id, [])
+        return readings[:limit] if limit is not None else list(readings)
@@ -0,0 +1,212 @@
+"""Upstream Client - Pooled, compressed, conditional HTTP access to the APAW API."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.json_stream import iter_json_array
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchStats:
+    """Timing and transfer figures for a single upstream request."""
+    status_code: int
+    not_modified: bool
+    new_connection: bool
+    bytes_transferred: int
+    connect_seconds: float
+    download_seconds: float
+    decode_seconds: float
+
+
+@dataclass
+class UpstreamResponse:
+    not_modified: bool
+    data: Any
+    stats: FetchStats
+
+
+class UpstreamClient:
+    """
+    HTTP client for the weather API with a persistent keep-alive session.
+    Sends gzip/deflate Accept-Encoding and If-None-Match/If-Modified-Since so an
+    unchanged dataset costs a 304 with no body to download or decode. The
+    validators belong to the query params they were returned for and are only
+    sent with the same params: a filtered (incremental) request must not get a
+    304 that refers to the full dataset, or the other way round.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 10,
+        pool_connections: int = 1,
+        pool_maxsize: int = 4,
+        chunk_size: int = 64 * 1024
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._session = requests.Session()
+        self._session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._session.mount('http://', self._adapter)
+        self._session.mount('https://', self._adapter)
+
+        self._lock = threading.Lock()
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._validated_params: Optional[Tuple] = None
+        self._last_stats: Optional[FetchStats] = None
+        self._totals = {
+            'requests': 0,
+            'not_modified': 0,
+            'connections_opened': 0,
+            'bytes_transferred': 0,
+            'connect_seconds': 0.0,
+            'download_seconds': 0.0,
+            'decode_seconds': 0.0,
+        }
+
+    def _connections_opened(self) -> int:
+        """Number of connections the pools have opened to the upstream host so far."""
+        try:
+            pools = self._adapter.poolmanager.pools
+            return sum(pools[key].num_connections for key in pools.keys())
+        except Exception:  # pylint: disable=broad-exception-caught
+            return 0
+
+    def _conditional_headers(self, params: Optional[Dict[str, str]]) -> Dict[str, str]:
+        headers = {}
+        if _params_key(params) != self._validated_params:
+            return headers
+        if self._etag:
+            headers['If-None-Match'] = self._etag
+        if self._last_modified:
+            headers['If-Modified-Since'] = self._last_modified
+        return headers
+
+    def _request(self, conditional: bool, params: Optional[Dict[str, str]]):
+        """Send the GET and return (response, started, headers_received, new_connection)."""
+        headers = self._conditional_headers(params) if conditional else {}
+        connections_before = self._connections_opened()
+
+        started = time.perf_counter()
+        response = self._session.get(
+            self.url, params=params, timeout=self.timeout, headers=headers, stream=True
+        )
+        headers_received = time.perf_counter()
+        return response, started, headers_received, self._connections_opened() > connections_before
+
+    def _not_modified(self, response, started, headers_received, new_connection) -> UpstreamResponse:
+        response.close()
+        stats = FetchStats(
+            status_code=304,
+            not_modified=True,
+            new_connection=new_connection,
+            bytes_transferred=0,
+            connect_seconds=headers_received - started,
+            download_seconds=0.0,
+            decode_seconds=0.0
+        )
+        self._record(stats)
+        return UpstreamResponse(not_modified=True, data=None, stats=stats)
+
+    def _store_validators(self, response, params: Optional[Dict[str, str]]):
+        with self._lock:
+            self._etag = response.headers.get('ETag')
+            self._last_modified = response.headers.get('Last-Modified')
+            self._validated_params = _params_key(params)
+
+    def fetch_rows(self, conditional: bool = True, params: Optional[Dict[str, str]] = None) -> UpstreamResponse:
+        """
+        GET the dataset. With conditional=True the validators from the last
+        complete 200 response are sent if it had the same params, and a 304
+        comes back as not_modified with no data. params are passed as query
+        string (e.g. an incremental-sync filter).
+
+        Otherwise data is an iterator over the rows of the payload, parsed
+        incrementally as the body streams in. The response is closed and
+        stats are recorded once the iterator is exhausted; validators are only
+        kept if the whole body parsed successfully. Raises requests exceptions
+        (and, while iterating, ValueError for invalid JSON) to the caller.
+        """
+        response, started, headers_received, new_connection = self._request(conditional, params)
+
+        if response.status_code == 304:
+            return self._not_modified(response, started, headers_received, new_connection)
+
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+
+        stats = FetchStats(
+            status_code=response.status_code,
+            not_modified=False,
+            new_connection=new_connection,
+            bytes_transferred=0,
+            connect_seconds=headers_received - started,
+            download_seconds=0.0,
+            decode_seconds=0.0
+        )
+        return UpstreamResponse(not_modified=False, data=self._stream_rows(response, stats, params), stats=stats)
+
+    def _stream_rows(self, response, stats: FetchStats, params: Optional[Dict[str, str]]) -> Iterator[Any]:
+        timings = {}
+        try:
+            yield from iter_json_array(response.iter_content(self.chunk_size), timings=timings)
+            stats.bytes_transferred = response.raw.tell()
+            stats.download_seconds = timings['read_seconds']
+            stats.decode_seconds = timings['parse_seconds']
+            self._store_validators(response, params)
+            self._record(stats)
+        finally:
+            response.close()
+
+    def _record(self, stats: FetchStats):
+        with self._lock:
+            self._last_stats = stats
+            self._totals['requests'] += 1
+            self._totals['not_modified'] += int(stats.not_modified)
+            self._totals['connections_opened'] += int(stats.new_connection)
+            self._totals['bytes_transferred'] += stats.bytes_transferred
+            self._totals['connect_seconds'] += stats.connect_seconds
+            self._totals['download_seconds'] += stats.download_seconds
+            self._totals['decode_seconds'] += stats.decode_seconds
+
+        logger.debug(
+            "Upstream %s: %d bytes, connect %.3fs, download %.3fs, decode %.3fs%s",
+            stats.status_code, stats.bytes_transferred, stats.connect_seconds,
+            stats.download_seconds, stats.decode_seconds,
+            " (new connection)" if stats.new_connection else ""
+        )
+
+    def get_stats(self) -> Dict:
+        """Get transfer and timing figures for monitoring."""
+        with self._lock:
+            return {
+                'last_request': asdict(self._last_stats) if self._last_stats else None,
+                'totals': dict(self._totals),
+                'has_validators': bool(self._etag or self._last_modified)
+            }
+
+    def close(self):
+        self._session.close()
+
+
+def _params_key(params: Optional[Dict[str, str]]) -> Tuple:
+    """Order-independent identity of a request's query params."""
+    return tuple(sorted((params or {}).items()))
@@ -2,13 +2,44 @@
 
 import requests
 import logging
+import pickle
 import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
+from services.upstream_client import UpstreamClient
+from services.reading_store import ReadingStore, MergeResult
+from services.snapshot import WeatherSnapshot, get_index
+from services.snapshot_changelog import SnapshotChangelog, SnapshotDiff
+from services.shared_snapshot import SharedSnapshot
+from services.snapshot_archive import SnapshotArchive
+from utils.circuit_breaker import CircuitBreaker, CLOSED
+from utils.rolling_stats import RollingLatency
+from utils.timestamps import reading_epoch
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
 logger = logging.getLogger(__name__)
 
 
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, if the platform reports it."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _Flight:
+    """A single in-progress upstream fetch that other threads can wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[List[Dict]] = None
+
+
 class WeatherCache:
     """Thread-safe cache for weather data with TTL and fallback support."""
     
@@ -20,8 +51,15 @@ class WeatherCache:
         self._stale_ttl = timedelta(seconds=stale_ttl_seconds)
         self._lock = threading.Lock()
         self._fetch_errors = 0
-        self._max_errors_before_backoff = 3
-        self._backoff_until: Optional[datetime] = None
+        self._flight: Optional[_Flight] = None
+        self._coalesced_waiters = 0
+        self._version = 0
+    
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot (0 before the first successful fetch)."""
+        with self._lock:
+            return self._version
     
     def get(self) -> tuple[Optional[List[Dict]], bool, Optional[datetime]]:
         """
@@ -37,39 +75,67 @@ class WeatherCache:
             
             return self._data, is_fresh, self._last_success
     
-    def set(self, data: List[Dict], success: bool = True):
-        """Store data in cache."""
+    def set(self, data: List[Dict], success: bool = True, at: Optional[datetime] = None):
+        """Store data in cache (fetched at `at`, default now)."""
         with self._lock:
-            now = datetime.now()
+            now = at or datetime.now()
             self._data = data
             self._last_fetch = now
+            if isinstance(data, WeatherSnapshot):
+                self._version = data.version
             
             if success and data:
                 self._last_success = now
                 self._fetch_errors = 0
-                self._backoff_until = None
     
     def record_error(self):
-        """Record a fetch error for backoff calculation."""
+        """Count a failed fetch (the streak resets on the next success)."""
         with self._lock:
             self._fetch_errors += 1
-            if self._fetch_errors >= self._max_errors_before_backoff:
-                backoff_seconds = min(60 * (2 ** (self._fetch_errors - self._max_errors_before_backoff)), 300)
-                self._backoff_until = datetime.now() + timedelta(seconds=backoff_seconds)
-                logger.warning(f"API errors exceeded threshold. Backing off for {backoff_seconds}s")
     
-    def should_fetch(self) -> bool:
-        """Check if we should attempt a new fetch."""
+    def touch(self, at: Optional[datetime] = None):
+        """Mark the current data as confirmed at `at`, default now (upstream reported no change)."""
+        with self._lock:
+            now = at or datetime.now()
+            self._last_fetch = now
+            if self._data:
+                self._last_success = now
+                self._fetch_errors = 0
+    
+    def has_data(self) -> bool:
+        with self._lock:
+            return self._data is not None
+    
+    def needs_refresh(self, ahead_seconds: float = 0) -> bool:
+        """Check if the data is within ahead_seconds of expiring."""
         with self._lock:
             now = datetime.now()
             
-            if self._backoff_until and now < self._backoff_until:
-                return False
-            
             if self._last_fetch is None:
                 return True
             
-            return (now - self._last_fetch) >= self._ttl
+            return (now - self._last_fetch) >= self._ttl - timedelta(seconds=ahead_seconds)
+    
+    def begin_fetch(self) -> tuple[bool, _Flight]:
+        """
+        Join or start the upstream fetch for this cache.
+        Returns: (is_leader, flight) - only the leader should call the API.
+        """
+        with self._lock:
+            if self._flight is not None:
+                self._coalesced_waiters += 1
+                return False, self._flight
+            
+            self._flight = _Flight()
+            return True, self._flight
+    
+    def end_fetch(self, flight: _Flight, result: Optional[List[Dict]]):
+        """Publish the leader's result and release any waiting threads."""
+        with self._lock:
+            flight.result = result
+            if self._flight is flight:
+                self._flight = None
+        flight.done.set()
     
     def get_stale_data(self) -> Optional[List[Dict]]:
         """Get data even if stale (for fallback scenarios)."""
@@ -91,24 +157,160 @@ class WeatherCache:
             
             return {
                 'has_data': self._data is not None,
+                'version': self._version,
                 'data_count': len(self._data) if self._data else 0,
                 'age_seconds': age_seconds,
                 'last_success': self._last_success.isoformat() if self._last_success else None,
                 'fetch_errors': self._fetch_errors,
-                'in_backoff': self._backoff_until and now < self._backoff_until
+                'fetch_in_progress': self._flight is not None,
+                'coalesced_waiters': self._coalesced_waiters
             }
 
 
+class WeatherRefresher:
+    """Background thread that re-fetches weather data shortly before the cache expires."""
+    
+    def __init__(self, service: 'WeatherService', ahead_seconds: float = 10, poll_interval: float = 2):
+        self.service = service
+        self.ahead_seconds = ahead_seconds
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start the refresher thread if it is not already running."""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='weather-refresher', daemon=True)
+        self._thread.start()
+        logger.info(f"Background refresher started ({self.ahead_seconds}s ahead of TTL)")
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Signal the refresher thread to exit and wait for it."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.service.refresh_due(self.ahead_seconds):
+                    self.service.refresh()
+            except Exception as e:
+                logger.error(f"Background refresh failed: {str(e)}", exc_info=True)
+            self._stop.wait(self.poll_interval)
+
+
 class WeatherService:
     """Service for fetching and processing weather data with intelligent caching."""
     
     _cache = WeatherCache(ttl_seconds=60, stale_ttl_seconds=300)
+    _refresher: Optional[WeatherRefresher] = None
+    _refresher_lock = threading.Lock()
     
-    def __init__(self, api_url: str, timeout: int = 10):
+    NOT_MODIFIED = object()
+    
+    def __init__(
+        self,
+        api_url: str,
+        timeout: int = 10,
+        pool_connections: int = 1,
+        pool_maxsize: int = 4,
+        incremental_param: Optional[str] = None,
+        retention_hours: Optional[float] = None,
+        changelog_versions: int = 30,
+        changelog_max_readings: int = 50000,
+        latency_window: int = 50,
+        shared_snapshot: Optional[SharedSnapshot] = None,
+        archive: Optional[SnapshotArchive] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        force_refresh_interval: float = 30
+    ):
         self.api_url = api_url
         self.timeout = timeout
+        self.incremental_param = incremental_param
+        self._store = ReadingStore(retention_hours=retention_hours if incremental_param else None)
+        self._last_merge: Optional[MergeResult] = None
+        self._last_ingest: Optional[Dict[str, Any]] = None
+        self._snapshot_listeners: List[Callable[[WeatherSnapshot], None]] = []
+        self._publish_listeners: List[Callable[[WeatherSnapshot], None]] = []
+        self.changelog = SnapshotChangelog(max_versions=changelog_versions, max_readings=changelog_max_readings)
+        # Every upstream attempt (by the background refresher, or a request when it is off)
+        self.fetch_latency = RollingLatency(window=latency_window)
+        # Open after repeated upstream failures: calls fail fast to the cached data
+        self.breaker = circuit_breaker or CircuitBreaker()
+        # force_refresh reaches upstream at most once per interval, whoever asks
+        self.force_refresh_interval = force_refresh_interval
+        self._last_forced: Optional[float] = None
+        self._force_lock = threading.Lock()
+        self.forced_refreshes = 0
+        self.forced_refreshes_limited = 0
+        # When set, only the process leading it fetches; the others read its file
+        self.shared = shared_snapshot
+        # Last good snapshot on disk: written after each new version, loaded by warm_start()
+        self.archive = archive
+        self._created = time.perf_counter()
+        self._startup: Dict[str, Any] = {'source': None, 'first_data_seconds': None, 'warm_start': None}
+        self.client = UpstreamClient(
+            api_url,
+            timeout=timeout,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
         logger.info(f"WeatherService initialized with API: {api_url}")
     
+    def start_background_refresh(self, ahead_seconds: float = 10, poll_interval: float = 2) -> WeatherRefresher:
+        """
+        Start refreshing the cache in the background so requests never wait on the API.
+        Only one refresher runs per process since the cache is shared. Cheap once
+        it runs, so the app calls it on every request: threads do not survive a
+        fork, and a refresher inherited from a preloading parent is started again.
+        """
+        refresher = WeatherService._refresher
+        if refresher is not None and refresher.is_running:
+            return refresher
+        with WeatherService._refresher_lock:
+            if WeatherService._refresher is None:
+                WeatherService._refresher = WeatherRefresher(self, ahead_seconds, poll_interval)
+            WeatherService._refresher.start()
+            return WeatherService._refresher
+    
+    def stop_background_refresh(self):
+        """Stop the background refresher if one is running."""
+        if WeatherService._refresher is not None:
+            WeatherService._refresher.stop()
+            WeatherService._refresher = None
+    
+    def _is_background_refreshing(self) -> bool:
+        return WeatherService._refresher is not None and WeatherService._refresher.is_running
+    
+    def add_snapshot_listener(self, listener: Callable[[WeatherSnapshot], None]):
+        """
+        Call listener with every new snapshot before it is published to the cache,
+        so derived data (e.g. chart rollups) is ready before any request sees it.
+        """
+        self._snapshot_listeners.append(listener)
+    
+    def add_publish_listener(self, listener: Callable[[WeatherSnapshot], None]):
+        """
+        Call listener with every new snapshot once requests can see it, e.g. to
+        push it to clients that will then query the API.
+        """
+        self._publish_listeners.append(listener)
+    
+    def _notify_snapshot(self, snapshot: WeatherSnapshot, listeners=None):
+        for listener in self._snapshot_listeners if listeners is None else listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot listener failed: {str(e)}", exc_info=True)
+    
     def _sanitize_reading(self, reading: Dict[str, Any]) -> Dict[str, Any]:
         """Convert string values to proper types and handle invalid data."""
         float_fields = [
@@ -134,25 +336,45 @@ class WeatherService:
         
         return reading
     
-    def _fetch_from_api(self) -> Optional[List[Dict[str, Any]]]:
-        """Internal method to fetch fresh data from external API."""
+    def _fetch_from_api(self) -> Any:
+        """
+        Internal method to fetch fresh data from external API.
+        Only readings not already held are sanitized and merged. When the
+        upstream supports a time filter (incremental_param) only rows newer
+        than our high-water mark are requested.
+        Returns the sanitized readings, NOT_MODIFIED if upstream reports (or the
+        diff shows) the cached data is still current, or None on failure.
+        """
         try:
-            logger.debug(f"Fetching weather data from {self.api_url}")
-            response = requests.get(self.api_url, timeout=self.timeout)
-            response.raise_for_status()
+            params = None
+            high_water_mark = self._store.high_water_mark() if self.incremental_param else None
+            if high_water_mark:
+                params = {self.incremental_param: high_water_mark}
             
-            data = response.json()
+            logger.debug(f"Fetching weather data from {self.api_url}")
+            response = self.client.fetch_rows(conditional=self._cache.has_data(), params=params)
             
-            if isinstance(data, dict) and 'data' in data:
-                data = data['data']
+            if response.not_modified:
+                logger.debug("Upstream data not modified since last fetch")
+                return self.NOT_MODIFIED
             
-            if not isinstance(data, list):
-                logger.error(f"Expected list, got {type(data)}")
-                return None
+            started = time.perf_counter()
+            merge = self._store.ingest(response.data, sanitize=self._sanitize_reading, complete=not params)
+            elapsed = time.perf_counter() - started
+            self._last_merge = merge
+            self._last_ingest = {
+                'rows': merge.scanned,
+                'seconds': round(elapsed, 4),
+                'rows_per_second': round(merge.scanned / elapsed) if elapsed > 0 else None,
+                'bytes_transferred': response.stats.bytes_transferred,
+                'peak_rss_mb': _peak_rss_mb()
+            }
+            logger.info(f"Successfully fetched {merge.scanned} weather readings "
+                        f"({len(merge.added) - merge.replaced} new, {merge.replaced} corrected)")
             
-            sanitized_data = [self._sanitize_reading(reading) for reading in data]
-            logger.info(f"Successfully fetched {len(sanitized_data)} weather readings")
-            return sanitized_data
+            if not merge.changed and self._cache.has_data():
+                return self.NOT_MODIFIED
+            return merge.readings
             
         except requests.exceptions.Timeout:
             logger.warning(f"API request timed out after {self.timeout}s")
@@ -167,31 +389,172 @@ class WeatherService:
             logger.error(f"Unexpected error: {str(e)}", exc_info=True)
             return None
     
+    def refresh(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch from the API (or, following a shared snapshot, load the leader's) and update the cache.
+        Concurrent callers share a single upstream request: the first one fetches
+        and the rest wait (at most the API timeout) for its result.
+        Returns the new data, or None if the fetch failed.
+        """
+        is_leader, flight = self._cache.begin_fetch()
+        
+        if not is_leader:
+            logger.debug("Upstream fetch already in progress, waiting for its result")
+            if not flight.done.wait(self.timeout):
+                logger.warning(f"Gave up waiting for in-flight fetch after {self.timeout}s")
+            return flight.result
+        
+        fresh_data = None
+        try:
+            if self._follows_shared():
+                fresh_data = self._load_shared()
+            else:
+                fresh_data = self._refresh_from_api()
+        finally:
+            self._cache.end_fetch(flight, fresh_data or None)
+        
+        return fresh_data or None
+    
+    def _refresh_from_api(self) -> Optional[List[Dict[str, Any]]]:
+        if not self.breaker.allow():
+            logger.debug("Circuit open, not calling upstream")
+            return None
+        
+        started = time.perf_counter()
+        fresh_data = self._fetch_from_api()
+        ok = fresh_data is self.NOT_MODIFIED or bool(fresh_data)
+        self.fetch_latency.record(time.perf_counter() - started, ok=ok)
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        
+        if fresh_data is self.NOT_MODIFIED:
+            self._cache.touch()
+            if self.shared is not None:
+                self.shared.confirm()
+            if self.archive is not None:
+                self.archive.confirm()
+            return self._cache.get_stale_data()
+        if not fresh_data:
+            self._cache.record_error()
+            return None
+        
+        merge = self._last_merge
+        row_digests = merge.row_digests if merge is not None and merge.readings is fresh_data else None
+        snapshot = WeatherSnapshot(fresh_data, version=self._next_version(), row_digests=row_digests)
+        self._publish(snapshot, source='upstream')
+        if self.shared is not None:
+            try:
+                self.shared.publish(snapshot)
+            except OSError as e:
+                logger.error(f"Could not publish shared snapshot: {str(e)}")
+        if self.archive is not None:
+            try:
+                self.archive.save(snapshot)
+            except (OSError, pickle.PicklingError) as e:
+                logger.error(f"Could not archive snapshot: {str(e)}")
+        return snapshot
+    
+    def _publish(self, snapshot: WeatherSnapshot, at: Optional[datetime] = None, source: str = 'upstream'):
+        """Make snapshot the current data: changelog, derived data, cache, then publish listeners."""
+        self.changelog.record(snapshot)
+        self._notify_snapshot(snapshot)
+        self._cache.set(snapshot, success=True, at=at)
+        self._notify_snapshot(snapshot, self._publish_listeners)
+        if self._startup['source'] is None:
+            self._startup['source'] = source
+            self._startup['first_data_seconds'] = round(time.perf_counter() - self._created, 3)
+    
+    def warm_start(self) -> bool:
+        """
+        Serve the archived snapshot (with its rollups) until the first fetch
+        replaces it. Call before serving requests. Its age is measured from
+        when it was last confirmed, so it is only fresh if that was within the
+        TTL. Returns whether a snapshot was loaded.
+        """
+        if self.archive is None or self._cache.has_data():
+            return False
+        archived = self.archive.load()
+        if archived is None:
+            self._startup['warm_start'] = {'loaded': False}
+            return False
+        
+        self._publish(archived.snapshot, at=archived.confirmed_at, source='archive')
+        self._startup['warm_start'] = {
+            'loaded': True,
+            'version': archived.snapshot.version,
+            'readings': len(archived.snapshot),
+            'age_seconds': round((datetime.now() - archived.confirmed_at).total_seconds(), 1),
+            'load_seconds': self.archive.last_load_seconds
+        }
+        return True
+    
+    def _next_version(self) -> int:
+        version = self._cache.version
+        if self.shared is not None:
+            # A process that just took over continues the shared numbering
+            version = max(version, self.shared.peek_version() or 0)
+        return version + 1
+    
+    def _follows_shared(self) -> bool:
+        """True while another process fetches for this host and this one reads its snapshot file."""
+        return self.shared is not None and not self.shared.try_lead()
+    
+    def _load_shared(self) -> Optional[List[Dict[str, Any]]]:
+        """Adopt the leader's snapshot if it moved on; only decodes it when its version changed."""
+        state = self.shared.read(known_version=self._cache.version)
+        if state is None:
+            return self._cache.get_stale_data()
+        if state.readings is None:
+            self._cache.touch(at=state.confirmed_at)
+            return self._cache.get_stale_data()
+        
+        snapshot = WeatherSnapshot(state.readings, version=state.version, fetched_at=state.fetched_at)
+        self._publish(snapshot, at=state.confirmed_at, source='shared')
+        logger.debug(f"Loaded shared snapshot v{snapshot.version} ({len(snapshot)} readings)")
+        return snapshot
+    
+    def refresh_due(self, ahead_seconds: float = 0) -> bool:
+        """Whether refresh() has anything to do: the TTL is (almost) up, or the leader published."""
+        if self._follows_shared():
+            return self.shared.changed() or not self._cache.has_data()
+        return self._cache.needs_refresh(ahead_seconds) and self.breaker.would_allow()
+    
     def fetch_weather_data(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch weather data with intelligent caching.
         Returns cached data if fresh, otherwise fetches new data.
-        Falls back to stale data if API fails.
+        While the background refresher is running, cached data is returned
+        immediately even if stale and the refresher takes care of updating it.
+        Falls back to stale data if API fails, and returns it without
+        calling the API at all while the circuit breaker is open.
+        force_refresh is honoured at most once per force_refresh_interval.
         """
+        if self._follows_shared():
+            return self._follow_shared_data()
+        if force_refresh:
+            force_refresh = self._claim_force_refresh()
+        
         cached_data, is_fresh, last_success = self._cache.get()
         
         if is_fresh and not force_refresh:
             logger.debug("Returning fresh cached data")
             return cached_data
         
-        if not self._cache.should_fetch() and not force_refresh:
-            if cached_data:
-                logger.debug("In backoff period, returning cached data")
-                return cached_data
+        if cached_data and not force_refresh and self._is_background_refreshing():
+            logger.debug("Returning cached data while background refresh runs")
+            return cached_data
         
-        fresh_data = self._fetch_from_api()
+        if cached_data and not self.breaker.would_allow():
+            logger.debug("Circuit open, returning cached data")
+            return cached_data
+        
+        fresh_data = self.refresh()
         
         if fresh_data:
-            self._cache.set(fresh_data, success=True)
             return fresh_data
         
-        self._cache.record_error()
-        
         stale_data = self._cache.get_stale_data()
         if stale_data:
             logger.info("API failed, returning stale cached data")
@@ -200,13 +563,128 @@ class WeatherService:
         logger.error("No cached data available and API failed")
         return []
     
+    def _claim_force_refresh(self) -> bool:
+        """Whether this caller may bypass the cache now; otherwise it is served like any other."""
+        now = time.monotonic()
+        with self._force_lock:
+            if self._last_forced is not None and now - self._last_forced < self.force_refresh_interval:
+                self.forced_refreshes_limited += 1
+                return False
+            self._last_forced = now
+            self.forced_refreshes += 1
+            return True
+    
+    def _follow_shared_data(self) -> List[Dict[str, Any]]:
+        """
+        Current data of a follower. Requests never fetch upstream here. While
+        the background refresher runs they are served the snapshot in memory
+        and the refresher loads the leader's newer ones; otherwise, or before
+        there is any snapshot, they load it themselves, waiting for the
+        leader's first publish (at most the API timeout).
+        """
+        if self._is_background_refreshing():
+            cached_data, _, _ = self._cache.get()
+            if cached_data:
+                logger.debug("Returning in-memory shared snapshot while background refresh runs")
+                return cached_data
+        
+        deadline = time.monotonic() + self.timeout
+        while self.refresh_due():
+            self.refresh()
+            if self._cache.has_data() or time.monotonic() >= deadline:
+                break
+            time.sleep(0.1)
+        
+        cached_data, _, _ = self._cache.get()
+        if not cached_data:
+            logger.error("No shared snapshot published yet")
+        return cached_data or []
+    
     def get_cache_status(self) -> Dict:
         """Get current cache status for monitoring."""
-        return self._cache.get_cache_status()
+        status = self._cache.get_cache_status()
+        status['background_refresh'] = self._is_background_refreshing()
+        status['upstream'] = self.client.get_stats()
+        status['sync'] = {
+            'mode': 'incremental' if self.incremental_param else 'full',
+            'stored_readings': len(self._store),
+            'last_added': len(self._last_merge.added) if self._last_merge else None,
+            'last_removed': self._last_merge.removed if self._last_merge else None,
+            'high_water_marks': self._store.get_high_water_marks(),
+            'last_ingest': self._last_ingest
+        }
+        status['changelog'] = self.changelog.get_stats()
+        status['fetch_latency'] = self.fetch_latency.get_stats()
+        status['circuit'] = self.breaker.get_stats()
+        status['force_refresh'] = {
+            'min_interval_seconds': self.force_refresh_interval,
+            'honoured': self.forced_refreshes,
+            'limited': self.forced_refreshes_limited
+        }
+        if self.shared is not None:
+            status['shared'] = self.shared.get_stats()
+        if self.archive is not None:
+            status['archive'] = self.archive.get_stats()
+        status['startup'] = dict(self._startup)
+        return status
+    
+    def get_health(self, max_snapshot_age: float) -> Dict[str, Any]:
+        """
+        Liveness and readiness from in-memory state only - never contacts the API.
+        
+        Live unless the background refresher was started and has since died.
+        Ready while a snapshot confirmed within max_snapshot_age seconds is
+        held; an upstream outage alone does not make the process unready, as
+        it keeps serving the last good data.
+        """
+        cache = self._cache.get_cache_status()
+        refresher = WeatherService._refresher
+        age = cache['age_seconds']
+        last = self.fetch_latency.last
+        return {
+            'live': refresher is None or refresher.is_running,
+            'ready': cache['has_data'] and age is not None and age <= max_snapshot_age,
+            'snapshot': {
+                'has_data': cache['has_data'],
+                'version': cache['version'],
+                'readings': cache['data_count'],
+                'age_seconds': round(age, 1) if age is not None else None,
+                'max_age_seconds': max_snapshot_age,
+                'last_success': cache['last_success']
+            },
+            'fetcher': {
+                'background_refresh': refresher is not None and refresher.is_running,
+                'fetch_in_progress': cache['fetch_in_progress'],
+                'last_fetch_ms': round(last[0] * 1000, 1) if last else None,
+                'error_streak': cache['fetch_errors'],
+                'circuit': self.breaker.state,
+                'in_backoff': self.breaker.state != CLOSED,
+                'backoff_remaining_seconds': round(self.breaker.retry_after(), 1)
+            },
+            'upstream': self.fetch_latency.get_stats(),
+            'shared': self.shared.get_stats() if self.shared is not None else None
+        }
+    
+    def get_changes_since(
+        self,
+        weather_data: List[Dict],
+        version: int,
+        digest: Optional[str] = None
+    ) -> Optional[SnapshotDiff]:
+        """
+        What changed between snapshot `version` and weather_data, or None if
+        that version is no longer in the changelog (or weather_data is not the
+        snapshot the changelog last recorded). A version from a client comes
+        with its digest, which must match the content recorded for it.
+        """
+        if getattr(weather_data, 'version', None) != self.changelog.version:
+            return None
+        return self.changelog.since(version, digest)
     
     def get_latest_per_station(self, weather_data: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         """Get latest reading per station."""
         stations = {}
+        index = get_index(weather_data)
         
         station_id_map = {
             'St1': ['St1'],  
@@ -217,62 +695,31 @@ class WeatherService:
         }
         
         for canonical_id, possible_ids in station_id_map.items():
-            station_readings = []
-            
-            for reading in weather_data:
-                api_station_id = reading.get('StationID')
-                if api_station_id in possible_ids:
-                    station_readings.append(reading)
-            
-            if station_readings:
-                try:
-                    station_readings.sort(
-                        key=lambda x: x.get('Timestamp') or x.get('DateTime') or x.get('DateTimeStamp') or '', 
-                        reverse=True
-                    )
-                    stations[canonical_id] = station_readings[0]
-                except Exception as e:
-                    logger.error(f"Error sorting readings for {canonical_id}: {e}")
-                    stations[canonical_id] = station_readings[0]
+            candidates = [index.latest(api_station_id) for api_station_id in possible_ids]
+            candidates = [reading for reading in candidates if reading is not None]
+            if candidates:
+                stations[canonical_id] = max(candidates, key=reading_epoch)
         
         return stations
     
-    def filter_by_station(self, weather_data: List[Dict], station_id: str) -> List[Dict]:
-        """Filter weather data by station ID."""
-        filtered = [r for r in weather_data if r.get('StationID') == station_id]
-        
-        try:
-            sorted_data = sorted(
-                filtered,
-                key=lambda x: datetime.fromisoformat(
-                    (x.get('Timestamp') or x.get('DateTimeStamp') or x.get('DateTime') or '').replace('Z', '+00:00')
-                ),
-                reverse=True
-            )
-            return sorted_data
-        except (KeyError, ValueError, AttributeError):
-            return filtered
+    def filter_by_station(self, weather_data: List[Dict], station_id: str, limit: Optional[int] = None) -> List[Dict]:
+        """Filter weather data by station ID, newest first (optionally only the newest `limit`)."""
+        return get_index(weather_data).recent(station_id, limit)
     
     def get_latest_reading(self, weather_data: List[Dict]) -> Optional[Dict]:
         """Get the most recent weather reading from any station."""
         if not weather_data:
             return None
         
-        try:
-            latest = max(
-                weather_data,
-                key=lambda x: datetime.fromisoformat(
-                    (x.get('Timestamp') or x.get('DateTimeStamp') or x.get('DateTime') or '').replace('Z', '+00:00')
-                )
-            )
-            return latest
-        except (ValueError, AttributeError):
-            return weather_data[0] if weather_data else None
+        return get_index(weather_data).latest_overall() or weather_data[0]
+    
+    def get_station_latest_reading(self, weather_data: List[Dict], station_id: str) -> Optional[Dict]:
+        """Get the most recent reading of one station."""
+        return get_index(weather_data).latest(station_id)
     
     def get_mdrrmo_latest_reading(self, weather_data: List[Dict]) -> Optional[Dict]:
         """Get latest reading from MDRRMO station."""
-        mdrrmo_data = self.filter_by_station(weather_data, 'St1')
-        return self.get_latest_reading(mdrrmo_data) if mdrrmo_data else None
+        return self.get_station_latest_reading(weather_data, 'St1')
     
     def get_24hour_average(self, weather_data: List[Dict]) -> Dict[str, Optional[float]]:
         """Calculate 24-hour averages for all metrics."""
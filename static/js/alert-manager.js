@@ -250,6 +250,15 @@ const AlertManager = {
 document.addEventListener('DOMContentLoaded', () => {
 	AlertManager.initialize();
 	AlertManager.requestNotificationPermission();
+	
+	// Alert level changes pushed by the server as soon as a snapshot is ingested
+	window.liveUpdates?.on('alert', (payload) => {
+		Object.entries(payload.stations || {}).forEach(([stationId, alert]) => {
+			if (['critical', 'warning'].includes(alert.level)) {
+				AlertManager.triggerAlert(stationId, alert.level, alert.water_level);
+			}
+		});
+	});
 });
 
 window.AlertManager = AlertManager;
\ No newline at end of file
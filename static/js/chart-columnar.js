@@ -0,0 +1,75 @@
+/**
+ * Decoder for the format=columnar chart payloads of /api/precipitation-data
+ * and /api/water-level-data.
+ *
+ * Rebuilds the per-point objects ({label, y, intensity|alert_level, day,
+ * timestamp, count, show_label}) the charts render from the parallel arrays,
+ * start time and step the server sends. Payloads in the object format are
+ * returned unchanged.
+ */
+function formatHourLabel(hour) {
+	if (hour === 0) return "12 AM";
+	if (hour < 12) return `${hour} AM`;
+	if (hour === 12) return "12 PM";
+	return `${hour - 12} PM`;
+}
+
+function pad2(value) {
+	return String(value).padStart(2, "0");
+}
+
+// Hour and ISO timestamp of each point, worked out on the naive start string
+// so the viewer's timezone (and its DST changes) never shifts them
+function pointTimes(start, stepSeconds, points) {
+	const match = /^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})/.exec(start || "");
+	if (!match) return [];
+	const [, year, month, day, hour, minute, second] = match;
+
+	const times = [];
+	for (let i = 0; i < points; i++) {
+		const hours = Number(hour) + (i * stepSeconds) / 3600;
+		const pointHour = hours % 24;
+		// Only the calendar date comes from a Date, in UTC, which has no DST
+		const date = new Date(Date.UTC(Number(year), Number(month) - 1, Number(day) + Math.floor(hours / 24)));
+		times.push({
+			hour: pointHour,
+			iso:
+				`${date.getUTCFullYear()}-${pad2(date.getUTCMonth() + 1)}-${pad2(date.getUTCDate())}` +
+				`T${pad2(pointHour)}:${minute}:${second}`,
+		});
+	}
+	return times;
+}
+
+function decodeColumnarChart(payload) {
+	if (payload?.format !== "columnar" || !payload.stations) return payload;
+
+	// start is a naive local timestamp, as the object format's timestamps are
+	const times = pointTimes(payload.start, payload.step_seconds, payload.points);
+
+	const stations = {};
+	for (const [stationId, station] of Object.entries(payload.stations)) {
+		const data = times.map((time, i) => ({
+			label: formatHourLabel(time.hour),
+			y: station.y[i],
+			[payload.level_field]: payload.levels[station.level[i]],
+			day: payload.day,
+			timestamp: time.iso,
+			count: station.count[i],
+			show_label: time.hour % payload.label_interval_hours === 0,
+		}));
+
+		stations[stationId] = { name: station.name, data };
+		if (station.statistics) stations[stationId].statistics = station.statistics;
+	}
+
+	const decoded = { ...payload, stations };
+	for (const key of ["format", "start", "step_seconds", "points", "day", "label_interval_hours", "level_field", "levels"]) {
+		delete decoded[key];
+	}
+	return decoded;
+}
+
+if (typeof window !== "undefined") {
+	window.decodeColumnarChart = decodeColumnarChart;
+}
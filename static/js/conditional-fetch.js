@@ -0,0 +1,115 @@
+/**
+ * fetch() wrapper that revalidates instead of re-downloading.
+ *
+ * Remembers the ETag / Last-Modified and body of the last successful response
+ * per URL and sends them back as If-None-Match / If-Modified-Since. A 304 from
+ * the server is turned back into a 200 Response carrying the remembered body,
+ * so callers keep using response.ok and response.json() as with plain fetch().
+ *
+ * preloadBatch() requests several /api URLs in one /api/batch round trip; the
+ * first fetch() of each of those URLs is then answered from the batch.
+ */
+class ConditionalFetch {
+	constructor(maxEntries = 32, batchEndpoint = "/api/batch") {
+		this.maxEntries = maxEntries;
+		this.batchEndpoint = batchEndpoint;
+		this.entries = new Map();
+		this.preloaded = new Map();
+	}
+
+	preloadBatch(urls) {
+		const query = new URLSearchParams();
+		const names = [];
+		urls.forEach((url, i) => {
+			const parsed = new URL(url, window.location.origin);
+			const name = `r${i}`;
+			names.push(`${name}:${parsed.pathname.replace(/^\/api\//, "")}`);
+			parsed.searchParams.forEach((value, param) => query.append(`${name}.${param}`, value));
+		});
+		query.set("resources", names.join(","));
+
+		const batch = fetch(`${this.batchEndpoint}?${query}`, {
+			headers: { Accept: "application/json" },
+		})
+			.then((response) => (response.ok ? response.json() : null))
+			.catch(() => null);
+
+		urls.forEach((url, i) => {
+			this.preloaded.set(
+				String(url),
+				batch.then((payload) => {
+					const result = payload?.results?.[`r${i}`];
+					if (!result || result.status !== 200 || !result.body) return null;
+					const body = { ...result.body };
+					if (payload.generated_at && !("generated_at" in body)) body.generated_at = payload.generated_at;
+					if (payload.cache_status && !("cache_status" in body)) body.cache_status = payload.cache_status;
+					return JSON.stringify(body);
+				})
+			);
+		});
+		return batch;
+	}
+
+	async fetch(url, options = {}) {
+		const key = String(url);
+
+		const preloaded = this.preloaded.get(key);
+		if (preloaded) {
+			this.preloaded.delete(key);
+			const body = await preloaded;
+			if (body !== null) {
+				return new Response(body, {
+					status: 200,
+					headers: { "Content-Type": "application/json" },
+				});
+			}
+		}
+		const cached = this.entries.get(key);
+		const headers = new Headers(options.headers || {});
+
+		if (cached) {
+			if (cached.etag) headers.set("If-None-Match", cached.etag);
+			if (cached.lastModified) headers.set("If-Modified-Since", cached.lastModified);
+		}
+
+		const response = await fetch(url, { ...options, headers });
+
+		if (response.status === 304 && cached) {
+			this._touch(key, cached);
+			return new Response(cached.body, {
+				status: 200,
+				headers: cached.headers,
+			});
+		}
+
+		const etag = response.headers.get("ETag");
+		const lastModified = response.headers.get("Last-Modified");
+
+		if (response.ok && (etag || lastModified)) {
+			const body = await response.clone().text();
+			this._touch(key, {
+				etag,
+				lastModified,
+				body,
+				headers: { "Content-Type": response.headers.get("Content-Type") || "application/json" },
+			});
+		} else if (!response.ok) {
+			this.entries.delete(key);
+		}
+
+		return response;
+	}
+
+	_touch(key, entry) {
+		this.entries.delete(key);
+		this.entries.set(key, entry);
+		while (this.entries.size > this.maxEntries) {
+			this.entries.delete(this.entries.keys().next().value);
+		}
+	}
+}
+
+if (typeof window !== "undefined") {
+	window.ConditionalFetch = ConditionalFetch;
+	window.conditionalFetch = new ConditionalFetch();
+}
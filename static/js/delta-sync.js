@@ -0,0 +1,87 @@
+/**
+ * Local copy of an /api/weather-data view kept current with deltas.
+ *
+ * The first request (and any request after the server's changelog no longer
+ * reaches the version held) returns the full view with full=true; later
+ * requests send since_version and only receive the readings added or changed
+ * since, plus the [StationID, DateTime] keys removed. fetch() resolves to the
+ * current readings, so callers use it like the data array of a full response.
+ *
+ * keyBy "station" holds one reading per station (for latest_only views);
+ * "reading" holds every reading.
+ *
+ * apply() takes a delta that arrived some other way (e.g. a pushed event) and
+ * returns null if it does not follow on from the version held.
+ */
+class DeltaSync {
+	constructor(url, { keyBy = "reading" } = {}) {
+		this.url = url;
+		this.keyBy = keyBy;
+		this.version = null;
+		this.readings = new Map();
+		this.stationId = new URL(url, window.location.origin).searchParams.get("station_id");
+	}
+
+	_key(stationId, timestamp) {
+		return this.keyBy === "station" ? stationId : `${stationId}|${timestamp}`;
+	}
+
+	_timestamp(reading) {
+		return String(reading.DateTime || reading.DateTimeStamp || "");
+	}
+
+	async fetch(options = {}) {
+		const url = new URL(this.url, window.location.origin);
+		if (this.version !== null) {
+			url.searchParams.set("since_version", this.version);
+		}
+
+		const response = await fetch(url, options);
+		if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+		const payload = await response.json();
+		if (!Array.isArray(payload?.data)) throw new Error("Invalid response format");
+
+		return this._merge(payload);
+	}
+
+	apply(payload) {
+		if (!Array.isArray(payload?.data)) return null;
+		if (payload.full === false && (this.version === null || payload.since_version !== this.version)) {
+			return null;
+		}
+		return this._merge(payload);
+	}
+
+	_merge(payload) {
+		const wanted = (stationId) => !this.stationId || stationId === this.stationId;
+
+		if (payload.full !== false) this.readings.clear();
+
+		for (const [stationId, timestamp] of payload.removed || []) {
+			if (!wanted(stationId)) continue;
+			const key = this._key(stationId, timestamp);
+			const held = this.readings.get(key);
+			if (held && this._timestamp(held) === String(timestamp)) {
+				this.readings.delete(key);
+			}
+		}
+
+		for (const reading of payload.data) {
+			if (!wanted(reading.StationID)) continue;
+			this.readings.set(this._key(reading.StationID, this._timestamp(reading)), reading);
+		}
+
+		this.version = payload.version ?? null;
+		return Array.from(this.readings.values());
+	}
+
+	reset() {
+		this.version = null;
+		this.readings.clear();
+	}
+}
+
+if (typeof window !== "undefined") {
+	window.DeltaSync = DeltaSync;
+}
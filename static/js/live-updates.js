@@ -0,0 +1,99 @@
+/**
+ * One shared EventSource on /api/events for every module on the page.
+ *
+ * Modules register handlers with on(type, handler) instead of polling; the
+ * browser reconnects on its own and resumes with Last-Event-ID. "status"
+ * handlers are called with true/false as the stream opens and drops, so
+ * modules can fall back to polling while it is down.
+ *
+ * A server with no stream slot free answers 503, which the browser does not
+ * retry; the stream is then reopened after retryMs (the server's Retry-After).
+ */
+class LiveUpdates {
+	constructor(url = "/api/events", { retryMs = 60000 } = {}) {
+		this.url = url;
+		this.retryMs = retryMs;
+		this.source = null;
+		this.retryTimer = null;
+		this.connected = false;
+		this.handlers = new Map();
+	}
+
+	get supported() {
+		return typeof EventSource !== "undefined";
+	}
+
+	on(type, handler) {
+		if (!this.handlers.has(type)) {
+			this.handlers.set(type, new Set());
+			if (this.source && type !== "status") this._listen(type);
+		}
+		this.handlers.get(type).add(handler);
+		this._connect();
+		return () => this.handlers.get(type)?.delete(handler);
+	}
+
+	_connect() {
+		if (this.source || !this.supported) return;
+
+		this.source = new EventSource(this.url);
+		this.source.onopen = () => this._setConnected(true);
+		this.source.onerror = () => {
+			this._setConnected(false);
+			if (this.source?.readyState === EventSource.CLOSED) this._retryLater();
+		};
+		for (const type of this.handlers.keys()) {
+			if (type !== "status") this._listen(type);
+		}
+	}
+
+	_retryLater() {
+		this.source = null;
+		clearTimeout(this.retryTimer);
+		this.retryTimer = setTimeout(() => {
+			this.retryTimer = null;
+			this._connect();
+		}, this.retryMs);
+	}
+
+	_listen(type) {
+		this.source.addEventListener(type, (event) => {
+			let payload;
+			try {
+				payload = JSON.parse(event.data);
+			} catch {
+				return;
+			}
+			this._emit(type, payload);
+		});
+	}
+
+	_setConnected(connected) {
+		if (this.connected === connected) return;
+		this.connected = connected;
+		this._emit("status", connected);
+	}
+
+	_emit(type, payload) {
+		for (const handler of this.handlers.get(type) || []) {
+			try {
+				handler(payload);
+			} catch (error) {
+				console.warn(`[LIVE] ${type} handler failed:`, error);
+			}
+		}
+	}
+
+	close() {
+		clearTimeout(this.retryTimer);
+		this.retryTimer = null;
+		if (this.source) this.source.close();
+		this.source = null;
+		this._setConnected(false);
+	}
+}
+
+if (typeof window !== "undefined") {
+	window.LiveUpdates = LiveUpdates;
+	window.liveUpdates = new LiveUpdates();
+}
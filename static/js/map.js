@@ -53,8 +53,9 @@ const StationMap = {
 		},
 	},
 
-	apiEndpoint: "/api/weather-data",
-	cssApiEndpoint: "/api/css-variables",
+	apiEndpoint: "/api/weather-data/delta?latest_only=true",
+	deltaSync: null,
+	cssApiEndpoint: window.CONFIG_URLS?.css_variables || "/api/css-variables",
 	refreshInterval: 60000,
 
 	async initialize() {
@@ -65,7 +66,7 @@ const StationMap = {
 			await this.loadCSSVariables();
 			await this.initializeMap();
 			await this.updateAllStations();
-			this.startAutoRefresh();
+			if (!this.subscribeLiveUpdates()) this.startAutoRefresh();
 			this.isInitialized = true;
 		} catch (error) {
 			console.error("[MAP] Init failed:", error);
@@ -88,7 +89,7 @@ const StationMap = {
 
 	async loadCSSVariables() {
 		try {
-			const response = await fetch(this.cssApiEndpoint);
+			const response = await this._fetch(this.cssApiEndpoint);
 			if (!response.ok) throw new Error(`HTTP ${response.status}`);
 			const data = await response.json();
 			this.cssColors = data.success ? data : null;
@@ -123,31 +124,41 @@ const StationMap = {
 		this.addStyles();
 	},
 
+	_fetch(url, options) {
+		// Revalidate with ETag/Last-Modified when the shared helper is loaded
+		return window.conditionalFetch
+			? window.conditionalFetch.fetch(url, options)
+			: fetch(url, options);
+	},
+
+	async _fetchReadings(options) {
+		// Only download what changed since the last refresh when the helper is loaded
+		if (window.DeltaSync) {
+			this.deltaSync ??= new window.DeltaSync(this.apiEndpoint, { keyBy: "station" });
+			return this.deltaSync.fetch(options);
+		}
+
+		const response = await this._fetch(this.apiEndpoint, options);
+		if (!response.ok) throw new Error(`HTTP ${response.status}`);
+
+		const data = await response.json();
+		if (Array.isArray(data)) return data;
+		if (data?.success && Array.isArray(data.data)) return data.data;
+		if (Array.isArray(data?.data)) return data.data;
+
+		throw new Error("Invalid format");
+	},
+
 	async fetchWeatherData() {
 		const controller = new AbortController();
 		const timeoutId = setTimeout(() => controller.abort(), 10000);
 
 		try {
-			const response = await fetch(this.apiEndpoint, {
+			const weatherData = await this._fetchReadings({
 				headers: { Accept: "application/json" },
 				signal: controller.signal,
 			});
-
 			clearTimeout(timeoutId);
-			if (!response.ok) throw new Error(`HTTP ${response.status}`);
-
-			const data = await response.json();
-			let weatherData;
-
-			if (Array.isArray(data)) {
-				weatherData = data;
-			} else if (data?.success && Array.isArray(data.data)) {
-				weatherData = data.data;
-			} else if (Array.isArray(data?.data)) {
-				weatherData = data.data;
-			} else {
-				throw new Error("Invalid format");
-			}
 
 			this.cachedWeatherData = weatherData;
 			this.lastSuccessfulFetch = new Date();
@@ -183,10 +194,31 @@ const StationMap = {
 		return readings[0];
 	},
 
-	async updateAllStations() {
+	subscribeLiveUpdates() {
+		// Pushed deltas replace the refresh timer; poll only while the stream is down
+		const live = window.liveUpdates;
+		if (!live?.supported || !window.DeltaSync) return false;
+
+		live.on("readings", (payload) => {
+			const readings = this.deltaSync?.apply(payload);
+			if (readings) this.cachedWeatherData = readings;
+			this.updateAllStations(readings);
+		});
+		live.on("resync", () => this.updateAllStations());
+		live.on("status", (connected) => {
+			if (connected) {
+				this.stopAutoRefresh();
+			} else if (!this.refreshTimer) {
+				this.startAutoRefresh();
+			}
+		});
+		return true;
+	},
+
+	async updateAllStations(readings = null) {
 		if (!this.cssColors) return;
 
-		const weatherData = await this.fetchWeatherData();
+		const weatherData = readings ?? (await this.fetchWeatherData());
 		if (!weatherData?.length) return;
 
 		Object.keys(this.stationCoordinates).forEach((key) => {
@@ -223,7 +223,7 @@ class PrecipitationChart {
 
 	async _loadDateRange() {
 		try {
-			const response = await fetch("/api/precipitation-date-range");
+			const response = await this._fetch("/api/precipitation-date-range");
 
 			// FIXED: Better error handling
 			if (!response.ok) {
@@ -289,11 +289,14 @@ class PrecipitationChart {
 		this._showLoading();
 
 		try {
-			const apiUrl = dateString
-				? `${this.apiEndpoint}?date=${dateString}`
-				: this.apiEndpoint;
+			// Parallel-array payloads are ~6x smaller; decoded back to points here
+			const params = new URLSearchParams();
+			if (dateString) params.set("date", dateString);
+			if (window.decodeColumnarChart) params.set("format", "columnar");
+			const query = params.toString();
+			const apiUrl = query ? `${this.apiEndpoint}?${query}` : this.apiEndpoint;
 
-			const response = await fetch(apiUrl);
+			const response = await this._fetch(apiUrl);
 
 			// FIXED: Improved error handling for non-JSON responses
 			if (!response.ok) {
@@ -309,7 +312,8 @@ class PrecipitationChart {
 				throw new Error(errorMessage);
 			}
 
-			const data = await response.json();
+			const payload = await response.json();
+			const data = window.decodeColumnarChart ? window.decodeColumnarChart(payload) : payload;
 
 			if (!data.success) {
 				if (data.retry_in && attempt < MAX_RETRIES) {
@@ -364,6 +368,13 @@ class PrecipitationChart {
 		}
 	}
 
+	_fetch(url, options) {
+		// Revalidate with ETag/Last-Modified when the shared helper is loaded
+		return window.conditionalFetch
+			? window.conditionalFetch.fetch(url, options)
+			: fetch(url, options);
+	}
+
 	_sleep(ms) {
 		return new Promise((resolve) => {
 			this._retryTimeout = setTimeout(resolve, ms);
@@ -240,7 +240,7 @@ class WaterLevelChart {
 
 	async _loadDateRange() {
 		try {
-			const response = await fetch("/api/water-level-date-range");
+			const response = await this._fetch("/api/water-level-date-range");
 
 			if (!response.ok) {
 				let errorMessage = `HTTP ${response.status}`;
@@ -305,12 +305,15 @@ class WaterLevelChart {
 		this._showLoading();
 
 		try {
-			const apiUrl = dateString
-				? `${this.apiEndpoint}?date=${dateString}`
-				: this.apiEndpoint;
+			// Parallel-array payloads are ~6x smaller; decoded back to points here
+			const params = new URLSearchParams();
+			if (dateString) params.set("date", dateString);
+			if (window.decodeColumnarChart) params.set("format", "columnar");
+			const query = params.toString();
+			const apiUrl = query ? `${this.apiEndpoint}?${query}` : this.apiEndpoint;
 
 			console.log(`[${this.chartId}] Fetching from: ${apiUrl}`);
-			const response = await fetch(apiUrl);
+			const response = await this._fetch(apiUrl);
 
 			if (!response.ok) {
 				let errorMessage = `HTTP ${response.status}`;
@@ -324,7 +327,8 @@ class WaterLevelChart {
 				throw new Error(errorMessage);
 			}
 
-			const data = await response.json();
+			const payload = await response.json();
+			const data = window.decodeColumnarChart ? window.decodeColumnarChart(payload) : payload;
 
 			if (!data.success) {
 				if (data.retry_in && attempt < MAX_RETRIES) {
@@ -379,6 +383,13 @@ class WaterLevelChart {
 		}
 	}
 
+	_fetch(url, options) {
+		// Revalidate with ETag/Last-Modified when the shared helper is loaded
+		return window.conditionalFetch
+			? window.conditionalFetch.fetch(url, options)
+			: fetch(url, options);
+	}
+
 	_sleep(ms) {
 		return new Promise((resolve) => {
 			this._retryTimeout = setTimeout(resolve, ms);
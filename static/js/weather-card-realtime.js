@@ -3,9 +3,12 @@
  */
 class RealTimeWeatherCard {
 	constructor(config = {}) {
+		const stationId = config.stationId || "St4";
 		this.config = {
-			stationId: config.stationId || "St4",
-			apiEndpoint: config.apiEndpoint || "/api/weather-data",
+			stationId,
+			apiEndpoint:
+				config.apiEndpoint ||
+				`/api/weather-data/delta?station_id=${encodeURIComponent(stationId)}&latest_only=true`,
 			refreshInterval: config.refreshInterval || 60000,
 			enableAutoRefresh: config.enableAutoRefresh !== false,
 			...config,
@@ -13,6 +16,7 @@ class RealTimeWeatherCard {
 
 		this.lastUpdate = null;
 		this.refreshTimer = null;
+		this.lastRefreshTimer = null;
 		this.retryCount = 0;
 		this.maxRetries = 3;
 		this.isUpdating = false;
@@ -21,6 +25,7 @@ class RealTimeWeatherCard {
 		this.cachedData = null;
 		this.lastSuccessfulFetch = null;
 		this.consecutiveErrors = 0;
+		this.deltaSync = null;
 		this.backoffMultiplier = 1;
 
 		// Weather icon configuration
@@ -64,19 +69,40 @@ class RealTimeWeatherCard {
 		await this.updateWeatherCard();
 
 		if (this.config.enableAutoRefresh) {
-			this.startAutoRefresh();
+			if (!this.subscribeLiveUpdates()) this.startAutoRefresh();
 		}
 
 		this.setupRefreshButton();
 	}
 
-	async updateWeatherCard() {
+	subscribeLiveUpdates() {
+		// Pushed deltas replace the refresh timer; poll only while the stream is down
+		const live = window.liveUpdates;
+		if (!live?.supported || !window.DeltaSync) return false;
+
+		live.on("readings", (payload) => {
+			const readings = this.deltaSync?.apply(payload);
+			this.updateWeatherCard(readings);
+		});
+		live.on("resync", () => this.updateWeatherCard());
+		this.lastRefreshTimer = setInterval(() => this.updateLastRefreshTime(), 10000);
+		live.on("status", (connected) => {
+			if (connected) {
+				this.stopAutoRefresh();
+			} else if (!this.refreshTimer) {
+				this.startAutoRefresh();
+			}
+		});
+		return true;
+	}
+
+	async updateWeatherCard(readings = null) {
 		if (this.isUpdating) return;
 		this.isUpdating = true;
 
 		try {
 			this.showLoadingState();
-			const data = await this.fetchWeatherData();
+			const data = readings ?? (await this.fetchWeatherData());
 			const stationData = this.findMDRRMOStationData(data);
 
 			if (stationData) {
@@ -104,16 +130,33 @@ class RealTimeWeatherCard {
 		}
 	}
 
+	_fetch(url, options) {
+		// Revalidate with ETag/Last-Modified when the shared helper is loaded
+		return window.conditionalFetch
+			? window.conditionalFetch.fetch(url, options)
+			: fetch(url, options);
+	}
+
 	async fetchWeatherData() {
 		const controller = new AbortController();
 		const timeoutId = setTimeout(() => controller.abort(), 10000);
 
 		try {
-			const response = await fetch(this.config.apiEndpoint, {
+			const options = {
 				method: "GET",
 				headers: { Accept: "application/json" },
 				signal: controller.signal,
-			});
+			};
+
+			// Only download what changed since the last refresh when the helper is loaded
+			if (window.DeltaSync) {
+				this.deltaSync ??= new window.DeltaSync(this.config.apiEndpoint, { keyBy: "station" });
+				const readings = await this.deltaSync.fetch(options);
+				clearTimeout(timeoutId);
+				return readings;
+			}
+
+			const response = await this._fetch(this.config.apiEndpoint, options);
 
 			clearTimeout(timeoutId);
 
@@ -135,7 +178,7 @@ class RealTimeWeatherCard {
 	findMDRRMOStationData(dataArray) {
 		if (!Array.isArray(dataArray) || dataArray.length === 0) return null;
 
-		const mdrrmoStationIds = ["St4"];
+		const mdrrmoStationIds = [this.config.stationId];
 		const mdrrmoReadings = dataArray.filter((r) =>
 			mdrrmoStationIds.includes(r.StationID)
 		);
@@ -331,7 +374,14 @@ class RealTimeWeatherCard {
 			this.updateWeatherCard();
 		}, actualInterval);
 
-		setInterval(() => this.updateLastRefreshTime(), 10000);
+		if (!this.lastRefreshTimer) {
+			this.lastRefreshTimer = setInterval(() => this.updateLastRefreshTime(), 10000);
+		}
+	}
+
+	stopAutoRefresh() {
+		if (this.refreshTimer) clearInterval(this.refreshTimer);
+		this.refreshTimer = null;
 	}
 
 	updateLastRefreshTime() {
@@ -458,6 +508,7 @@ class RealTimeWeatherCard {
 
 	destroy() {
 		if (this.refreshTimer) clearInterval(this.refreshTimer);
+		if (this.lastRefreshTimer) clearInterval(this.lastRefreshTimer);
 		this.cachedData = null;
 	}
 }
@@ -0,0 +1,133 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherCache
+
+VOLATILE = ('generated_at', 'cache_status')
+
+
+def make_readings():
+    return [
+        {'StationID': 'St1', 'DateTime': '2025-01-02 09:15:00', 'HourlyRain': 2.0, 'WaterLevel': 120.0},
+        {'StationID': 'St2', 'DateTime': '2025-01-02 10:30:00', 'HourlyRain': 0.5, 'WaterLevel': 80.0},
+    ]
+
+
+def make_app():
+    app = create_app('testing')
+    app.weather_service._cache = WeatherCache(ttl_seconds=3600)
+    app.weather_service._cache.set(WeatherSnapshot(make_readings(), version=1))
+    return app
+
+
+def without_volatile(body):
+    return {k: v for k, v in body.items() if k not in VOLATILE}
+
+
+def test_batch_matches_individual_endpoints():
+    client = make_app().test_client()
+
+    response = client.get(
+        '/api/batch?resources=precipitation-date-range,rain:precipitation-data,weather-data'
+        '&rain.date=2025-01-02&rain.station_id=St1'
+    )
+    payload = response.get_json()
+
+    assert response.status_code == 200
+    assert payload['version'] == 1
+    assert 'generated_at' in payload
+    expected = {
+        'precipitation-date-range': '/api/precipitation-date-range',
+        'rain': '/api/precipitation-data?date=2025-01-02&station_id=St1',
+        'weather-data': '/api/weather-data',
+    }
+    for name, url in expected.items():
+        result = payload['results'][name]
+        assert result['status'] == 200
+        assert not set(VOLATILE) & set(result['body'])
+        assert result['body'] == without_volatile(client.get(url).get_json())
+    print("✓ Batch matches individual endpoints")
+
+
+def test_batch_reads_one_snapshot():
+    app = make_app()
+    client = app.test_client()
+    service = app.weather_service
+    calls = []
+    fetch = service.fetch_weather_data
+    service.fetch_weather_data = lambda *args, **kwargs: calls.append(1) or fetch(*args, **kwargs)
+
+    payload = client.get(
+        '/api/batch?resources=weather-data,precipitation-data,water-level-data,water-level-date-range'
+    ).get_json()
+
+    assert len(calls) == 1
+    assert all(result['status'] == 200 for result in payload['results'].values())
+    print("✓ Batch reads one snapshot")
+
+
+def test_batch_errors():
+    client = make_app().test_client()
+
+    assert client.get('/api/batch').status_code == 400
+    assert client.get('/api/batch?resources=events').status_code == 400
+    assert client.get('/api/batch?resources=a:weather-data,a:css-variables').status_code == 400
+    assert client.get('/api/batch?resources=' + ','.join(f'r{i}:css-variables' for i in range(11))).status_code == 400
+
+    payload = client.get('/api/batch?resources=precipitation-data&precipitation-data.date=bad').get_json()
+    assert payload['results']['precipitation-data']['status'] == 400
+    assert payload['results']['precipitation-data']['body']['success'] is False
+    print("✓ Batch errors")
+
+
+def test_batch_revalidates():
+    client = make_app().test_client()
+
+    first = client.get('/api/batch?resources=css-variables,weather-data')
+    second = client.get('/api/batch?resources=css-variables,weather-data',
+                        headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.status_code == 304
+    print("✓ Batch revalidates")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("BATCH ENDPOINT TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_batch_matches_individual_endpoints,
+        test_batch_reads_one_snapshot,
+        test_batch_errors,
+        test_batch_revalidates,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
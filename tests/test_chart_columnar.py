@@ -0,0 +1,120 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from services.metrics_service import ALERT_LEVELS, RAINFALL_LEVELS
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherCache
+
+
+def make_readings():
+    readings = []
+    for station_id in ('St1', 'St2'):
+        for hour in range(24):
+            readings.append({
+                'StationID': station_id,
+                'DateTime': f'2025-01-02 {hour:02d}:30:00',
+                'HourlyRain': float(hour % 12),
+                'WaterLevel': 100.0 + hour * 40,
+            })
+    return readings
+
+
+def make_client():
+    app = create_app('testing')
+    app.weather_service._cache = WeatherCache(ttl_seconds=3600)
+    app.weather_service._cache.set(WeatherSnapshot(make_readings(), version=1))
+    return app.test_client()
+
+
+def test_columnar_matches_objects():
+    client = make_client()
+
+    for path, level_field, levels in (
+        ('/api/precipitation-data', 'intensity', RAINFALL_LEVELS),
+        ('/api/water-level-data', 'alert_level', ALERT_LEVELS),
+    ):
+        objects = client.get(f'{path}?date=2025-01-02').get_json()
+        columnar = client.get(f'{path}?date=2025-01-02&format=columnar').get_json()
+
+        assert columnar['format'] == 'columnar'
+        assert columnar['level_field'] == level_field
+        assert columnar['levels'] == list(levels)
+        assert columnar['step_seconds'] == 3600
+        assert set(columnar['stations']) == set(objects['stations'])
+        for station_id, station in objects['stations'].items():
+            encoded = columnar['stations'][station_id]
+            assert encoded['name'] == station['name']
+            assert len(encoded['y']) == len(encoded['level']) == columnar['points']
+            assert encoded['y'] == [point['y'] for point in station['data']]
+            assert [levels[code] for code in encoded['level']] == [point[level_field] for point in station['data']]
+    print("✓ Columnar payload matches object payload")
+
+
+def test_columnar_statistics():
+    client = make_client()
+
+    objects = client.get('/api/water-level-data?date=2025-01-02&station_id=St1').get_json()
+    columnar = client.get('/api/water-level-data?date=2025-01-02&station_id=St1&format=columnar').get_json()
+
+    assert list(columnar['stations']) == ['St1']
+    assert columnar['stations']['St1']['statistics'] == objects['stations']['St1']['statistics']
+    print("✓ Columnar water level keeps statistics")
+
+
+def test_columnar_is_smaller():
+    client = make_client()
+
+    for path in ('/api/precipitation-data', '/api/water-level-data'):
+        objects = client.get(f'{path}?date=2025-01-02')
+        columnar = client.get(f'{path}?date=2025-01-02&format=columnar')
+        assert len(columnar.data) * 4 < len(objects.data)
+    print("✓ Columnar payload is smaller")
+
+
+def test_invalid_format():
+    client = make_client()
+
+    assert client.get('/api/precipitation-data?format=xml').status_code == 400
+    assert client.get('/api/water-level-data?format=csv').status_code == 400
+    assert client.get('/api/precipitation-data?format=objects').status_code == 200
+    print("✓ Invalid format rejected")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("COLUMNAR CHART FORMAT TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_columnar_matches_objects,
+        test_columnar_statistics,
+        test_columnar_is_smaller,
+        test_invalid_format,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
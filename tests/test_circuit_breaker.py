@@ -0,0 +1,198 @@
+import sys
+import os
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherService, WeatherCache
+from utils.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_readings(count=3):
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return [
+        {'StationID': 'St4', 'DateTime': timestamp, 'WaterLevel': 650.0 + i, 'HourlyRain': 0.0}
+        for i in range(count)
+    ]
+
+
+def make_service(fetch_results, clock, ttl_seconds=0, force_refresh_interval=30):
+    """A service with a breaker on clock whose API calls return fetch_results in order."""
+    breaker = CircuitBreaker(failure_threshold=3, base_delay=10, max_delay=40, clock=clock, rng=lambda: 1.0)
+    service = WeatherService(api_url='http://upstream.invalid', timeout=1,
+                             circuit_breaker=breaker, force_refresh_interval=force_refresh_interval)
+    service._cache = WeatherCache(ttl_seconds=ttl_seconds)
+    service.api_calls = 0
+    results = list(fetch_results)
+
+    def fake_fetch():
+        service.api_calls += 1
+        return results.pop(0) if results else None
+
+    service._fetch_from_api = fake_fetch
+    return service
+
+
+def test_breaker_opens_and_allows_a_single_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, base_delay=10, max_delay=40, clock=clock, rng=lambda: 1.0)
+
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == 10
+
+    clock.now += 10
+    assert breaker.would_allow()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow(), "only one trial while half-open"
+
+    # A failed trial reopens with the delay doubled, capped at max_delay
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.retry_after() == 20
+    for expected in (40, 40):
+        clock.now += breaker.retry_after()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.retry_after() == expected
+
+    clock.now += breaker.retry_after()
+    assert breaker.allow()
+    breaker.record_success()
+    stats = breaker.get_stats()
+    assert stats['state'] == CLOSED and stats['consecutive_failures'] == 0
+    assert stats['trips'] == 4 and stats['rejected'] == 2
+    print("✓ Breaker opens after the threshold and lets one trial through")
+
+
+def test_backoff_is_jittered_within_half_to_full_delay():
+    clock = FakeClock()
+    delays = set()
+    for draw in (0.0, 0.25, 0.999):
+        breaker = CircuitBreaker(failure_threshold=1, base_delay=10, clock=clock, rng=lambda draw=draw: draw)
+        breaker.record_failure()
+        delays.add(breaker.retry_after())
+
+    assert all(5 <= delay <= 10 for delay in delays)
+    assert len(delays) == 3
+    print("✓ Backoff delays are jittered between half and the full delay")
+
+
+def test_open_circuit_serves_stale_data_without_calling_upstream():
+    clock = FakeClock()
+    service = make_service([make_readings(), None, None, None], clock)
+    assert len(service.fetch_weather_data()) == 3
+    for _ in range(3):
+        service.refresh()
+    assert service.breaker.state == OPEN
+    calls = service.api_calls
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        assert len(service.fetch_weather_data()) == 3
+        assert len(service.fetch_weather_data(force_refresh=True)) == 3
+    elapsed = time.perf_counter() - started
+
+    assert service.api_calls == calls
+    assert not service.refresh_due(ahead_seconds=10)
+    assert elapsed < 0.5, f"fail-fast path took {elapsed / 2000 * 1e6:.0f}µs per call"
+
+    clock.now += service.breaker.retry_after()
+    service._fetch_from_api = lambda: make_readings(5)
+    assert len(service.fetch_weather_data()) == 5
+    assert service.breaker.state == CLOSED
+    print("✓ Open circuit serves stale data without calling upstream")
+
+
+def test_force_refresh_is_rate_limited_globally():
+    clock = FakeClock()
+    service = make_service([make_readings(n) for n in range(3, 10)], clock,
+                           ttl_seconds=60, force_refresh_interval=30)
+    service.fetch_weather_data()
+    assert service.api_calls == 1
+
+    for _ in range(20):
+        service.fetch_weather_data(force_refresh=True)
+    assert service.api_calls == 2, "only the first forced refresh reaches upstream"
+
+    service._last_forced -= 30
+    service.fetch_weather_data(force_refresh=True)
+    assert service.api_calls == 3
+
+    stats = service.get_cache_status()['force_refresh']
+    assert stats['honoured'] == 2 and stats['limited'] == 19
+    print("✓ force_refresh is rate-limited across callers")
+
+
+def test_unavailable_response_carries_retry_after():
+    app = create_app('testing')
+    service = app.weather_service
+    service._cache = WeatherCache(ttl_seconds=60)
+    service._fetch_from_api = lambda: None
+    client = app.test_client()
+
+    for _ in range(service.breaker.failure_threshold):
+        assert client.get('/api/weather-data').status_code == 503
+    response = client.get('/api/weather-data')
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+
+    service._cache.set(WeatherSnapshot(make_readings(), version=1))
+    readiness = client.get('/api/health/ready').get_json()
+    assert readiness['fetcher']['circuit'] == OPEN
+    assert client.get('/api/health').get_json()['cache']['circuit']['state'] == OPEN
+    print("✓ Unavailable response carries Retry-After while the circuit is open")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("CIRCUIT BREAKER TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_breaker_opens_and_allows_a_single_trial,
+        test_backoff_is_jittered_within_half_to_full_delay,
+        test_open_circuit_serves_stale_data_without_calling_upstream,
+        test_force_refresh_is_rate_limited_globally,
+        test_unavailable_response_carries_retry_after,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
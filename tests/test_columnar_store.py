@@ -0,0 +1,94 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from services.columnar_store import ColumnarStore
+from services.snapshot import WeatherSnapshot, get_columns
+from utils.timestamps import datetime_to_epoch
+from datetime import datetime
+
+
+def sample_readings():
+    return [
+        {'StationID': 'St2', 'DateTime': '2025-01-01 10:05:00', 'WaterLevel': 5.0, 'HourlyRain': None},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 10:10:00', 'WaterLevel': 3.0, 'HourlyRain': 1.5},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 09:00:00', 'WaterLevel': 2.0, 'HourlyRain': 0.5},
+        {'StationID': 'St1', 'DateTime': 'not a timestamp', 'WaterLevel': 9.0},
+        {'DateTime': '2025-01-01 09:00:00', 'WaterLevel': 1.0},
+    ]
+
+
+def test_partitions_by_station_sorted_by_time():
+    store = ColumnarStore.from_readings(sample_readings())
+
+    assert store.station_ids == ['St1', 'St2']
+    assert len(store) == 3
+    st1 = store.station('St1')
+    assert list(st1.rows) == [2, 1]
+    assert list(st1.field('WaterLevel')) == [2.0, 3.0]
+    assert st1.epoch[0] == datetime_to_epoch(datetime(2025, 1, 1, 9, 0, 0))
+    assert np.isnan(store.station('St2').field('HourlyRain')[0])
+    print("✓ Partitions by station sorted by time")
+
+
+def test_slice_between_and_latest_rows():
+    store = ColumnarStore.from_readings(sample_readings())
+    st1 = store.station('St1')
+    window = st1.slice_between(
+        datetime_to_epoch(datetime(2025, 1, 1, 10)),
+        datetime_to_epoch(datetime(2025, 1, 1, 11))
+    )
+
+    assert list(st1.rows[window]) == [1]
+    assert store.latest_rows() == {'St1': 1, 'St2': 0}
+    print("✓ Slice between and latest rows")
+
+
+def test_snapshot_is_a_list_with_columns():
+    readings = sample_readings()
+    snapshot = WeatherSnapshot(readings, version=3)
+
+    assert snapshot == readings
+    assert snapshot.version == 3
+    assert get_columns(snapshot) is snapshot.columns
+    assert len(get_columns(readings)) == 3
+    print("✓ Snapshot is a list with columns")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("COLUMNAR STORE TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_partitions_by_station_sorted_by_time,
+        test_slice_between_and_latest_rows,
+        test_snapshot_is_a_list_with_columns,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,103 @@
+import sys
+import os
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.metrics_service import MetricsService
+from services.water_level_service import WaterLevelService
+from services.snapshot import WeatherSnapshot
+from config import SiteConfig
+
+
+def make_readings():
+    readings = []
+    for day in (1, 2, 3):
+        for hour in range(0, 24, 3):
+            for station_id in ('St1', 'St2'):
+                readings.append({
+                    'StationID': station_id,
+                    'DateTime': f'2025-01-0{day} {hour:02d}:15:00',
+                    'WaterLevel': float(hour % 7)
+                })
+    return readings
+
+
+def test_rollups_match_on_demand_aggregation():
+    service = WaterLevelService(MetricsService(SiteConfig.SITES))
+    readings = make_readings()
+    snapshot = WeatherSnapshot(readings, version=1)
+
+    service.materialize_rollups(snapshot)
+    for day in (1, 2, 3, 9):
+        target = datetime(2025, 1, day)
+        materialized = service.get_24hour_intervals_per_station(snapshot, SiteConfig.SITES, target)
+        on_demand = service.get_24hour_intervals_per_station(readings, SiteConfig.SITES, target)
+        assert materialized == on_demand
+        for points in materialized.values():
+            assert service.get_summary_statistics(points) == service.get_summary_statistics(list(points))
+    print("✓ Rollups match on-demand aggregation")
+
+
+def test_only_touched_days_are_recomputed():
+    service = WaterLevelService(MetricsService(SiteConfig.SITES))
+    readings = make_readings()
+
+    assert len(service._rollups.materialize(WeatherSnapshot(readings, version=1))) == 3
+
+    readings.append({'StationID': 'St1', 'DateTime': '2025-01-02 05:00:00', 'WaterLevel': 9.0})
+    assert service._rollups.materialize(WeatherSnapshot(readings, version=2)) == [date(2025, 1, 2)]
+    assert service._rollups.materialize(WeatherSnapshot(readings, version=2)) == []
+    print("✓ Only touched days are recomputed")
+
+
+def test_bogus_timestamps_do_not_size_the_rollups():
+    service = WaterLevelService(MetricsService(SiteConfig.SITES), rollup_days=2)
+    readings = make_readings() + [
+        {'StationID': 'St1', 'DateTime': '1970-01-02 00:00:00', 'WaterLevel': 1.0},
+        {'StationID': 'St2', 'DateTime': '2999-01-01 00:00:00', 'WaterLevel': 1.0},
+    ]
+    snapshot = WeatherSnapshot(readings, version=1)
+
+    assert service._rollups.materialize(snapshot) == [date(2025, 1, 2), date(2025, 1, 3)]
+    # Days outside the materialized span are still served, aggregated on demand
+    target = datetime(2025, 1, 1)
+    assert service.get_24hour_intervals_per_station(snapshot, SiteConfig.SITES, target) == \
+        service.get_24hour_intervals_per_station(readings, SiteConfig.SITES, target)
+    print("✓ Bogus timestamps do not size the rollups")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("DAILY ROLLUP TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_rollups_match_on_demand_aggregation,
+        test_only_touched_days_are_recomputed,
+        test_bogus_timestamps_do_not_size_the_rollups,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,184 @@
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app, event_subscriber_limit
+from config import TestingConfig, config
+from services.live_updates import LiveUpdates
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherService
+from utils.event_hub import HEARTBEAT, EventHub, format_event_id
+
+
+def parse(event):
+    fields = dict(line.split(': ', 1) for line in event.encoded.decode().strip().split('\n'))
+    return fields['event'], json.loads(fields['data'])
+
+
+def test_publish_fans_out_to_every_subscriber():
+    hub = EventHub()
+    first, second = hub.subscribe(), hub.subscribe()
+
+    hub.publish('readings', {'version': 1})
+
+    for subscription in (first, second):
+        event = subscription.get(timeout=0)
+        assert event.id == 1
+        assert parse(event) == ('readings', {'version': 1})
+        assert subscription.get(timeout=0) is None
+    assert hub.get_stats()['subscribers'] == 2
+    print("✓ Publish fans out to every subscriber")
+
+
+def test_slow_subscriber_is_told_to_resync():
+    hub = EventHub(max_queue=2)
+    slow = hub.subscribe()
+    for version in range(5):
+        hub.publish('readings', {'version': version})
+
+    event = slow.get(timeout=0)
+    assert parse(event) == ('resync', {'last_event_id': f'{hub.boot}-5'})
+    assert event.id == 5
+    assert slow.get(timeout=0) is None
+    assert hub.get_stats()['overflows'] == 1
+    print("✓ Slow subscriber is told to resync")
+
+
+def test_last_event_id_resumes_or_resyncs():
+    hub = EventHub(history=3)
+    for version in range(5):
+        hub.publish('readings', {'version': version})
+
+    resumed = hub.subscribe(last_event_id=format_event_id(hub.boot, 3))
+    assert [resumed.get(timeout=0).id for _ in range(2)] == [4, 5]
+
+    too_old = hub.subscribe(last_event_id=format_event_id(hub.boot, 1))
+    assert parse(too_old.get(timeout=0))[0] == 'resync'
+
+    # IDs from another worker or an earlier run resync even when their number is current or resumable
+    other = EventHub(history=3)
+    for last_event_id in (format_event_id(other.boot, 5), format_event_id(other.boot, 3), '5', '99'):
+        foreign = hub.subscribe(last_event_id=last_event_id)
+        assert parse(foreign.get(timeout=0)) == ('resync', {'last_event_id': f'{hub.boot}-5'})
+        assert foreign.get(timeout=0) is None
+    print("✓ Last-Event-ID resumes or resyncs")
+
+
+def test_stream_sends_heartbeats_and_unsubscribes():
+    hub = EventHub(heartbeat_seconds=0.01, max_subscribers=1)
+    subscription = hub.subscribe()
+    assert hub.subscribe() is None
+
+    stream = hub.stream(subscription)
+    assert next(stream).startswith(b'retry:')
+    assert next(stream) == HEARTBEAT
+    hub.publish('alert', {})
+    assert next(stream).startswith(f'id: {hub.boot}-1\nevent: alert'.encode())
+    stream.close()
+
+    assert hub.get_stats()['subscribers'] == 0
+    print("✓ Stream sends heartbeats and unsubscribes")
+
+
+def test_live_updates_publish_deltas_and_alert_changes():
+    service = WeatherService(api_url='http://upstream.invalid', timeout=1)
+    hub = EventHub()
+    live = LiveUpdates(hub, service)
+    subscription = hub.subscribe()
+
+    first = [{'StationID': 'St1', 'DateTime': '2025-01-01 09:00:00', 'WaterLevel': 100.0}]
+    second = first + [{'StationID': 'St1', 'DateTime': '2025-01-01 10:00:00', 'WaterLevel': 120.0}]
+    snapshots = [WeatherSnapshot(readings, version=version)
+                 for version, readings in ((1, first), (2, second), (3, list(second)))]
+    for snapshot in snapshots:
+        service.changelog.record(snapshot)
+        live.on_snapshot(snapshot)
+
+    events = []
+    while (event := subscription.get(timeout=0)) is not None:
+        events.append(parse(event))
+
+    assert [event_type for event_type, _ in events] == ['readings', 'alert', 'readings']
+    assert events[0][1]['full'] is True
+    assert events[2][1]['since_version'] == f'1-{snapshots[0].digest}'
+    assert events[2][1]['version'] == f'2-{snapshots[1].digest}'
+    assert events[2][1]['data'] == [second[1]]
+    assert events[1][1]['stations']['St1']['water_level'] == 100.0
+    print("✓ Live updates publish deltas and alert changes")
+
+
+def test_events_endpoint_streams():
+    app = create_app('testing')
+    app.live_updates.hub.heartbeat_seconds = 0.01
+    client = app.test_client()
+
+    response = client.get('/api/events', headers={'Last-Event-ID': 'bogus'}, buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b'retry:')
+    assert b'event: resync' in next(chunks)
+    assert next(chunks) == HEARTBEAT
+    response.close()
+    print("✓ Events endpoint streams")
+
+
+def test_stream_limit_follows_server_threads():
+    limits = {'EVENT_MAX_SUBSCRIBERS': 1000, 'EVENT_THREAD_SHARE': 0.5}
+    assert event_subscriber_limit(dict(limits, SERVER_THREADS=0)) == 1000
+    assert event_subscriber_limit(dict(limits, SERVER_THREADS=16)) == 8
+    assert event_subscriber_limit(dict(limits, SERVER_THREADS=1)) == 0
+
+    # A sync worker: streams would pin its only thread, so clients are told to poll
+    config['sync_worker'] = type('SyncWorkerConfig', (TestingConfig,), {'SERVER_THREADS': 1})
+    try:
+        app = create_app('sync_worker')
+    finally:
+        config.pop('sync_worker')
+    response = app.test_client().get('/api/events')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(app.config['EVENT_REJECT_RETRY_SECONDS'])
+    assert app.live_updates.hub.get_stats()['rejected'] == 1
+    print("✓ Stream limit follows the server's thread count")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("EVENT HUB TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_publish_fans_out_to_every_subscriber,
+        test_slow_subscriber_is_told_to_resync,
+        test_last_event_id_resumes_or_resyncs,
+        test_stream_sends_heartbeats_and_unsubscribes,
+        test_live_updates_publish_deltas_and_alert_changes,
+        test_events_endpoint_streams,
+        test_stream_limit_follows_server_threads,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
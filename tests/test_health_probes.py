@@ -0,0 +1,136 @@
+import sys
+import os
+from datetime import datetime, timedelta
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherCache
+from utils.rolling_stats import RollingLatency
+
+
+def make_app(with_data=True):
+    app = create_app('testing')
+    service = app.weather_service
+    service._cache = WeatherCache(ttl_seconds=60)
+    if with_data:
+        service._cache.set(WeatherSnapshot(
+            [{'StationID': 'St1', 'DateTime': '2025-01-02 09:15:00', 'WaterLevel': 120.0}], version=1
+        ))
+    calls = []
+
+    def unreachable(*args, **kwargs):
+        calls.append(1)
+        raise requests.exceptions.ConnectionError('upstream unreachable')
+
+    service.client.fetch_rows = unreachable
+    return app, calls
+
+
+def test_probes_never_fetch():
+    app, calls = make_app()
+    client = app.test_client()
+    app.weather_service._cache._last_fetch = datetime.now() - timedelta(seconds=120)
+
+    for url in ('/api/health', '/api/health/live', '/api/health/ready'):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'no-store'
+
+    assert calls == []
+    print("✓ Probes never fetch")
+
+
+def test_readiness_follows_snapshot_age():
+    app, _ = make_app(with_data=False)
+    client = app.test_client()
+
+    response = client.get('/api/health/ready')
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'not_ready'
+    assert client.get('/api/health').status_code == 503
+    assert client.get('/api/health/live').status_code == 200
+
+    app, _ = make_app()
+    client = app.test_client()
+    assert client.get('/api/health/ready').status_code == 200
+
+    max_age = app.config['HEALTH_MAX_SNAPSHOT_AGE']
+    app.weather_service._cache._last_fetch = datetime.now() - timedelta(seconds=max_age + 1)
+    assert client.get('/api/health/ready').status_code == 503
+    print("✓ Readiness follows snapshot age")
+
+
+def test_fetch_failures_reported():
+    app, _ = make_app()
+    service = app.weather_service
+    for _ in range(3):
+        service.refresh()
+
+    payload = app.test_client().get('/api/health/ready').get_json()
+
+    assert payload['ready'] is True
+    assert payload['fetcher']['error_streak'] == 3
+    assert payload['fetcher']['in_backoff'] is True
+    assert payload['fetcher']['backoff_remaining_seconds'] > 0
+    assert payload['upstream']['attempts'] == 3
+    assert payload['upstream']['success_rate'] == 0.0
+    assert app.test_client().get('/api/health').get_json()['status'] == 'degraded'
+    print("✓ Fetch failures reported")
+
+
+def test_rolling_latency():
+    latency = RollingLatency(window=4)
+    for seconds, ok in ((0.1, True), (0.2, True), (0.3, False), (0.4, True), (0.5, True)):
+        latency.record(seconds, ok)
+
+    stats = latency.get_stats()
+
+    assert stats['attempts'] == 5
+    assert stats['failures'] == 1
+    assert stats['window'] == 4
+    assert stats['success_rate'] == 0.75
+    assert stats['p50_ms'] == 300.0
+    assert stats['p95_ms'] == stats['max_ms'] == 500.0
+    assert latency.last == (0.5, True)
+    print("✓ Rolling latency")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("HEALTH PROBE TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_probes_never_fetch,
+        test_readiness_follows_snapshot_age,
+        test_fetch_failures_reported,
+        test_rolling_latency,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,229 @@
+import sys
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import TestingConfig, config
+from services import history_chunks, history_store
+from services.history_chunks import HEADER_SIZE, QUANTIZED, XOR, decode_chunk, encode_chunk, read_header
+from services.history_store import HistoryStore
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherService, WeatherCache
+from utils.timestamps import datetime_to_epoch
+
+
+def make_day(count=1440, seed=0):
+    rng = np.random.default_rng(seed)
+    epoch = 1_735_689_600 + np.arange(count, dtype=np.int64) * 60
+    epoch[100:] += 7  # one late reading shifts the rest
+    fields = {
+        'WaterLevel': np.round(2 + np.cumsum(rng.normal(0, 0.01, count)), 2),
+        'HourlyRain': np.where(rng.random(count) < 0.9, 0.0, np.round(rng.random(count) * 5, 1)),
+        'Temperature': np.round(28 + rng.normal(0, 0.3, count), 1),
+        'Pressure': rng.normal(1000, 1, count),
+    }
+    fields['WaterLevel'][[3, 50, 51]] = np.nan
+    return epoch, fields
+
+
+def block_encodings(data):
+    """Encoding byte of every field block, in NUMERIC_FIELDS order."""
+    offset = HEADER_SIZE
+    length = int.from_bytes(data[offset:offset + 4], 'little')
+    offset += 4 + length
+    encodings = []
+    for _ in history_chunks.NUMERIC_FIELDS:
+        encoding, _, _, mask_length, payload_length = history_chunks.BLOCK.unpack_from(data, offset)
+        encodings.append(encoding)
+        offset += history_chunks.BLOCK.size + mask_length + payload_length
+    return dict(zip(history_chunks.NUMERIC_FIELDS, encodings))
+
+
+def test_chunk_round_trip_is_exact():
+    epoch, fields = make_day()
+    data = encode_chunk(epoch, fields)
+    chunk = decode_chunk(data)
+
+    assert np.array_equal(chunk.epoch, epoch)
+    for name, values in fields.items():
+        assert np.array_equal(chunk.fields[name], values, equal_nan=True), name
+    assert np.isnan(chunk.fields['Humidity']).all()
+    encodings = block_encodings(data)
+    assert encodings['WaterLevel'] == QUANTIZED and encodings['Temperature'] == QUANTIZED
+    assert encodings['Pressure'] == XOR
+
+    assert set(decode_chunk(data, ['HourlyRain']).fields) == {'HourlyRain'}
+    empty = decode_chunk(encode_chunk(np.empty(0, dtype=np.int64), {}))
+    assert len(empty.epoch) == 0 and len(empty.fields['WaterLevel']) == 0
+    print("✓ Chunks decode to exactly the encoded arrays")
+
+
+def test_header_holds_field_stats():
+    epoch, fields = make_day()
+    data = encode_chunk(epoch, fields)
+    header = read_header(data[:HEADER_SIZE])
+
+    assert (header.first_epoch, header.last_epoch, header.count) == (epoch[0], epoch[-1], len(epoch))
+    level = fields['WaterLevel'][~np.isnan(fields['WaterLevel'])]
+    stats = header.stats['WaterLevel']
+    assert stats.count == len(level) == len(epoch) - 3
+    assert (stats.min, stats.max) == (level.min(), level.max())
+    assert np.isclose(stats.sum, level.sum())
+    assert header.stats['Humidity'].count == 0
+    # Regular 1-minute readings with 2 decimals compress well below their raw float64 size
+    assert len(data) < epoch.nbytes * 2
+    print("✓ Chunk headers carry min/max/sum/count per field")
+
+
+def test_compaction_keeps_readings_and_daily_stats():
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'))
+        start = datetime(2025, 3, 1)
+        readings = [
+            {
+                'StationID': station_id,
+                'DateTime': (start + timedelta(minutes=30 * i)).strftime('%Y-%m-%d %H:%M:%S'),
+                'HourlyRain': float(i % 7) if i % 11 else None,
+                'WaterLevel': round(1 + i / 100, 2),
+            }
+            for station_id in ('St1', 'St2')
+            for i in range(48 * 4)
+        ]
+        store.ingest(WeatherSnapshot(readings))
+        window = (datetime_to_epoch(start), datetime_to_epoch(start + timedelta(days=4)))
+        before = store.columns_between(*window)
+        stats_before = store.daily_stats('HourlyRain', *window)
+
+        assert store.compact(datetime_to_epoch(start + timedelta(days=3, hours=5))) == 6
+        assert store.count() == len(readings)
+        after = store.columns_between(*window)
+        assert np.array_equal(after.epoch, before.epoch)
+        for name in ('HourlyRain', 'WaterLevel'):
+            assert np.array_equal(after.fields[name], before.fields[name], equal_nan=True)
+        assert store.daily_stats('HourlyRain', *window).keys() == stats_before.keys()
+        for station_id, days in store.daily_stats('HourlyRain', *window).items():
+            for day, stats in days.items():
+                expected = stats_before[station_id][day]
+                assert (stats.count, stats.min, stats.max) == (expected.count, expected.min, expected.max)
+                assert np.isclose(stats.sum, expected.sum)
+
+        # A late reading for a compacted day is read back over the chunk, and folded in on the next compaction
+        late = int(datetime_to_epoch(start + timedelta(hours=1)))
+        store.upsert([('St1', late, 9.99, 6.5, *[None] * 6)])
+        day = store.columns_between(late, late + 1, ['St1'])
+        assert day.fields['WaterLevel'].tolist() == [9.99]
+        assert store.compact(datetime_to_epoch(start + timedelta(days=1))) == 1
+        assert store.columns_between(late, late + 1, ['St1']).fields['HourlyRain'].tolist() == [6.5]
+        assert store.count() == len(readings)
+    print("✓ Compacted days read back unchanged, stats come from chunk headers")
+
+
+def test_compaction_holds_the_write_lock_while_reading():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'history.db')
+        store = HistoryStore(path)
+        other = HistoryStore(path, busy_timeout=0)
+        epoch = int(datetime_to_epoch(datetime(2025, 3, 1)))
+        store.upsert([('St1', epoch + 60 * i, float(i), *[None] * 7) for i in range(10)])
+
+        # Another process's upsert between compaction's read and its DELETE would be lost
+        blocked = []
+        to_columns = history_store._rows_to_columns
+
+        def upsert_midway(rows):
+            try:
+                other.upsert([('St1', epoch + 3600, 99.0, *[None] * 7)])
+            except sqlite3.OperationalError:
+                blocked.append(True)
+            return to_columns(rows)
+
+        history_store._rows_to_columns = upsert_midway
+        try:
+            assert store.compact(epoch + 86400) == 1
+        finally:
+            history_store._rows_to_columns = to_columns
+        assert blocked == [True]
+        assert store.count() == 10
+    print("✓ Compaction reads a day's rows inside its write transaction")
+
+
+def test_daily_stats_endpoint():
+    with tempfile.TemporaryDirectory() as directory:
+        config['history'] = type('HistoryConfig', (TestingConfig,), {
+            'HISTORY_DB_PATH': os.path.join(directory, 'history.db')
+        })
+        cache = WeatherService._cache
+        try:
+            WeatherService._cache = WeatherCache(ttl_seconds=60)
+            app = create_app('history')
+            client = app.test_client()
+            start = datetime(2025, 3, 1)
+            app.history_store.ingest(WeatherSnapshot([
+                {
+                    'StationID': 'St1',
+                    'DateTime': (start + timedelta(hours=i)).strftime('%Y-%m-%d %H:%M:%S'),
+                    'HourlyRain': float(i % 3),
+                }
+                for i in range(72)
+            ]))
+            app.history_store.compact(datetime_to_epoch(start + timedelta(days=2)))
+
+            payload = client.get('/api/history/daily-stats?field=HourlyRain&start=2025-03-01&end=2025-03-03').get_json()
+            station = payload['stations']['St1']
+            assert station['days'] == ['2025-03-01', '2025-03-02', '2025-03-03']
+            assert station['count'] == [24, 24, 24]
+            assert station['sum'] == [24.0, 24.0, 24.0] and station['max'] == [2.0, 2.0, 2.0]
+
+            assert client.get('/api/history/daily-stats?field=Nope&start=2025-03-01&end=2025-03-03').status_code == 400
+            assert client.get('/api/history/daily-stats?field=HourlyRain&start=2025-03-03&end=2025-03-01').status_code == 400
+        finally:
+            WeatherService._cache = cache
+            config.pop('history')
+    assert create_app('testing').test_client().get(
+        '/api/history/daily-stats?field=HourlyRain&start=2025-03-01&end=2025-03-03'
+    ).status_code == 404
+    print("✓ Daily stats endpoint reports per-day aggregates")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("HISTORY CHUNK TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_chunk_round_trip_is_exact,
+        test_header_holds_field_stats,
+        test_compaction_keeps_readings_and_daily_stats,
+        test_compaction_holds_the_write_lock_while_reading,
+        test_daily_stats_endpoint,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,204 @@
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import TestingConfig, config
+from services.history_store import HistoryStore
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherService, WeatherCache
+from utils.timestamps import datetime_to_epoch
+
+
+def make_readings(start, hours, stations=('St1', 'St2')):
+    """Hourly readings whose values depend only on their hour of day, so overlapping snapshots agree."""
+    times = [start + timedelta(hours=hour) for hour in range(hours)]
+    return [
+        {
+            'StationID': station_id,
+            'DateTime': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'HourlyRain': float(time.hour % 5),
+            'WaterLevel': 1.0 + time.hour / 10,
+        }
+        for station_id in stations
+        for time in times
+    ]
+
+
+def test_ingest_only_writes_new_or_changed_readings():
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'), batch_size=7)
+        start = datetime(2025, 3, 1)
+
+        assert store.ingest(WeatherSnapshot(make_readings(start, 24), version=1)) == 48
+        # The next snapshot overlaps the first: only the 6 newer hours per station are written
+        assert store.ingest(WeatherSnapshot(make_readings(start + timedelta(hours=12), 18), version=2)) == 12
+        assert store.count() == 60
+
+        epoch = int(datetime_to_epoch(start))
+        store.upsert([('St1', epoch, 999.0, *[None] * 7)])
+        assert store.count() == 60
+        columns = store.columns_between(epoch, epoch + 3600, ['St1'])
+        assert columns.station('St1').field('WaterLevel').tolist() == [999.0]
+
+        # A fresh process diffs its first snapshot against the stored window: only the
+        # reading that differs from the snapshot is written back
+        reopened = HistoryStore(store.path)
+        assert reopened.station_ids() == ['St1', 'St2']
+        assert reopened.ingest(WeatherSnapshot(make_readings(start, 30), version=3)) == 1
+        assert reopened.columns_between(epoch, epoch + 3600, ['St1']).station('St1').field('WaterLevel').tolist() == [1.0]
+        assert reopened.time_range() == (epoch, epoch + 29 * 3600)
+    print("✓ Ingest writes only new or changed readings and upserts by (station, time)")
+
+
+def test_ingest_stores_corrections_and_late_readings():
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'))
+        epoch = int(datetime_to_epoch(datetime(2025, 3, 2, 10)))
+        first = [
+            {'StationID': 'S1', 'DateTime': '2025-03-02 10:00:00', 'WaterLevel': 20.0},
+            {'StationID': 'S1', 'DateTime': '2025-03-02 10:01:00', 'WaterLevel': 21.0},
+        ]
+        assert store.ingest(WeatherSnapshot(first, version=1)) == 2
+
+        second = [
+            {'StationID': 'S1', 'DateTime': '2025-03-02 09:59:00', 'WaterLevel': 19.0},
+            {'StationID': 'S1', 'DateTime': '2025-03-02 10:00:00', 'WaterLevel': 25.0},
+            {'StationID': 'S1', 'DateTime': '2025-03-02 10:01:00', 'WaterLevel': 21.0},
+        ]
+        assert store.ingest(WeatherSnapshot(second, version=2)) == 2
+        stored = store.columns_between(epoch - 60, epoch + 120, ['S1']).station('S1')
+        assert stored.epoch.tolist() == [epoch - 60, epoch, epoch + 60]
+        assert stored.field('WaterLevel').tolist() == [19.0, 25.0, 21.0]
+
+        # Once the day is compacted, a correction and a late reading for it are merged into its chunk
+        newer = {'StationID': 'S1', 'DateTime': '2025-03-03 00:00:00', 'WaterLevel': 30.0}
+        store.ingest(WeatherSnapshot([newer], version=3))
+        third = [
+            {'StationID': 'S1', 'DateTime': '2025-03-02 09:58:00', 'WaterLevel': 18.0},
+            {'StationID': 'S1', 'DateTime': '2025-03-02 10:01:00', 'WaterLevel': 22.0},
+            dict(newer),
+        ]
+        assert store.ingest(WeatherSnapshot(third, version=4)) == 2
+        assert store.count() == 5
+        stored = store.columns_between(epoch - 120, epoch + 120, ['S1']).station('S1')
+        assert stored.field('WaterLevel').tolist() == [18.0, 19.0, 25.0, 22.0]
+        stats = store.daily_stats('WaterLevel', epoch - 36000, epoch + 86400)['S1']
+        assert [(day.count, day.max) for day in stats.values()] == [(4, 25.0), (1, 30.0)]
+    print("✓ Corrected and late readings replace and join the stored history")
+
+
+def test_writer_is_opened_per_process():
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'))
+        assert store._connection is None
+        start = datetime(2025, 3, 1)
+        store.ingest(WeatherSnapshot(make_readings(start, 2), version=1))
+        parent = store._connection
+
+        # As seen from a forked child: the parent's connection is set aside, not reused
+        store._connection_pid = -1
+        store.ingest(WeatherSnapshot(make_readings(start, 3), version=2))
+        assert store._connection is not parent and store._inherited == [parent]
+        assert store.count() == 6
+    print("✓ Each process writes history through its own connection")
+
+
+def test_columns_between_matches_snapshot_columns():
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'))
+        start = datetime(2025, 3, 1)
+        readings = make_readings(start, 72, stations=('St2', 'St1', 'St3'))
+        readings[5]['WaterLevel'] = None
+        store.ingest(WeatherSnapshot(readings, version=1))
+
+        day = datetime_to_epoch(start + timedelta(days=1))
+        stored = store.columns_between(day, day + 86400, ['St3', 'St1'])
+        expected = WeatherSnapshot(
+            [r for r in readings if r['StationID'] in ('St1', 'St3') and r['DateTime'].startswith('2025-03-02')]
+        ).columns
+
+        assert stored.station_ids == expected.station_ids
+        assert np.array_equal(stored.epoch, expected.epoch)
+        assert np.array_equal(stored.fields['WaterLevel'], expected.fields['WaterLevel'], equal_nan=True)
+        assert np.isnan(store.columns_between(datetime_to_epoch(start), day, ['St2']).fields['WaterLevel'][5])
+    print("✓ History windows read back as the snapshot's columns")
+
+
+def test_chart_endpoints_read_history_outside_the_snapshot():
+    with tempfile.TemporaryDirectory() as directory:
+        config['history'] = type('HistoryConfig', (TestingConfig,), {
+            'HISTORY_DB_PATH': os.path.join(directory, 'history.db')
+        })
+        cache = WeatherService._cache
+        try:
+            WeatherService._cache = WeatherCache(ttl_seconds=60)
+            app = create_app('history')
+            service = app.weather_service
+            service._cache = WeatherService._cache
+            now = datetime.now().replace(minute=0, second=0, microsecond=0)
+            old_day = (now - timedelta(days=60)).replace(hour=0)
+            results = [make_readings(old_day, 24), make_readings(now - timedelta(hours=12), 12)]
+            service._fetch_from_api = lambda: results.pop(0)
+
+            service.refresh()
+            service.refresh()
+            assert service._cache.get_stale_data()[0]['DateTime'] >= (now - timedelta(hours=12)).strftime('%Y-%m-%d')
+
+            client = app.test_client()
+            date = old_day.strftime('%Y-%m-%d')
+            rain = client.get(f'/api/precipitation-data?date={date}').get_json()
+            assert [point['y'] for point in rain['stations']['St1']['data']] == [float(h % 5) for h in range(24)]
+            level = client.get(f'/api/water-level-data?date={date}&format=columnar').get_json()
+            assert level['stations']['St2']['y'][:3] == [1.0, 1.1, 1.2]
+
+            date_range = client.get('/api/water-level-date-range').get_json()
+            assert date_range['earliest_date'] == date
+            assert client.get('/api/cache-status').get_json()['history']['ingested'] == 72
+        finally:
+            WeatherService._cache = cache
+            config.pop('history')
+    print("✓ Chart endpoints read days outside the snapshot from history")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("HISTORY STORE TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_ingest_only_writes_new_or_changed_readings,
+        test_ingest_stores_corrections_and_late_readings,
+        test_writer_is_opened_per_process,
+        test_columns_between_matches_snapshot_columns,
+        test_chart_endpoints_read_history_outside_the_snapshot,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
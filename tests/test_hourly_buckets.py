@@ -0,0 +1,86 @@
+import sys
+import os
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from services.columnar_store import ColumnarStore
+from services.hourly_buckets import aggregate_hourly
+from utils.timestamps import datetime_to_epoch
+
+
+def sample_store():
+    return ColumnarStore.from_readings([
+        {'StationID': 'St1', 'DateTime': '2025-01-01 00:10:00', 'WaterLevel': 2.0},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 00:50:00', 'WaterLevel': 4.0},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 23:59:59', 'WaterLevel': 1.0},
+        {'StationID': 'St1', 'DateTime': '2025-01-02 00:00:00', 'WaterLevel': 8.0},
+        {'StationID': 'St2', 'DateTime': '2025-01-01 05:30:00', 'WaterLevel': 20.0},
+        {'StationID': 'St2', 'DateTime': '2025-01-01 05:40:00', 'WaterLevel': 3.0},
+        {'StationID': 'St2', 'DateTime': '2025-01-01 06:00:00', 'WaterLevel': None},
+    ])
+
+
+def test_sums_counts_and_maxima_per_bucket():
+    buckets = aggregate_hourly(sample_store(), 'WaterLevel', datetime_to_epoch(datetime(2025, 1, 1)))
+    st1 = buckets.station_row('St1')
+    st2 = buckets.station_row('St2')
+
+    assert buckets.sum.shape == (2, 24)
+    assert buckets.count[st1, 0] == 2 and buckets.sum[st1, 0] == 6.0
+    assert buckets.max[st1, 0] == 4.0 and buckets.mean[st1, 0] == 3.0
+    assert buckets.count[st1, 23] == 1
+    assert buckets.count[st1].sum() == 3
+    assert buckets.max[st2, 5] == 20.0
+    assert buckets.count[st2, 6] == 0 and np.isnan(buckets.max[st2, 6])
+    assert buckets.station_row('St9') is None
+    print("✓ Sums, counts and maxima per bucket")
+
+
+def test_value_bounds_filter_readings():
+    buckets = aggregate_hourly(
+        sample_store(), 'WaterLevel', datetime_to_epoch(datetime(2025, 1, 1)),
+        min_value=0.0, max_value=15.0
+    )
+    st2 = buckets.station_row('St2')
+
+    assert buckets.count[st2, 5] == 1
+    assert buckets.max[st2, 5] == 3.0
+    print("✓ Value bounds filter readings")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("HOURLY BUCKET TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_sums_counts_and_maxima_per_bucket,
+        test_value_bounds_filter_readings,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,97 @@
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.json_stream import iter_json_array
+
+
+def chunked(text, size):
+    body = text.encode('utf-8')
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def test_numbers_split_across_chunks():
+    text = '[1,-100000.0,2.5e-3,-1E+10,0,12345678901234567890]'
+    for size in range(1, len(text) + 1):
+        assert list(iter_json_array(chunked(text, size))) == json.loads(text), size
+    print("✓ Numbers split across chunks are read whole")
+
+
+def test_every_chunk_boundary():
+    text = ' [ {"StationID": "St1", "Note": "a, \\"b\\" ]", "Level": 1.25},\n\t{"StationID": "Süd", "Level": null}, [], true ] '
+    expected = json.loads(text)
+    for size in range(1, len(text.encode('utf-8')) + 1):
+        assert list(iter_json_array(chunked(text, size))) == expected, size
+    assert list(iter_json_array(chunked('[]', 1))) == []
+    print("✓ Arrays parse the same at every chunk boundary")
+
+
+def test_array_inside_object():
+    text = '{"success": true, "meta": {"data": 1, "rows": [1, 2]}, "data": [{"a": 1}, {"a": 2}], "count": 2}'
+    for size in (1, 7, len(text)):
+        assert list(iter_json_array(chunked(text, size))) == [{'a': 1}, {'a': 2}]
+    assert list(iter_json_array(chunked('{"rows": [3]}', 4), key='rows')) == [3]
+    print("✓ The array member of a wrapping object is streamed")
+
+
+def test_malformed_input_raises():
+    for text in ('', '42', '"data"', '[1, 2', '[1 2]', '[1,]', '[1.]', '{"data": 1}', '{"other": []}', '{"data"'):
+        for size in (1, 3, 64):
+            try:
+                list(iter_json_array(chunked(text, size)))
+            except ValueError:
+                continue
+            raise AssertionError(f"{text!r} in chunks of {size} was accepted")
+    print("✓ Malformed input raises ValueError")
+
+
+def test_object_members_need_separators():
+    for text in ('{"a": 1 "b": 2}', '{"a": 1 "data": [1]}', '{"a": [1] "data": []}'):
+        for size in (1, 3, 64):
+            try:
+                list(iter_json_array(chunked(text, size)))
+            except ValueError:
+                continue
+            raise AssertionError(f"{text!r} in chunks of {size} was accepted")
+    assert list(iter_json_array(chunked('{"a": 1, "data": [1]}', 3))) == [1]
+    print("✓ Object members without a separator raise ValueError")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("JSON STREAM TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_numbers_split_across_chunks,
+        test_every_chunk_boundary,
+        test_array_inside_object,
+        test_malformed_input_raises,
+        test_object_members_need_separators,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,150 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from services.reading_query import ReadingQuery, decode_cursor, encode_cursor, run_query
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherCache
+from utils.timestamps import to_epoch
+
+
+def sample_readings():
+    return [
+        {'StationID': 'St2', 'DateTime': '2025-01-01 10:00:00', 'WaterLevel': 5.0},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 10:00:00', 'WaterLevel': 3.0},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 09:00:00', 'WaterLevel': 2.0},
+        {'StationID': 'St3', 'DateTime': '2025-01-01 10:00:00', 'WaterLevel': 7.0},
+        {'StationID': 'St2', 'DateTime': '2025-01-01 08:00:00', 'WaterLevel': 4.0},
+        {'StationID': 'St3', 'DateTime': '2025-01-01 09:00:00', 'WaterLevel': 6.0},
+    ]
+
+
+def collect_pages(snapshot, **params):
+    pages, cursor = [], None
+    while True:
+        result = run_query(snapshot, ReadingQuery(cursor=cursor, **params))
+        pages.append(result.readings)
+        cursor = result.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_cursor_pages_cover_ties_once():
+    readings = sample_readings()
+    snapshot = WeatherSnapshot(readings)
+
+    pages = collect_pages(snapshot, limit=2)
+    flattened = [reading for page in pages for reading in page]
+
+    assert [len(page) for page in pages] == [2, 2, 2]
+    assert flattened == [readings[1], readings[0], readings[3], readings[2], readings[5], readings[4]]
+    assert decode_cursor(encode_cursor(1.5, 'St1', 2)) == (1.5, 'St1', 2)
+    print("✓ Cursor pages cover ties once")
+
+
+def test_cursor_resumes_within_a_station_tie():
+    # Two timestamps of St1 that parse to the same epoch
+    readings = sample_readings() + [
+        {'StationID': 'St1', 'DateTime': '2025-01-01T10:00:00', 'WaterLevel': 3.5},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 10:00:00.000', 'WaterLevel': 3.7},
+    ]
+    snapshot = WeatherSnapshot(readings)
+    everything = run_query(snapshot, ReadingQuery(limit=100)).readings
+
+    for params in ({}, {'station_id': 'St1'}):
+        for limit in (1, 2, 3):
+            expected = run_query(snapshot, ReadingQuery(limit=100, **params)).readings
+            flattened = [r for page in collect_pages(snapshot, limit=limit, **params) for r in page]
+            assert flattened == expected
+    assert len(everything) == len(readings)
+    print("✓ Cursor resumes within a station's same-time readings")
+
+
+def test_time_window_and_projection():
+    readings = sample_readings()
+    snapshot = WeatherSnapshot(readings)
+
+    result = run_query(snapshot, ReadingQuery(
+        fields=['StationID', 'WaterLevel'],
+        since=to_epoch('2025-01-01 09:00:00'),
+        until=to_epoch('2025-01-01 10:00:00')
+    ))
+    assert result.readings == [
+        {'StationID': 'St1', 'WaterLevel': 2.0},
+        {'StationID': 'St3', 'WaterLevel': 6.0},
+    ]
+    assert result.next_cursor is None
+
+    station = run_query(snapshot, ReadingQuery(station_id='St2', since=to_epoch('2025-01-01 08:30:00')))
+    assert station.readings == [readings[0]]
+    print("✓ Time window and projection")
+
+
+def test_latest_only():
+    readings = sample_readings()
+    snapshot = WeatherSnapshot(readings)
+
+    latest = run_query(snapshot, ReadingQuery(latest_only=True, fields=['StationID']))
+    assert latest.readings == [{'StationID': 'St1'}, {'StationID': 'St2'}, {'StationID': 'St3'}]
+
+    station = run_query(snapshot, ReadingQuery(station_id='St3', latest_only=True))
+    assert station.readings == [readings[3]]
+    print("✓ Latest only")
+
+
+def test_endpoint_validates_filters():
+    app = create_app('testing')
+    app.weather_service._cache = WeatherCache(ttl_seconds=3600)
+    app.weather_service._cache.set(WeatherSnapshot(sample_readings(), version=1))
+    client = app.test_client()
+
+    page = client.get('/api/weather-data?limit=4&fields=StationID').get_json()
+    assert page['count'] == 4
+    assert page['data'][0] == {'StationID': 'St1'}
+    rest = client.get(f"/api/weather-data?limit=4&cursor={page['next_cursor']}").get_json()
+    assert rest['count'] == 2 and rest['next_cursor'] is None
+
+    assert client.get('/api/weather-data?limit=0').status_code == 400
+    assert client.get('/api/weather-data?since=yesterday').status_code == 400
+    assert client.get('/api/weather-data?cursor=%%%').status_code == 400
+    print("✓ Endpoint validates filters")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("READING QUERY TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_cursor_pages_cover_ties_once,
+        test_cursor_resumes_within_a_station_tie,
+        test_time_window_and_projection,
+        test_latest_only,
+        test_endpoint_validates_filters,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
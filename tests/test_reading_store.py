@@ -0,0 +1,144 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.reading_store import ReadingStore
+from services.snapshot import WeatherSnapshot
+
+
+def reading(station_id, timestamp, water_level=650.0):
+    return {'StationID': station_id, 'DateTime': timestamp, 'WaterLevel': water_level}
+
+
+def sanitize_counting(sanitized):
+    """A sanitize step that records the rows it was given and converts like the service does."""
+    def sanitize(row):
+        sanitized.append(row['DateTime'])
+        row['WaterLevel'] = float(row['WaterLevel'])
+        return row
+    return sanitize
+
+
+def test_full_sync_only_sanitizes_unseen_rows():
+    store = ReadingStore()
+    sanitized = []
+    payload = [reading('St1', '2025-01-01 10:00:00'), reading('St2', '2025-01-01 10:00:00')]
+    store.ingest(payload, sanitize=sanitize_counting(sanitized))
+
+    sanitized.clear()
+    payload = [reading('St1', '2025-01-01 10:00:00'), reading('St2', '2025-01-01 10:00:00'),
+               reading('St1', '2025-01-01 10:01:00')]
+    result = store.ingest(payload, sanitize=sanitize_counting(sanitized))
+
+    assert sanitized == ['2025-01-01 10:01:00']
+    assert len(result.added) == 1 and result.replaced == 0
+    assert len(result.readings) == 3
+    assert result.scanned == 3
+    print("✓ Full sync only sanitizes unseen rows")
+
+
+def test_corrected_rows_replace_held_readings():
+    store = ReadingStore()
+    sanitized = []
+    first = store.ingest([reading('St1', '2025-01-01 10:00:00', '650'), reading('St2', '2025-01-01 10:00:00')],
+                         sanitize=sanitize_counting(sanitized))
+    held = first.readings[1]
+
+    sanitized.clear()
+    result = store.ingest([reading('St1', '2025-01-01 10:00:00', '651.5'), reading('St2', '2025-01-01 10:00:00')],
+                          sanitize=sanitize_counting(sanitized))
+    assert sanitized == ['2025-01-01 10:00:00']
+    assert result.replaced == 1 and result.added == [reading('St1', '2025-01-01 10:00:00', 651.5)]
+    assert [r['WaterLevel'] for r in result.readings] == [651.5, 650.0]
+    # The unchanged reading is the same dict as before
+    assert result.readings[1] is held
+    assert result.changed
+
+    # Corrections in an incremental batch replace in place, without duplicating the row
+    incremental = ReadingStore(retention_hours=24)
+    incremental.ingest([reading('St1', '2025-01-01 10:00:00')], complete=False)
+    result = incremental.ingest([reading('St1', '2025-01-01 10:00:00', 655.0)], complete=False)
+    assert result.replaced == 1 and result.readings == [reading('St1', '2025-01-01 10:00:00', 655.0)]
+    print("✓ Corrected rows replace held readings")
+
+
+def test_full_sync_evicts_rows_dropped_upstream():
+    store = ReadingStore()
+    old = reading('St1', '2025-01-01 10:00:00')
+    new = reading('St1', '2025-01-01 10:01:00')
+    store.ingest([old, new])
+
+    result = store.ingest([reading('St1', '2025-01-01 10:01:00')])
+
+    assert result.removed == 1
+    assert result.readings == [new]
+    assert not result.added
+    print("✓ Full sync evicts rows dropped upstream")
+
+
+def test_incremental_sync_tracks_high_water_marks():
+    store = ReadingStore(retention_hours=24)
+    store.ingest([reading('St1', '2025-01-01 10:00:00'), reading('St2', '2025-01-01 09:00:00')], complete=False)
+    result = store.ingest([reading('St1', '2025-01-01 10:00:00'), reading('St1', '2025-01-01 11:00:00')],
+                          complete=False)
+
+    assert len(result.added) == 1
+    assert store.high_water_mark() == '2025-01-01 09:00:00'
+    assert store.get_high_water_marks()['St1'] == '2025-01-01 11:00:00'
+
+    result = store.ingest([reading('St1', '2025-01-02 12:00:00')], complete=False)
+    assert result.removed == 3
+    assert len(store) == 1
+    print("✓ Incremental sync tracks high-water marks")
+
+
+def test_row_digests_give_the_snapshot_content_digest():
+    store = ReadingStore()
+    store.ingest([reading('St1', '2025-01-01 10:00:00'), reading('St2', '2025-01-01 10:00:00')])
+    result = store.ingest([reading('St1', '2025-01-01 10:00:00', 651.0), reading('St2', '2025-01-01 10:00:00'),
+                           reading('St1', '2025-01-01 10:01:00')])
+
+    folded = WeatherSnapshot(result.readings, row_digests=result.row_digests)
+    assert 'digest' in vars(folded)
+    assert folded.digest == WeatherSnapshot([dict(r) for r in result.readings]).digest
+    assert folded.digest != WeatherSnapshot(result.readings[1:]).digest
+    print("✓ Stored row digests fold into the snapshot's content digest")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("READING STORE TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_full_sync_only_sanitizes_unseen_rows,
+        test_corrected_rows_replace_held_readings,
+        test_full_sync_evicts_rows_dropped_upstream,
+        test_incremental_sync_tracks_high_water_marks,
+        test_row_digests_give_the_snapshot_content_digest,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,180 @@
+import sys
+import os
+import gzip
+import json
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherCache
+from utils.response_cache import CachedResponse, ResponseCache
+
+
+def make_app(readings, version=1):
+    app = create_app('testing')
+    app.weather_service._cache = WeatherCache(ttl_seconds=3600)
+    app.weather_service._cache.set(WeatherSnapshot(readings, version=version))
+    return app
+
+
+def make_readings():
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return [
+        {'StationID': station_id, 'DateTime': timestamp, 'WaterLevel': 1.5, 'HourlyRain': 2.0}
+        for station_id in ('St1', 'St2')
+    ]
+
+
+def test_lru_is_bounded_and_versioned():
+    cache = ResponseCache(max_bytes=12)
+    cache.put(('a',), 1, b'{"a":1}')
+    cache.put(('b',), 1, b'{"b":1}')
+    assert cache.get(('a',), 1).head == b'{"a":1'
+    cache.put(('c',), 1, b'{"c":1}')
+
+    assert cache.get(('b',), 1) is None
+    assert cache.evictions == 1
+
+    assert cache.get(('a',), 2) is None
+    assert cache.get_stats()['entries'] == 0
+    cache.put(('a',), 1, b'{"a":1}')
+    assert cache.get(('a',), 2) is None
+    print("✓ LRU is bounded and versioned")
+
+
+def test_render_appends_fields_in_every_encoding():
+    body = json.dumps({'data': list(range(2000))}).encode()
+    entry = CachedResponse.from_body(body, 1, gzip_level=6, brotli_quality=5)
+    expected = {'data': list(range(2000)), 'generated_at': 'now'}
+
+    identity, encoding = entry.render({'generated_at': 'now'}, json.dumps)
+    assert encoding is None and json.loads(identity) == expected
+
+    compressed, encoding = entry.render({'generated_at': 'now'}, json.dumps, 'gzip')
+    assert encoding == 'gzip' and json.loads(gzip.decompress(compressed)) == expected
+    assert len(compressed) < len(identity)
+
+    empty = CachedResponse.from_body(b'{}', 1)
+    assert json.loads(empty.render({'b': 2}, json.dumps)[0]) == {'b': 2}
+    assert empty.render(None, json.dumps, 'gzip') == (b'{}', None)
+    print("✓ Render appends fields in every encoding")
+
+
+def test_api_responses_are_cached_per_version():
+    app = make_app(make_readings())
+    client = app.test_client()
+
+    first = client.get('/api/water-level-data?station_id=St1')
+    second = client.get('/api/water-level-data?station_id=St1')
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert first.get_json()['stations'] == second.get_json()['stations']
+    assert 'generated_at' in second.get_json() and second.get_json()['success'] is True
+
+    assert client.get('/api/weather-data').get_json()['count'] == 2
+    app.weather_service._cache.set(WeatherSnapshot(make_readings()[:1], version=2))
+    refreshed = client.get('/api/weather-data')
+    assert refreshed.headers['X-Cache'] == 'MISS'
+    assert refreshed.get_json()['count'] == 1
+    print("✓ API responses are cached per version")
+
+
+def test_conditional_requests_get_304():
+    app = make_app(make_readings())
+    client = app.test_client()
+
+    first = client.get('/api/precipitation-data')
+    etag = first.headers['ETag']
+    assert first.headers['Last-Modified']
+
+    revalidated = client.get('/api/precipitation-data', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert revalidated.headers['ETag'] == etag
+
+    since = client.get('/api/precipitation-data', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert since.status_code == 304
+
+    other_query = client.get('/api/precipitation-data?station_id=St1', headers={'If-None-Match': etag})
+    assert other_query.status_code == 200
+
+    app.weather_service._cache.set(WeatherSnapshot(make_readings()[:1], version=2))
+    assert client.get('/api/precipitation-data', headers={'If-None-Match': etag}).status_code == 200
+    print("✓ Conditional requests get 304")
+
+
+def test_etags_identify_the_data_not_the_process():
+    # Two workers (or one before and after a restart) at the same version number
+    readings = make_readings()
+    first = make_app(readings).test_client()
+    same = make_app([dict(reading) for reading in readings]).test_client()
+    other = make_app(readings[:1]).test_client()
+
+    etag = first.get('/api/weather-data').headers['ETag']
+    assert same.get('/api/weather-data').headers['ETag'] == etag
+    assert other.get('/api/weather-data').headers['ETag'] != etag
+    assert same.get('/api/weather-data', headers={'If-None-Match': etag}).status_code == 304
+    response = other.get('/api/weather-data', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.get_json()['count'] == 1
+    print("✓ ETags identify the data, not the process")
+
+
+def test_api_serves_precompressed_variants():
+    app = make_app(make_readings() * 50)
+    client = app.test_client()
+
+    plain = client.get('/api/weather-data')
+    gzipped = client.get('/api/weather-data', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in plain.headers
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in gzipped.headers['Vary']
+    assert gzipped.headers['ETag'] != plain.headers['ETag']
+    assert json.loads(gzip.decompress(gzipped.data))['data'] == plain.get_json()['data']
+
+    revalidated = client.get('/api/weather-data', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']
+    })
+    assert revalidated.status_code == 304
+    print("✓ API serves precompressed variants")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("RESPONSE CACHE TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_lru_is_bounded_and_versioned,
+        test_render_appends_fields_in_every_encoding,
+        test_api_responses_are_cached_per_version,
+        test_conditional_requests_get_304,
+        test_etags_identify_the_data_not_the_process,
+        test_api_serves_precompressed_variants,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,172 @@
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.shared_snapshot import SharedSnapshot
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherService, WeatherCache
+
+
+def make_readings(count=3):
+    return [
+        {'StationID': 'St1', 'DateTime': f'2025-01-02 09:{minute:02d}:00', 'WaterLevel': 650.0 + minute}
+        for minute in range(count)
+    ]
+
+
+def make_service(path, fetch_results=()):
+    """A worker sharing path whose API calls return fetch_results in order."""
+    service = WeatherService(
+        api_url='http://upstream.invalid', timeout=1,
+        shared_snapshot=SharedSnapshot(path, lead_retry_seconds=0)
+    )
+    service._cache = WeatherCache(ttl_seconds=0)
+    service.api_calls = 0
+    results = list(fetch_results)
+
+    def fake_fetch():
+        service.api_calls += 1
+        return results.pop(0) if results else service.NOT_MODIFIED
+
+    service._fetch_from_api = fake_fetch
+    return service
+
+
+def test_one_leader_per_path():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snapshot')
+        first = SharedSnapshot(path, lead_retry_seconds=0)
+        second = SharedSnapshot(path, lead_retry_seconds=0)
+
+        assert first.try_lead()
+        assert not second.try_lead()
+
+        first.release()
+        assert second.try_lead()
+        assert not first.try_lead()
+        second.release()
+    print("✓ One leader per path")
+
+
+def test_followers_read_leader_snapshot():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snapshot')
+        leader = make_service(path, [make_readings(3), WeatherService.NOT_MODIFIED, make_readings(5)])
+        follower = make_service(path)
+
+        data = leader.fetch_weather_data()
+        followed = follower.fetch_weather_data()
+        assert followed == data
+        assert followed.version == data.version == 1
+        assert follower.shared.loaded == 1
+
+        # Unchanged upstream: the follower sees the confirmation without decoding again
+        leader.fetch_weather_data()
+        assert follower.shared.changed()
+        assert follower.fetch_weather_data().version == 1
+        assert follower.shared.loaded == 1
+
+        data = leader.fetch_weather_data()
+        followed = follower.fetch_weather_data()
+        assert len(followed) == 5
+        assert followed.version == data.version == 2
+        assert follower.get_changes_since(followed, 1) is not None
+
+        assert follower.api_calls == 0
+        assert leader.api_calls == 3
+        leader.shared.release()
+    print("✓ Followers read leader snapshot")
+
+
+def test_followers_leave_loading_to_the_refresher():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snapshot')
+        leader = make_service(path, [make_readings(3), make_readings(5)])
+        follower = make_service(path)
+        follower._is_background_refreshing = lambda: True
+
+        leader.fetch_weather_data()
+        # Nothing in memory yet: the request loads the leader's snapshot itself
+        assert follower.fetch_weather_data().version == 1
+
+        leader.fetch_weather_data()
+        assert follower.fetch_weather_data().version == 1
+        assert follower.shared.loaded == 1
+        follower.refresh()
+        assert follower.fetch_weather_data().version == 2
+        leader.shared.release()
+    print("✓ Follower requests serve memory while the refresher loads")
+
+
+def test_takeover_continues_versions():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snapshot')
+        leader = make_service(path, [make_readings(3)])
+        leader.fetch_weather_data()
+        leader.shared.release()
+
+        successor = make_service(path, [make_readings(4)])
+        data = successor.fetch_weather_data()
+
+        assert successor.shared.is_leader
+        assert data.version == 2
+        successor.shared.release()
+    print("✓ Takeover continues versions")
+
+
+def test_invalid_file_ignored():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snapshot')
+        shared = SharedSnapshot(path)
+        shared.publish(WeatherSnapshot(make_readings(), version=7))
+        assert shared.read(known_version=None).version == 7
+
+        with open(path, 'r+b') as snapshot_file:
+            snapshot_file.seek(-2, os.SEEK_END)
+            snapshot_file.write(b'!!')
+        assert shared.read(known_version=None) is None
+
+        with open(path, 'wb'):
+            pass
+        assert shared.read(known_version=None) is None
+    print("✓ Invalid file ignored")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("SHARED SNAPSHOT TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_one_leader_per_path,
+        test_followers_read_leader_snapshot,
+        test_followers_leave_loading_to_the_refresher,
+        test_takeover_continues_versions,
+        test_invalid_file_ignored,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,150 @@
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import TestingConfig, config
+from services.snapshot_archive import SnapshotArchive
+from services.weather_service import WeatherService, WeatherCache
+
+
+def make_readings(count=48):
+    start = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=count)
+    return [
+        {
+            'StationID': station_id,
+            'DateTime': (start + timedelta(hours=hour)).strftime('%Y-%m-%d %H:%M:%S'),
+            'HourlyRain': float(hour % 5),
+            'WaterLevel': 600.0 + hour,
+        }
+        for station_id in ('St1', 'St2')
+        for hour in range(count)
+    ]
+
+
+def make_app(path, fetch_results=()):
+    """App archiving to path whose API calls return fetch_results in order, then fail."""
+    config['archive'] = type('ArchiveConfig', (TestingConfig,), {'SNAPSHOT_ARCHIVE_PATH': path})
+    WeatherService._cache = WeatherCache(ttl_seconds=60)
+    app = create_app('archive')
+    service = app.weather_service
+    service._cache = WeatherService._cache
+    service.api_calls = 0
+    results = list(fetch_results)
+
+    def fake_fetch():
+        service.api_calls += 1
+        return results.pop(0) if results else None
+
+    service._fetch_from_api = fake_fetch
+    return app
+
+
+def test_warm_start_serves_archived_snapshot():
+    cache = WeatherService._cache
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'snapshot.archive')
+            first = make_app(path, [make_readings()])
+            first.weather_service.fetch_weather_data()
+            expected = first.test_client().get('/api/precipitation-data').get_json()
+
+            old = time.time() - 600
+            os.utime(path, (old, old))
+            second = make_app(path)
+            client = second.test_client()
+
+            status = second.weather_service.get_cache_status()
+            assert status['version'] == 1
+            assert status['startup']['source'] == 'archive'
+            assert status['startup']['warm_start']['loaded'] is True
+            assert 595 <= status['age_seconds'] <= 660
+
+            # Upstream is down, and the archived data is served anyway
+            payload = client.get('/api/weather-data').get_json()
+            assert payload['count'] == 96
+            assert second.weather_service.api_calls == 1
+            charts = client.get('/api/precipitation-data').get_json()
+            assert charts['stations'] == expected['stations']
+            assert second.precipitation_service._rollups.last_recomputed == []
+    finally:
+        WeatherService._cache = cache
+        config.pop('archive', None)
+    print("✓ Warm start serves archived snapshot")
+
+
+def test_archive_follows_new_versions():
+    cache = WeatherService._cache
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'snapshot.archive')
+            first = make_app(path, [make_readings(24), make_readings(30)])
+            first.weather_service.fetch_weather_data()
+            first.weather_service.refresh()
+            assert first.weather_service.archive.saved == 2
+
+            second = make_app(path)
+            data = second.weather_service.fetch_weather_data()
+            assert data.version == 2
+            assert len(data) == 60
+    finally:
+        WeatherService._cache = cache
+        config.pop('archive', None)
+    print("✓ Archive follows new versions")
+
+
+def test_unusable_archive_ignored():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snapshot.archive')
+        archive = SnapshotArchive(path)
+        assert archive.load() is None
+
+        with open(path, 'wb') as archive_file:
+            archive_file.write(b'not an archive at all, just some bytes')
+        assert archive.load() is None
+
+        service = WeatherService(api_url='http://upstream.invalid', timeout=1, archive=archive)
+        service._cache = WeatherCache()
+        assert service.warm_start() is False
+        assert service.get_cache_status()['startup']['warm_start'] == {'loaded': False}
+    print("✓ Unusable archive ignored")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("SNAPSHOT ARCHIVE TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_warm_start_serves_archived_snapshot,
+        test_archive_follows_new_versions,
+        test_unusable_archive_ignored,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,148 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from services.snapshot import WeatherSnapshot
+from services.snapshot_changelog import SnapshotChangelog, delta_view, version_token
+from services.weather_service import WeatherCache
+
+
+def reading(station_id, time, level):
+    return {'StationID': station_id, 'DateTime': f'2025-01-01 {time}:00', 'WaterLevel': level}
+
+
+def snapshot_series():
+    """v1 -> v2 adds a St1 reading -> v3 drops St2's only reading and corrects St1 09:00."""
+    first = [reading('St1', '09:00', 1.0), reading('St2', '09:00', 4.0)]
+    second = first + [reading('St1', '10:00', 2.0)]
+    third = [reading('St1', '09:00', 1.5), second[2]]
+    return [
+        WeatherSnapshot(first, version=1),
+        WeatherSnapshot(second, version=2),
+        WeatherSnapshot(third, version=3),
+    ]
+
+
+def test_diffs_merge_across_versions():
+    changelog = SnapshotChangelog()
+    v1, v2, v3 = snapshot_series()
+
+    assert changelog.record(v1) is None
+    assert list(changelog.record(v2).added) == [('St1', '2025-01-01 10:00:00')]
+    changelog.record(v3)
+
+    merged = changelog.since(1)
+    assert merged.to_version == 3
+    assert merged.added == {
+        ('St1', '2025-01-01 09:00:00'): v3[0],
+        ('St1', '2025-01-01 10:00:00'): v3[1],
+    }
+    assert merged.removed == {('St2', '2025-01-01 09:00:00')}
+    assert len(changelog.since(3)) == 0
+    assert changelog.since(4) is None
+
+    # A version number recorded here with other content (another process's v1) is unknown
+    assert changelog.since(1, v1.digest) is not None
+    assert changelog.since(1, v2.digest) is None
+    assert changelog.since(3, v1.digest) is None
+    print("✓ Diffs merge across versions")
+
+
+def test_history_is_bounded():
+    changelog = SnapshotChangelog(max_versions=1)
+    for snapshot in snapshot_series():
+        changelog.record(snapshot)
+
+    assert changelog.oldest_version == 2
+    assert changelog.since(1) is None
+    assert changelog.since(2) is not None
+    print("✓ History is bounded")
+
+
+def test_latest_only_view_resends_touched_stations():
+    changelog = SnapshotChangelog()
+    v1, v2, v3 = snapshot_series()
+    for snapshot in (v1, v2, v3):
+        changelog.record(snapshot)
+
+    readings, removed = delta_view(v3, changelog.since(2), latest_only=True)
+    assert readings == [v3[1]]
+    assert removed == [('St2', '2025-01-01 09:00:00')]
+
+    readings, removed = delta_view(v3, changelog.since(2), station_id='St2')
+    assert readings == [] and removed == [('St2', '2025-01-01 09:00:00')]
+    print("✓ Latest-only view resends touched stations")
+
+
+def test_delta_endpoint_falls_back_to_full():
+    app = create_app('testing')
+    service = app.weather_service
+    service._cache = WeatherCache(ttl_seconds=3600)
+    client = app.test_client()
+    v1, v2, v3 = snapshot_series()
+    for snapshot in (v1, v2):
+        service.changelog.record(snapshot)
+        service._cache.set(snapshot)
+
+    full = client.get('/api/weather-data/delta').get_json()
+    assert full['full'] is True and full['version'] == version_token(2, v2.digest) and full['count'] == 3
+
+    delta = client.get(f'/api/weather-data/delta?since_version={version_token(1, v1.digest)}').get_json()
+    assert delta['full'] is False
+    assert delta['since_version'] == version_token(1, v1.digest)
+    assert delta['data'] == [reading('St1', '10:00', 2.0)]
+
+    # The same version number from another worker or before a restart, or a bare number
+    for token in (version_token(1, v3.digest), '1'):
+        other = client.get(f'/api/weather-data/delta?since_version={token}').get_json()
+        assert other['full'] is True and other['count'] == 3
+
+    service.changelog = SnapshotChangelog(max_versions=1)
+    for snapshot in (v1, v2, v3):
+        service.changelog.record(snapshot)
+    service._cache.set(v3)
+    stale = client.get(f'/api/weather-data/delta?since_version={version_token(1, v1.digest)}').get_json()
+    assert stale['full'] is True and stale['count'] == 2
+
+    assert client.get('/api/weather-data/delta?since_version=abc').status_code == 400
+    assert client.get('/api/weather-data/delta?since_version=1-').status_code == 400
+    print("✓ Delta endpoint falls back to full")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("SNAPSHOT CHANGELOG TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_diffs_merge_across_versions,
+        test_history_is_bounded,
+        test_latest_only_view_resends_touched_stations,
+        test_delta_endpoint_falls_back_to_full,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,106 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import json
+
+from app import create_app
+from config import ColorAPI
+from utils.static_payloads import StaticPayloads
+
+
+def test_digest_follows_content():
+    payloads = StaticPayloads(dumps=json.dumps)
+
+    first = payloads.add('colors', {'primary': '#409ac7'})
+    same = payloads.add('colors', {'primary': '#409ac7'})
+    changed = payloads.add('colors', {'primary': '#000000'})
+
+    assert first.digest == same.digest
+    assert first.digest != changed.digest
+    assert payloads.get('colors') is changed
+    assert payloads.digests() == {'colors': changed.digest}
+    print("✓ Digest follows content")
+
+
+def test_versioned_url_is_immutable():
+    app = create_app('testing')
+    client = app.test_client()
+    digest = app.static_payloads.digests()['css_variables']
+
+    response = client.get(f'/api/css-variables/{digest}')
+    assert response.status_code == 200
+    assert 'immutable' in response.headers['Cache-Control']
+    assert response.get_json() == dict(ColorAPI.get_javascript_config(), success=True)
+
+    revalidated = client.get(f'/api/css-variables/{digest}', headers={'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert not revalidated.data
+    print("✓ Versioned URL is immutable")
+
+
+def test_unversioned_and_stale_urls_revalidate():
+    app = create_app('testing')
+    client = app.test_client()
+
+    for url in ('/api/config/complete', '/api/config/complete/0123456789abcdef'):
+        response = client.get(url)
+        payload = response.get_json()
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'no-cache'
+        assert payload['api_url'] == app.config['API_URL']
+        assert 'generated_at' not in payload
+    print("✓ Unversioned and stale URLs revalidate")
+
+
+def test_templates_embed_digest():
+    app = create_app('testing')
+    digests = app.static_payloads.digests()
+
+    with app.test_request_context('/'):
+        context = {}
+        app.update_template_context(context)
+
+    assert context['config_urls'] == {
+        'complete_config': f"/api/config/complete/{digests['complete_config']}",
+        'css_variables': f"/api/css-variables/{digests['css_variables']}",
+    }
+    print("✓ Templates embed digest")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("STATIC PAYLOAD TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_digest_follows_content,
+        test_versioned_url_is_immutable,
+        test_unversioned_and_stale_urls_revalidate,
+        test_templates_embed_digest,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
@@ -0,0 +1,88 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.station_index import StationIndex
+from services.snapshot import WeatherSnapshot, get_index
+from services.weather_service import WeatherService
+
+
+def sample_readings():
+    return [
+        {'StationID': 'St2', 'DateTime': '2025-01-01 10:05:00', 'WaterLevel': 5.0},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 10:10:00', 'WaterLevel': 3.0},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 09:00:00', 'WaterLevel': 2.0},
+        {'StationID': 'St1', 'DateTime': '2025-01-01 09:30:00', 'WaterLevel': 2.5},
+        {'DateTime': '2025-01-01 11:00:00', 'WaterLevel': 1.0},
+    ]
+
+
+def test_recent_is_newest_first_and_limited():
+    readings = sample_readings()
+    index = StationIndex.from_readings(readings)
+
+    assert index.recent('St1') == [readings[1], readings[3], readings[2]]
+    assert index.recent('St1', limit=2) == [readings[1], readings[3]]
+    assert index.recent('St9') == []
+    print("✓ Recent is newest first and limited")
+
+
+def test_latest_pointers():
+    readings = sample_readings()
+    snapshot = WeatherSnapshot(readings)
+    index = get_index(snapshot)
+
+    assert index is snapshot.index
+    assert index.latest('St1') is readings[1]
+    assert index.latest_per_station() == {'St1': readings[1], 'St2': readings[0]}
+    assert index.latest_overall() is readings[1]
+    print("✓ Latest pointers")
+
+
+def test_service_queries_use_index():
+    readings = sample_readings()
+    snapshot = WeatherSnapshot(readings)
+    service = WeatherService(api_url='http://upstream.invalid', timeout=1)
+
+    assert service.get_latest_per_station(snapshot) == {'St1': readings[1], 'St2': readings[0]}
+    assert service.filter_by_station(snapshot, 'St1', limit=1) == [readings[1]]
+    assert service.get_mdrrmo_latest_reading(snapshot) is readings[1]
+    assert service.get_latest_reading(snapshot) is readings[1]
+    print("✓ Service queries use index")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("STATION INDEX TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_recent_is_newest_first_and_limited,
+        test_latest_pointers,
+        test_service_queries_use_index,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
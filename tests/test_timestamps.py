@@ -0,0 +1,78 @@
+import sys
+import os
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.timestamps import (
+    parse_timestamp,
+    to_epoch,
+    epoch_to_datetime,
+    reading_epoch,
+)
+
+
+def test_parses_known_shapes():
+    expected = datetime(2025, 1, 1, 10, 30, 15)
+
+    assert parse_timestamp('2025-01-01 10:30:15') == expected
+    assert parse_timestamp('2025-01-01T10:30:15') == expected
+    assert parse_timestamp('2025-01-01T10:30:15Z') == expected
+    assert parse_timestamp('2025-01-01T10:30:15+08:00') == expected
+    assert parse_timestamp('2025-01-01 10:30:15.250') == expected.replace(microsecond=250000)
+    assert parse_timestamp('not a date') is None
+    assert parse_timestamp('') is None
+    print("✓ Parses known shapes")
+
+
+def test_epoch_round_trip():
+    epoch = to_epoch('2025-01-01 10:30:15')
+
+    assert epoch_to_datetime(epoch) == datetime(2025, 1, 1, 10, 30, 15)
+    assert epoch % 86400 == 10 * 3600 + 30 * 60 + 15
+    print("✓ Epoch round trip")
+
+
+def test_reading_epoch_uses_first_timestamp_field():
+    reading = {'DateTime': '1970-01-01 00:00:42', 'DateTimeStamp': '1970-01-01 00:01:00'}
+
+    assert reading_epoch(reading) == 42.0
+    assert reading_epoch({'DateTimeStamp': '1970-01-01 00:01:00'}) == 60.0
+    assert reading_epoch({}) is None
+    print("✓ Reading epoch uses the first timestamp field")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("TIMESTAMP PARSER TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_parses_known_shapes,
+        test_epoch_round_trip,
+        test_reading_epoch_uses_first_timestamp_field,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
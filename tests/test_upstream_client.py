@@ -0,0 +1,173 @@
+import sys
+import os
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.upstream_client import UpstreamClient
+
+ROWS = [{'StationID': f'St{i % 5 + 1}', 'DateTime': f'2025-01-01 {i % 24:02d}:00:00', 'WaterLevel': 1.5}
+        for i in range(500)]
+ETAG = '"rows-1"'
+
+
+class Upstream(ThreadingHTTPServer):
+    """Local stand-in for the APAW API that honours If-None-Match and gzip."""
+
+    def __init__(self, body):
+        super().__init__(('127.0.0.1', 0), UpstreamHandler)
+        self.body = body
+        self.seen_if_none_match = []
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/api'
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.seen_if_none_match.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return
+        body = self.server.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', ETAG)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_rows_stream_and_validators_give_304():
+    body = json.dumps({'success': True, 'data': ROWS}).encode('utf-8')
+    upstream = Upstream(body)
+    client = UpstreamClient(upstream.url, timeout=5, chunk_size=256)
+    try:
+        response = client.fetch_rows()
+        assert response.not_modified is False
+        assert client.get_stats()['totals']['requests'] == 0
+        assert list(response.data) == ROWS
+
+        stats = client.get_stats()
+        assert stats['has_validators'] is True
+        assert stats['last_request']['status_code'] == 200
+        # Counted on the wire, i.e. gzipped
+        assert 0 < stats['last_request']['bytes_transferred'] < len(body)
+        assert stats['totals']['requests'] == 1 and stats['totals']['connections_opened'] == 1
+
+        again = client.fetch_rows()
+        assert again.not_modified is True and again.data is None
+        assert upstream.seen_if_none_match == [None, ETAG]
+        totals = client.get_stats()['totals']
+        assert totals['requests'] == 2 and totals['not_modified'] == 1
+        # The keep-alive connection is reused
+        assert totals['connections_opened'] == 1
+
+        unconditional = client.fetch_rows(conditional=False)
+        assert len(list(unconditional.data)) == len(ROWS)
+        assert upstream.seen_if_none_match[-1] is None
+    finally:
+        client.close()
+        upstream.stop()
+    print("✓ Rows stream in, validators turn the next fetch into a 304")
+
+
+def test_invalid_body_keeps_no_validators():
+    upstream = Upstream(b'{"data": [{"StationID": "St1"}, {"StationID": ')
+    client = UpstreamClient(upstream.url, timeout=5, chunk_size=16)
+    try:
+        response = client.fetch_rows()
+        rows = []
+        try:
+            for row in response.data:
+                rows.append(row)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("truncated body was accepted")
+        assert rows == [{'StationID': 'St1'}]
+        stats = client.get_stats()
+        assert stats['has_validators'] is False and stats['totals']['requests'] == 0
+
+        upstream.body = json.dumps(ROWS).encode('utf-8')
+        assert len(list(client.fetch_rows().data)) == len(ROWS)
+        assert upstream.seen_if_none_match == [None, None]
+    finally:
+        client.close()
+        upstream.stop()
+    print("✓ An invalid body keeps no validators")
+
+
+def test_validators_are_only_sent_with_their_params():
+    upstream = Upstream(json.dumps(ROWS).encode('utf-8'))
+    client = UpstreamClient(upstream.url, timeout=5)
+    try:
+        assert len(list(client.fetch_rows().data)) == len(ROWS)
+        # An incremental request does not get the full dataset's 304
+        incremental = client.fetch_rows(params={'since': '2025-01-01 10:00:00'})
+        assert incremental.not_modified is False
+        assert len(list(incremental.data)) == len(ROWS)
+        assert client.fetch_rows(params={'since': '2025-01-01 10:00:00'}).not_modified is True
+        # ...and the full fetch no longer holds validators of its own
+        assert len(list(client.fetch_rows().data)) == len(ROWS)
+        assert upstream.seen_if_none_match == [None, None, ETAG, None]
+    finally:
+        client.close()
+        upstream.stop()
+    print("✓ Validators are only sent with the params they came with")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("UPSTREAM CLIENT TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_rows_stream_and_validators_give_304,
+        test_invalid_body_keeps_no_validators,
+        test_validators_are_only_sent_with_their_params,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
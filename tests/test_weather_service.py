@@ -0,0 +1,213 @@
+import sys
+import os
+import time
+import threading
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from config import TestingConfig, config
+from services.snapshot import WeatherSnapshot
+from services.weather_service import WeatherService, WeatherCache
+from utils.timestamps import to_epoch
+
+
+def get_recent_timestamp():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def make_readings(count=3, station_id='St4'):
+    timestamp = get_recent_timestamp()
+    return [
+        {'StationID': station_id, 'DateTime': timestamp, 'WaterLevel': 650.0 + i, 'HourlyRain': 0.0}
+        for i in range(count)
+    ]
+
+
+def make_service(fetch_results, ttl_seconds=60):
+    """Create a service with its own cache whose API calls return fetch_results in order."""
+    service = WeatherService(api_url='http://upstream.invalid', timeout=1)
+    service._cache = WeatherCache(ttl_seconds=ttl_seconds)
+    service.api_calls = 0
+    results = list(fetch_results)
+
+    def fake_fetch():
+        service.api_calls += 1
+        return results.pop(0) if results else None
+
+    service._fetch_from_api = fake_fetch
+    return service
+
+
+def test_fetch_populates_cache():
+    service = make_service([make_readings()])
+
+    assert len(service.fetch_weather_data()) == 3
+    assert len(service.fetch_weather_data()) == 3
+    assert service.api_calls == 1
+    print("✓ Fetch populates cache")
+
+
+def test_background_refresh_serves_stale_data():
+    service = make_service([make_readings(3)], ttl_seconds=0)
+    service.fetch_weather_data()
+    release = threading.Event()
+
+    def slow_fetch():
+        service.api_calls += 1
+        release.wait(2)
+        return make_readings(5)
+
+    service._fetch_from_api = slow_fetch
+    WeatherService._refresher = None
+    refresher = service.start_background_refresh(ahead_seconds=0, poll_interval=60)
+    try:
+        while service.api_calls < 2:
+            time.sleep(0.01)
+        # The refresher is fetching: requests get the stale data without waiting
+        started = time.perf_counter()
+        data = service.fetch_weather_data()
+        elapsed = time.perf_counter() - started
+        assert len(data) == 3
+        assert elapsed < 0.5
+        assert refresher.is_running
+        assert service.get_cache_status()['background_refresh']
+
+        release.set()
+        deadline = time.monotonic() + 2
+        while service._cache.version < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(service.fetch_weather_data()) == 5
+        assert service.api_calls == 2
+    finally:
+        release.set()
+        service.stop_background_refresh()
+    print("✓ Background refresh serves stale data")
+
+
+def test_app_starts_refresher_in_serving_process():
+    config['refreshing'] = type('RefreshingConfig', (TestingConfig,), {'BACKGROUND_REFRESH': True})
+    cache = WeatherService._cache
+    try:
+        WeatherService._cache = WeatherCache(ttl_seconds=60)
+        WeatherService._refresher = None
+        app = create_app('refreshing')
+        # Nothing runs until the process serves (after any fork)
+        assert WeatherService._refresher is None
+        app.weather_service._cache.set(WeatherSnapshot(make_readings(), version=1))
+        client = app.test_client()
+        client.get('/api/health/live')
+        refresher = WeatherService._refresher
+        assert refresher is not None and refresher.is_running
+        client.get('/api/health/live')
+        assert WeatherService._refresher is refresher
+    finally:
+        WeatherService._cache = cache
+        config.pop('refreshing')
+        if WeatherService._refresher is not None:
+            WeatherService._refresher.stop()
+        WeatherService._refresher = None
+    print("✓ App starts the refresher in the serving process")
+
+
+def test_refresher_respects_backoff():
+    service = make_service([])
+    for _ in range(3):
+        service.breaker.record_failure()
+
+    assert not service.refresh_due(ahead_seconds=10)
+    print("✓ Refresher respects backoff")
+
+
+def test_concurrent_fetches_are_coalesced():
+    service = make_service([])
+    release = threading.Event()
+
+    def slow_fetch():
+        service.api_calls += 1
+        release.wait(2)
+        return make_readings()
+
+    service._fetch_from_api = slow_fetch
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(service.fetch_weather_data()))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while service._cache.get_cache_status()['coalesced_waiters'] < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert service.api_calls == 1
+    assert all(len(result) == 3 for result in results)
+    assert service.get_cache_status()['coalesced_waiters'] == 4
+    print("✓ Concurrent fetches are coalesced")
+
+
+def test_not_modified_bumps_freshness():
+    service = make_service([make_readings(), WeatherService.NOT_MODIFIED], ttl_seconds=0)
+    first = service.fetch_weather_data()
+    second = service.fetch_weather_data()
+
+    assert second is first
+    assert service.api_calls == 2
+    assert service.get_cache_status()['fetch_errors'] == 0
+    print("✓ 304 from upstream keeps cached data")
+
+
+def test_sanitized_readings_keep_upstream_fields():
+    service = WeatherService(api_url='http://upstream.invalid', timeout=1)
+    raw = {'StationID': 'St1', 'DateTime': '2025-01-01 10:00:00', 'WaterLevel': '1.5', 'HourlyRain': 'n/a',
+           'WindDirection': ' ne '}
+    merge = service._store.ingest([dict(raw)], sanitize=service._sanitize_reading)
+
+    # Served as-is by the API, so only upstream's fields, converted
+    assert merge.readings == [dict(raw, WaterLevel=1.5, HourlyRain=None, WindDirection='NE')]
+    snapshot = WeatherSnapshot(merge.readings, version=1)
+    assert snapshot.columns.epoch.tolist() == [to_epoch('2025-01-01 10:00:00')]
+    print("✓ Sanitized readings keep upstream's fields")
+
+
+def run_all_tests():
+    print("\n" + "="*60)
+    print("WEATHER SERVICE TESTS")
+    print("="*60 + "\n")
+
+    tests = [
+        test_fetch_populates_cache,
+        test_background_refresh_serves_stale_data,
+        test_app_starts_refresher_in_serving_process,
+        test_refresher_respects_backoff,
+        test_concurrent_fetches_are_coalesced,
+        test_not_modified_bumps_freshness,
+        test_sanitized_readings_keep_upstream_fields,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_func in tests:
+        try:
+            test_func()
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test_func.__name__} - {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test_func.__name__} - ERROR: {e}")
+            failed += 1
+
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed")
+    print("="*60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
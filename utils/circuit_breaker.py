@@ -0,0 +1,108 @@
+"""Circuit breaker for calls to a dependency that may be down."""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Closed: calls go through and consecutive failures are counted.
+    Open: after failure_threshold of them, calls are refused without being
+    attempted until a backoff delay has passed.
+    Half-open: then exactly one trial call is let through; success closes the
+    circuit, failure reopens it with the delay doubled (up to max_delay).
+
+    Delays use equal jitter (half fixed, half random) so processes that
+    failed together do not retry together.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_delay: float = 5.0,
+        max_delay: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opens = 0
+        self._retry_at = 0.0
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def would_allow(self) -> bool:
+        """Whether allow() would currently let a call through, without claiming the trial."""
+        with self._lock:
+            if self._state == OPEN:
+                return self._clock() >= self._retry_at
+            return self._state == CLOSED
+
+    def allow(self) -> bool:
+        """Claim permission for one call. Every allowed call must be followed by record_success/record_failure."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() >= self._retry_at:
+                self._state = HALF_OPEN
+                logger.info("Circuit half-open: sending a trial request")
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit closed after a successful trial")
+            self._state = CLOSED
+            self._failures = 0
+            self._opens = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                delay = min(self.max_delay, self.base_delay * (2 ** self._opens))
+                delay = delay / 2 + self._rng() * delay / 2
+                self._state = OPEN
+                self._opens += 1
+                self._retry_at = self._clock() + delay
+                self.trips += 1
+                logger.warning(f"Circuit open after {self._failures} failures; next trial in {delay:.1f}s")
+
+    def retry_after(self) -> float:
+        """Seconds until a trial call is allowed (0 unless open)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._retry_at - self._clock())
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'retry_after_seconds': round(max(0.0, self._retry_at - self._clock()), 1) if self._state == OPEN else 0.0,
+                'trips': self.trips,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,216 @@
+"""Fan-out of server-sent events to many long-lived subscribers."""
+
+import json
+import logging
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT = b': keepalive\n\n'
+
+
+def format_event_id(boot: str, event_id: int) -> str:
+    """The ID clients see: '<boot>-<n>', so IDs from another process or run never match."""
+    return f'{boot}-{event_id}'
+
+
+def parse_event_id(boot: str, value: str) -> Optional[int]:
+    """Sequence number of a client's Last-Event-ID, or None if it was not issued by the hub with boot."""
+    prefix, _, number = value.rpartition('-')
+    if prefix != boot or not number.isdigit():
+        return None
+    return int(number)
+
+
+@dataclass(frozen=True)
+class Event:
+    """One published event, encoded once in the text/event-stream format for all subscribers."""
+    id: int
+    type: str
+    encoded: bytes
+
+    @classmethod
+    def create(cls, boot: str, event_id: int, event_type: str, data: Any) -> 'Event':
+        payload = json.dumps(data, separators=(',', ':'), default=str)
+        wire_id = format_event_id(boot, event_id)
+        return cls(event_id, event_type, f'id: {wire_id}\nevent: {event_type}\ndata: {payload}\n\n'.encode('utf-8'))
+
+
+class Subscription:
+    """
+    A subscriber's bounded queue of pending events.
+
+    A subscriber that falls more than max_queue events behind is not allowed
+    to hold the others up or grow without bound: its queue is dropped and it
+    is sent a single `resync` event (carrying the newest event ID), after
+    which it should re-fetch its state.
+    """
+
+    def __init__(self, max_queue: int, boot: str):
+        self.max_queue = max_queue
+        self.boot = boot
+        self._queue: Deque[Event] = deque()
+        self._cond = threading.Condition(threading.Lock())
+        self._resync_id: Optional[int] = None
+        self.closed = False
+        self.delivered = 0
+        self.overflows = 0
+
+    def put(self, event: Event):
+        with self._cond:
+            if self._resync_id is not None:
+                self._resync_id = event.id
+            elif len(self._queue) >= self.max_queue:
+                self._queue.clear()
+                self._resync_id = event.id
+                self.overflows += 1
+            else:
+                self._queue.append(event)
+            self._cond.notify()
+
+    def resync(self, event_id: int):
+        """Skip to event_id: the subscriber gets a resync event instead of what came before."""
+        with self._cond:
+            self._queue.clear()
+            self._resync_id = event_id
+            self._cond.notify()
+
+    def get(self, timeout: float) -> Optional[Event]:
+        """Next event, a resync marker after an overflow, or None after timeout seconds idle."""
+        with self._cond:
+            if not self._queue and self._resync_id is None and not self.closed:
+                self._cond.wait(timeout)
+            if self._resync_id is not None:
+                resync_id, self._resync_id = self._resync_id, None
+                return Event.create(self.boot, resync_id, 'resync',
+                                    {'last_event_id': format_event_id(self.boot, resync_id)})
+            if not self._queue:
+                return None
+            self.delivered += 1
+            return self._queue.popleft()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+
+class EventHub:
+    """
+    Broadcasts events to every open stream.
+
+    Publishing encodes the event once and appends it to each subscriber's
+    bounded queue; streams idle for heartbeat_seconds send a comment line so
+    proxies keep the connection open. The last `history` events are kept so a
+    reconnecting client's Last-Event-ID can be resumed from; if its ID is older
+    than that it is sent a `resync` event instead. Event IDs are qualified
+    with a token drawn when the hub is created, so an ID issued by another
+    worker or before a restart is never taken for one of this hub's and
+    always gets a resync.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 32,
+        history: int = 128,
+        heartbeat_seconds: float = 15,
+        retry_ms: int = 5000,
+        max_subscribers: int = 1000
+    ):
+        self.max_queue = max_queue
+        self.heartbeat_seconds = heartbeat_seconds
+        self.retry_ms = retry_ms
+        self.max_subscribers = max_subscribers
+        self._history: Deque[Event] = deque(maxlen=history)
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self.boot = uuid.uuid4().hex[:8]
+        self._next_id = 1
+        self.published = 0
+        self.rejected = 0
+        self.overflows = 0
+
+    @property
+    def last_event_id(self) -> int:
+        with self._lock:
+            return self._next_id - 1
+
+    def publish(self, event_type: str, data: Any) -> Event:
+        with self._lock:
+            event = Event.create(self.boot, self._next_id, event_type, data)
+            self._next_id += 1
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for subscription in subscribers:
+            subscription.put(event)
+        return event
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Optional[Subscription]:
+        """
+        Register a subscriber, queueing what it missed after the client's
+        Last-Event-ID (as sent). None if the hub is full.
+        """
+        subscription = Subscription(self.max_queue, self.boot)
+        after = parse_event_id(self.boot, last_event_id) if last_event_id else None
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self.rejected += 1
+                return None
+            if last_event_id and after is None:
+                # Issued by another process or run (or garbled): nothing to resume from
+                subscription.resync(self._next_id - 1)
+            elif after is not None and after != self._next_id - 1:
+                missed = [event for event in self._history if event.id > after]
+                if not missed or missed[0].id != after + 1 or len(missed) > self.max_queue:
+                    subscription.resync(self._next_id - 1)
+                else:
+                    for event in missed:
+                        subscription.put(event)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+                self.overflows += subscription.overflows
+
+    def stream(self, subscription: Subscription) -> Iterator[bytes]:
+        """text/event-stream body for subscription; unsubscribes when the client goes away."""
+        try:
+            yield f'retry: {self.retry_ms}\n\n'.encode('ascii')
+            while not subscription.closed:
+                event = subscription.get(self.heartbeat_seconds)
+                if event is not None:
+                    yield event.encoded
+                elif not subscription.closed:
+                    yield HEARTBEAT
+        finally:
+            self.unsubscribe(subscription)
+
+    def close(self):
+        """End every open stream (e.g. on shutdown)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'max_subscribers': self.max_subscribers,
+                'boot': self.boot,
+                'last_event_id': self._next_id - 1,
+                'published': self.published,
+                'rejected': self.rejected,
+                'overflows': self.overflows + sum(s.overflows for s in self._subscribers),
+                'max_queue': self.max_queue,
+                'heartbeat_seconds': self.heartbeat_seconds
+            }
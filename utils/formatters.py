@@ -3,6 +3,8 @@
 from datetime import datetime, timedelta
 from typing import Union, Optional, Dict, Any
 
+from .timestamps import parse_timestamp
+
 
 def format_datetime(dt: Union[str, datetime], format: str = '%I:%M %p') -> str:
     """Format datetime for display - handles both datetime objects and strings."""
@@ -14,17 +16,9 @@ def format_datetime(dt: Union[str, datetime], format: str = '%I:%M %p') -> str:
             return dt.strftime(format)
         
         if isinstance(dt, str):
-            try:
-                dt_obj = datetime.strptime(dt, '%Y-%m-%d %H:%M:%S')
-                return dt_obj.strftime(format)
-            except ValueError:
-                pass
-            
-            try:
-                dt_obj = datetime.fromisoformat(dt.replace('Z', '+00:00'))
+            dt_obj = parse_timestamp(dt)
+            if dt_obj:
                 return dt_obj.strftime(format)
-            except ValueError:
-                pass
             
             return dt[:16] if len(dt) >= 16 else dt
     
@@ -0,0 +1,152 @@
+"""Incremental JSON array parsing for large upstream payloads."""
+
+import codecs
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = frozenset('0123456789+-.eE')
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+class _Buffer:
+    """Text buffer fed from a byte chunk iterator."""
+
+    def __init__(self, chunks: Iterable[bytes], timings: Optional[Dict[str, float]]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._timings = timings
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk. Returns False once the stream is exhausted."""
+        if self.eof:
+            return False
+        started = time.perf_counter()
+        chunk = next(self._chunks, None)
+        if self._timings is not None:
+            self._timings['read_seconds'] += time.perf_counter() - started
+        if chunk is None:
+            self.text += self._decoder.decode(b'', final=True)
+            self.eof = True
+            return False
+        if self.pos > _COMPACT_THRESHOLD:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        self.text += self._decoder.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of stream)."""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}")
+        self.pos += 1
+
+
+def _number_may_continue(value: Any, text: str, end: int) -> bool:
+    """
+    Whether a number decoded up to end may be cut short by the buffer edge:
+    raw_decode stops "-1" + "00000.0" at "-1", and "-100000." + "0" at "-100000".
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    while end < len(text) and text[end] in _NUMBER_CHARS:
+        end += 1
+    return end == len(text)
+
+
+def _decode_value(buf: _Buffer, decoder: json.JSONDecoder) -> Any:
+    """Decode the next complete JSON value, reading more input until it fits."""
+    buf.peek()
+    while True:
+        try:
+            value, end = decoder.raw_decode(buf.text, buf.pos)
+            if buf.eof or not _number_may_continue(value, buf.text, end):
+                buf.pos = end
+                return value
+        except json.JSONDecodeError:
+            if buf.eof:
+                raise
+        if not buf.fill() and buf.eof and buf.pos >= len(buf.text):
+            raise ValueError("Unexpected end of JSON input")
+
+
+def _iter_array(buf: _Buffer, decoder: json.JSONDecoder, timings) -> Iterator[Any]:
+    buf.expect('[')
+    if buf.peek() == ']':
+        buf.pos += 1
+        return
+    while True:
+        started = time.perf_counter()
+        value = _decode_value(buf, decoder)
+        separator = buf.peek()
+        if timings is not None:
+            timings['parse_seconds'] += time.perf_counter() - started
+        yield value
+        if separator == ',':
+            buf.pos += 1
+        elif separator == ']':
+            buf.pos += 1
+            return
+        else:
+            raise ValueError(f"Expected ',' or ']' at offset {buf.pos}")
+
+
+def iter_json_array(
+    chunks: Iterable[bytes],
+    key: str = 'data',
+    timings: Optional[Dict[str, float]] = None
+) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array one at a time from a stream of bytes.
+
+    Accepts either a top-level array or an object whose `key` member is the
+    array (e.g. {"data": [...]}); other members of the object are skipped.
+    Only one element is held in memory at a time besides the read buffer.
+    If `timings` is given, 'read_seconds' and 'parse_seconds' are accumulated in it.
+    Raises ValueError on malformed input.
+    """
+    if timings is not None:
+        timings.setdefault('read_seconds', 0.0)
+        timings.setdefault('parse_seconds', 0.0)
+
+    buf = _Buffer(chunks, timings)
+    decoder = json.JSONDecoder()
+    first = buf.peek()
+
+    if first == '[':
+        yield from _iter_array(buf, decoder, timings)
+        return
+
+    if first != '{':
+        raise ValueError(f"Expected a JSON array or object, got {first!r}")
+
+    buf.pos += 1
+    while True:
+        if buf.peek() == '}':
+            raise ValueError(f"JSON object has no '{key}' array")
+        member = _decode_value(buf, decoder)
+        buf.expect(':')
+        if member == key and buf.peek() == '[':
+            yield from _iter_array(buf, decoder, timings)
+            return
+        _decode_value(buf, decoder)
+        separator = buf.peek()
+        if separator == ',':
+            buf.pos += 1
+        elif separator != '}':
+            raise ValueError(f"Expected ',' or '}}' at offset {buf.pos}")
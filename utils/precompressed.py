@@ -0,0 +1,82 @@
+"""
+Compressed response bodies that accept a short per-request suffix.
+
+The expensive part of a cached JSON body is compressed once into a prefix that
+ends on a byte boundary without terminating the stream. Finishing a response
+then only appends the per-request bytes (e.g. ',"generated_at":...}') as an
+uncompressed block plus the stream trailer, so no compression runs per request.
+
+brotli is optional: without it only gzip variants are produced.
+"""
+
+import struct
+import zlib
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the deployment
+    brotli = None
+
+# Largest suffix one stored/uncompressed block can carry
+MAX_SUFFIX_BYTES = 65535
+
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+
+
+class GzipPrefix:
+    """gzip member whose deflate stream is sync-flushed (not final) after the prefix."""
+
+    encoding = 'gzip'
+
+    def __init__(self, data: bytes, level: int = 6):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.data = _GZIP_HEADER + compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.crc = zlib.crc32(data)
+        self.length = len(data)
+
+    def finish(self, suffix: bytes) -> bytes:
+        # Final stored block: BFINAL=1, BTYPE=00, then LEN/NLEN and the raw bytes
+        stored = struct.pack('<BHH', 1, len(suffix), len(suffix) ^ 0xFFFF) + suffix
+        trailer = struct.pack('<II', zlib.crc32(suffix, self.crc), (self.length + len(suffix)) & 0xFFFFFFFF)
+        return self.data + stored + trailer
+
+
+class BrotliPrefix:
+    """brotli stream flushed (byte-aligned, not final) after the prefix."""
+
+    encoding = 'br'
+
+    def __init__(self, data: bytes, quality: int = 5):
+        compressor = brotli.Compressor(quality=quality)
+        self.data = compressor.process(data) + compressor.flush()
+
+    def finish(self, suffix: bytes) -> bytes:
+        parts = [self.data]
+        if suffix:
+            # Uncompressed meta-block: ISLAST=0, MNIBBLES=4, MLEN-1, ISUNCOMPRESSED=1, pad to a byte
+            bits = ((len(suffix) - 1) << 3) | (1 << 19)
+            parts.append(bits.to_bytes(3, 'little'))
+            parts.append(suffix)
+        # Empty last meta-block: ISLAST=1, ISLASTEMPTY=1
+        parts.append(b'\x03')
+        return b''.join(parts)
+
+
+def available_encodings() -> tuple:
+    """Content codings this process can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def precompress(
+    data: bytes,
+    gzip_level: int = 6,
+    brotli_quality: Optional[int] = 5
+) -> Dict[str, object]:
+    """Build every available compressed prefix of data. A level of 0/None disables that coding."""
+    variants: Dict[str, object] = {}
+    if brotli is not None and brotli_quality:
+        variants['br'] = BrotliPrefix(data, brotli_quality)
+    if gzip_level:
+        variants['gzip'] = GzipPrefix(data, gzip_level)
+    return variants
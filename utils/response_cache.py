@@ -0,0 +1,200 @@
+"""Versioned cache of serialized API responses."""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .precompressed import MAX_SUFFIX_BYTES, available_encodings, precompress
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[Hashable, ...]
+
+
+@dataclass
+class CachedResponse:
+    """
+    Encoded JSON object of one endpoint/query for one data version.
+
+    `head` is the object without its closing brace, so per-request members can
+    be appended without decoding it; `variants` holds its precompressed forms
+    keyed by content coding.
+    """
+    head: bytes
+    version: int
+    variants: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_body(
+        cls,
+        body: bytes,
+        version: int,
+        gzip_level: int = 0,
+        brotli_quality: Optional[int] = None,
+        compress_min_bytes: int = 0
+    ) -> 'CachedResponse':
+        head = body.rstrip()
+        if not head.endswith(b'}'):
+            raise ValueError("Cached response body must be a JSON object")
+        head = head[:-1].rstrip()
+        variants = {}
+        if len(body) >= compress_min_bytes:
+            variants = precompress(head, gzip_level=gzip_level, brotli_quality=brotli_quality)
+        return cls(head=head, version=version, variants=variants)
+
+    @property
+    def size(self) -> int:
+        return len(self.head) + sum(len(variant.data) for variant in self.variants.values())
+
+    def render(
+        self,
+        fields: Optional[Dict[str, Any]],
+        dumps: Callable[[Any], str],
+        encoding: Optional[str] = None
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        The complete body with `fields` appended, plus the content coding it is
+        in: `encoding` if that variant exists, otherwise None (identity).
+        """
+        suffix = b'}'
+        if fields:
+            members = dumps(fields).strip().encode('utf-8')[1:-1]
+            separator = b'' if self.head.endswith(b'{') else b','
+            suffix = separator + members + b'}'
+        if encoding is None or encoding not in self.variants or len(suffix) > MAX_SUFFIX_BYTES:
+            return self.head + suffix, None
+        return self.variants[encoding].finish(suffix), encoding
+
+
+def make_etag(key: CacheKey, content_digest: str) -> str:
+    """
+    Strong validator for one endpoint/query over one dataset. Both parts are
+    content hashes (the snapshot's digest, and a hash of the key rather than
+    Python's hash()), so it is stable across workers and restarts and never
+    matches a response built from different data.
+    """
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+    return f'{content_digest}-{digest}'
+
+
+def to_http_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """Local naive timestamp -> aware UTC datetime truncated to whole seconds, as HTTP dates are."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+class ResponseCache:
+    """
+    LRU of encoded response bodies keyed by (endpoint, normalized query, data version).
+
+    Bounded by the total size of the stored bodies and their compressed
+    variants. Entries belong to one data version: the first lookup or store
+    for a newer version drops everything cached for older ones, and responses
+    built from an older snapshot than the current one are never stored.
+
+    Bodies of at least compress_min_bytes are gzip (and, when the brotli package
+    is installed, brotli) compressed once when stored. A level of 0 disables
+    that coding; higher levels trade CPU per data version for bandwidth.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: Optional[int] = 5,
+        compress_min_bytes: int = 1024
+    ):
+        self.max_bytes = max_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.compress_min_bytes = compress_min_bytes
+        self._entries: 'OrderedDict[CacheKey, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _advance_version(self, version: int) -> bool:
+        """Adopt version if it is current or newer. Caller holds the lock."""
+        if self._version is not None and version < self._version:
+            return False
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+                logger.debug("Response cache invalidated for data version %d", version)
+            self._entries.clear()
+            self._size = 0
+            self._version = version
+        return True
+
+    def get(self, key: CacheKey, version: int) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key) if self._advance_version(version) else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    @property
+    def encodings(self) -> tuple:
+        """Content codings cached entries may carry, most preferred first."""
+        enabled = {'br': bool(self.brotli_quality), 'gzip': bool(self.gzip_level)}
+        return tuple(encoding for encoding in available_encodings() if enabled[encoding])
+
+    def put(self, key: CacheKey, version: int, body: bytes) -> CachedResponse:
+        with self._lock:
+            if self._version is not None and version < self._version:
+                return CachedResponse.from_body(body, version)
+        entry = CachedResponse.from_body(
+            body, version,
+            gzip_level=self.gzip_level,
+            brotli_quality=self.brotli_quality,
+            compress_min_bytes=self.compress_min_bytes
+        )
+        with self._lock:
+            if not self._advance_version(version) or entry.size > self.max_bytes:
+                return entry
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._version = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'version': self._version,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'encodings': list(self.encodings),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
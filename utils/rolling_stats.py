@@ -0,0 +1,73 @@
+"""Rolling latency and outcome statistics over the last N operations."""
+
+import math
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class RollingLatency:
+    """
+    Durations and success of the last `window` operations, plus lifetime
+    counts and when the last success and failure happened.
+
+    Recording is O(1); percentiles are computed when stats are read, which
+    happens far less often than recording.
+    """
+
+    def __init__(self, window: int = 50):
+        self.window = window
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.failures = 0
+        self.last_success: Optional[datetime] = None
+        self.last_failure: Optional[datetime] = None
+
+    def record(self, seconds: float, ok: bool = True):
+        with self._lock:
+            self._samples.append((seconds, ok))
+            self.attempts += 1
+            if ok:
+                self.last_success = datetime.now()
+            else:
+                self.failures += 1
+                self.last_failure = datetime.now()
+
+    @property
+    def last(self) -> Optional[Tuple[float, bool]]:
+        """(seconds, ok) of the most recent operation."""
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = list(self._samples)
+            stats = {
+                'attempts': self.attempts,
+                'failures': self.failures,
+                'last_success': self.last_success.isoformat() if self.last_success else None,
+                'last_failure': self.last_failure.isoformat() if self.last_failure else None,
+                'window': len(samples)
+            }
+        if not samples:
+            return stats
+
+        durations = sorted(seconds for seconds, _ in samples)
+        stats.update({
+            'last_ms': round(samples[-1][0] * 1000, 1),
+            'last_ok': samples[-1][1],
+            'success_rate': round(sum(ok for _, ok in samples) / len(samples), 3),
+            'mean_ms': round(sum(durations) / len(durations) * 1000, 1),
+            'p50_ms': round(_percentile(durations, 0.50) * 1000, 1),
+            'p95_ms': round(_percentile(durations, 0.95) * 1000, 1),
+            'max_ms': round(durations[-1] * 1000, 1)
+        })
+        return stats
+
+
+def _percentile(ordered, fraction: float) -> float:
+    """Nearest-rank percentile of an ascending, non-empty sequence."""
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
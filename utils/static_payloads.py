@@ -0,0 +1,71 @@
+"""Deploy-time API payloads, encoded and content-hashed once at app creation."""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from .response_cache import CachedResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StaticPayload:
+    """
+    A success response body that only changes on deploy.
+
+    `digest` is a hash of the encoded body, so it changes exactly when the
+    content does and can be put in the URL; `entry` holds the body and its
+    precompressed variants.
+    """
+    name: str
+    digest: str
+    entry: CachedResponse
+
+    @property
+    def size(self) -> int:
+        return self.entry.size
+
+
+class StaticPayloads:
+    """
+    Named payloads such as the frontend configuration.
+
+    Each is built once with add(); the routes then serve the stored bytes,
+    and templates link to them by digest so browsers can cache them forever.
+    """
+
+    def __init__(
+        self,
+        dumps: Callable[[Any], str],
+        gzip_level: int = 6,
+        brotli_quality: Optional[int] = 5,
+        compress_min_bytes: int = 1024
+    ):
+        self.dumps = dumps
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.compress_min_bytes = compress_min_bytes
+        self._payloads: Dict[str, StaticPayload] = {}
+
+    def add(self, name: str, data: Dict[str, Any]) -> StaticPayload:
+        payload = {'success': True}
+        payload.update(data)
+        body = self.dumps(payload).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        entry = CachedResponse.from_body(
+            body, version=0,
+            gzip_level=self.gzip_level,
+            brotli_quality=self.brotli_quality,
+            compress_min_bytes=self.compress_min_bytes
+        )
+        self._payloads[name] = StaticPayload(name, digest, entry)
+        logger.debug("Static payload %s: %d bytes, digest %s", name, len(body), digest)
+        return self._payloads[name]
+
+    def get(self, name: str) -> StaticPayload:
+        return self._payloads[name]
+
+    def digests(self) -> Dict[str, str]:
+        return {name: payload.digest for name, payload in self._payloads.items()}
@@ -0,0 +1,87 @@
+"""Shared timestamp parsing for sensor readings.
+
+Readings carry naive wall-clock timestamps from the stations. Epoch values used
+throughout the app are seconds since 1970-01-01 on that same wall clock, so hour
+and day boundaries line up with what the charts display. Timezone suffixes are
+dropped rather than converted, matching how the services always treated them.
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
+
+EPOCH = datetime(1970, 1, 1)
+
+TIMESTAMP_FIELDS = ('DateTime', 'DateTimeStamp', 'Timestamp')
+
+PARSE_CACHE_SIZE = 8192
+
+
+def datetime_to_epoch(dt: datetime) -> float:
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None)
+    return (dt - EPOCH).total_seconds()
+
+
+def epoch_to_datetime(epoch: float) -> datetime:
+    return EPOCH + timedelta(seconds=float(epoch))
+
+
+def _parse_slow(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S.%f')
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_string(value: str) -> Optional[datetime]:
+    # Fast path: the upstream's 'YYYY-MM-DD HH:MM:SS' shape is valid ISO 8601,
+    # and the C-implemented fromisoformat is far cheaper than strptime
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return _parse_slow(value)
+    return parsed.replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def parse_timestamp(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """Parse a reading timestamp to a naive datetime, or None if it is not one."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None) if value.tzinfo else value
+    return _parse_string(str(value))
+
+
+def to_epoch(value: Union[str, datetime, None]) -> Optional[float]:
+    parsed = parse_timestamp(value)
+    return datetime_to_epoch(parsed) if parsed else None
+
+
+def reading_timestamp(reading: Dict[str, Any]) -> Optional[str]:
+    for field in TIMESTAMP_FIELDS:
+        if reading.get(field):
+            return reading[field]
+    return None
+
+
+def reading_epoch(reading: Dict[str, Any]) -> Optional[float]:
+    """
+    Epoch of a reading. Snapshots parse each one once, into their ColumnarStore;
+    the readings themselves are served as-is, so nothing is attached to them.
+    """
+    return to_epoch(reading_timestamp(reading))
+
+
+def reading_datetime(reading: Dict[str, Any]) -> Optional[datetime]:
+    epoch = reading_epoch(reading)
+    return epoch_to_datetime(epoch) if epoch is not None else None
+
+
+def parse_cache_info():
+    return _parse_string.cache_info()
@@ -3,6 +3,8 @@
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from flask import jsonify
+from config import SystemConfig
+from .timestamps import to_epoch
 
 
 def validate_date_string(date_str: str) -> Tuple[bool, Optional[datetime], Optional[str]]:
@@ -62,3 +64,156 @@ def validate_and_get_date(request):
         return None, create_api_error_response(error_msg, 400)
     
     return target_date, None
+
+
+def validate_and_get_reading_filters(request):
+    """
+    Validate the projection, time-window and pagination parameters of the
+    weather data endpoint: fields, since, until, limit, cursor, latest_only.
+    
+    Returns:
+        Tuple of (filters_dict, error_response_or_none)
+    """
+    args = request.args
+    filters = {
+        'fields': None,
+        'since': None,
+        'until': None,
+        'limit': None,
+        'cursor': args.get('cursor') or None,
+        'latest_only': args.get('latest_only', '').lower() == 'true'
+    }
+    
+    if args.get('fields'):
+        filters['fields'] = [name.strip() for name in args['fields'].split(',') if name.strip()]
+    
+    for name in ('since', 'until'):
+        value = args.get(name)
+        if not value:
+            continue
+        epoch = to_epoch(value)
+        if epoch is None:
+            return None, create_api_error_response(
+                f'Invalid {name}: {value}. Use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS.', 400
+            )
+        filters[name] = epoch
+    
+    if args.get('limit'):
+        max_limit = SystemConfig.MAX_RECORDS_PER_REQUEST
+        try:
+            limit = int(args['limit'])
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= max_limit:
+            return None, create_api_error_response(f'limit must be between 1 and {max_limit}', 400)
+        filters['limit'] = limit
+    
+    return filters, None
+
+
+def validate_and_get_since_version(request):
+    """
+    Validate the since_version parameter of the delta endpoint: a version
+    token as returned in the `version` of an earlier delta response.
+    
+    A bare version number (sent by clients from before tokens carried the
+    content digest) cannot be matched to any data, so it is treated as absent.
+    
+    Returns:
+        Tuple of ((version, digest)_or_none, error_response_or_none)
+    """
+    value = request.args.get('since_version')
+    if not value or value.isdigit():
+        return None, None
+    
+    version, _, digest = value.partition('-')
+    if not version.isdigit() or not digest.isalnum():
+        return None, create_api_error_response(f'Invalid since_version: {value}', 400)
+    
+    return (int(version), digest), None
+
+
+def validate_and_get_batch_requests(request, allowed_resources, max_resources):
+    """
+    Parse the sub-requests of the batch endpoint.
+    
+    resources is a comma-separated list of `name` or `name:resource` entries
+    (name defaults to the resource, so one resource can be requested twice
+    under different names); `name.param=value` arguments are passed to that
+    sub-request as `param=value`.
+    
+    Returns:
+        Tuple of ([(name, resource, params), ...] or none, error_response_or_none)
+    """
+    entries = [entry.strip() for entry in request.args.get('resources', '').split(',') if entry.strip()]
+    if not entries:
+        return None, create_api_error_response('resources is required', 400)
+    if len(entries) > max_resources:
+        return None, create_api_error_response(f'At most {max_resources} resources per batch', 400)
+    
+    sub_requests = []
+    names = set()
+    for entry in entries:
+        name, _, resource = entry.partition(':')
+        resource = resource or name
+        if resource not in allowed_resources:
+            return None, create_api_error_response(f'Unknown resource: {resource}', 400)
+        if name in names:
+            return None, create_api_error_response(f'Duplicate resource name: {name}', 400)
+        names.add(name)
+        prefix = name + '.'
+        params = [
+            (key[len(prefix):], value)
+            for key, value in request.args.items(multi=True)
+            if key.startswith(prefix)
+        ]
+        sub_requests.append((name, resource, params))
+    
+    return sub_requests, None
+
+
+def validate_and_get_chart_format(request):
+    """
+    Validate the format parameter of the chart endpoints.
+    
+    Returns:
+        Tuple of ('columnar' or none, error_response_or_none)
+    """
+    chart_format = request.args.get('format')
+    if chart_format in (None, '', 'objects'):
+        return None, None
+    if chart_format != 'columnar':
+        return None, create_api_error_response(f'Invalid format: {chart_format}. Use columnar.', 400)
+    return chart_format, None
+
+
+def validate_and_get_daily_stats_params(request, allowed_fields, max_days):
+    """
+    Validate the field, start and end (YYYY-MM-DD, inclusive) parameters of
+    the history daily stats endpoint.
+    
+    Returns:
+        Tuple of ((field, start_date, end_date) or none, error_response_or_none)
+    """
+    field_name = request.args.get('field')
+    if field_name not in allowed_fields:
+        return None, create_api_error_response(
+            f'Invalid field: {field_name}. Use one of {", ".join(allowed_fields)}.', 400
+        )
+    
+    dates = []
+    for name in ('start', 'end'):
+        value = request.args.get(name)
+        if not value:
+            return None, create_api_error_response(f'{name} is required (YYYY-MM-DD)', 400)
+        is_valid, parsed, error_msg = validate_date_string(value)
+        if not is_valid:
+            return None, create_api_error_response(error_msg, 400)
+        dates.append(parsed)
+    
+    start_date, end_date = dates
+    days = (end_date - start_date).days + 1
+    if not 1 <= days <= max_days:
+        return None, create_api_error_response(f'end must be on or after start and at most {max_days} days later', 400)
+    
+    return (field_name, start_date, end_date), None